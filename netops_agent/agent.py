@@ -1,74 +1,187 @@
 from __future__ import annotations
 
+import logging
+import time
 from dataclasses import dataclass
-from typing import Callable
-from typing import List
+from string import Formatter
+from typing import Dict, List, Tuple
 
+from .metrics import MetricsRecorder
 from .models import ExecutionResult, Incident, Runbook
-from .tools import (
-    ping_gateway,
-    reset_interface,
-    show_interface,
-    show_interface_counters,
-    show_process_cpu,
-)
+from .sessions import DeviceSessionPool
+from .tool_cache import ToolCache
+from .tools import TOOLS, ToolResult, ToolSpec, match_tool
 
 
 @dataclass
 class PlanStep:
     description: str
     tool: str
+    command: str = ""
+
+
+@dataclass(frozen=True)
+class StepTemplate:
+    description: str
+    tool: str
+    command: str
+    params: Tuple[str, ...]
+
+    def render(self, incident: Incident) -> PlanStep:
+        values = {name: getattr(incident, name, "{" + name + "}") for name in self.params}
+        return PlanStep(
+            description=self.description,
+            tool=self.tool,
+            command=self.command.format(**values) if self.params else self.command,
+        )
 
 
 class NetOpsAgent:
-    def plan(self, incident: Incident, runbook: Runbook) -> List[PlanStep]:
-        plan = []
+    def __init__(
+        self,
+        cache: ToolCache | None = None,
+        sessions: DeviceSessionPool | None = None,
+        metrics: MetricsRecorder | None = None,
+    ) -> None:
+        self.cache = cache
+        self.metrics = metrics or MetricsRecorder(enabled=False)
+        # When set, async execution sends rendered commands to real device sessions.
+        self.sessions = sessions
+        self._plans: Dict[str, Tuple[StepTemplate, ...]] = {}
+
+    def compile(self, runbook: Runbook) -> Tuple[StepTemplate, ...]:
+        """Map each runbook command to a registered tool once and cache the result."""
+        compiled = self._plans.get(runbook.runbook_id)
+        if compiled is not None:
+            return compiled
+        steps = []
         for command in runbook.commands:
-            if "show interface" in command and "counters" not in command:
-                plan.append(PlanStep(description="Check interface status", tool="show_interface"))
-            elif "counters" in command:
-                plan.append(
-                    PlanStep(description="Check interface counters", tool="show_interface_counters")
-                )
-            elif "ping" in command:
-                plan.append(PlanStep(description="Ping gateway", tool="ping_gateway"))
-            elif "shutdown" in command:
-                plan.append(PlanStep(description="Reset interface", tool="reset_interface"))
-            elif "process cpu" in command:
-                plan.append(PlanStep(description="Check CPU", tool="show_process_cpu"))
-        return plan
+            spec = match_tool(command)
+            if spec is None:
+                continue
+            params = tuple(
+                dict.fromkeys(field for _, field, _, _ in Formatter().parse(command) if field)
+            )
+            steps.append(StepTemplate(spec.description, spec.name, command, params))
+        compiled = tuple(steps)
+        self._plans[runbook.runbook_id] = compiled
+        return compiled
+
+    def clear_plans(self) -> None:
+        """Drop compiled plans; call whenever the runbook index is rebuilt or reloaded."""
+        self._plans.clear()
+
+    def plan(self, incident: Incident, runbook: Runbook) -> List[PlanStep]:
+        return [template.render(incident) for template in self.compile(runbook)]
 
     def execute(
         self,
         incident: Incident,
         plan: List[PlanStep],
         *,
-        logger: Callable[[str], None] | None = None,
+        logger: logging.Logger | None = None,
+    ) -> ExecutionResult:
+        actions = []
+        observed: Dict[str, float] = {}
+        for step in plan:
+            spec = TOOLS.get(step.tool)
+            if spec is None:
+                continue
+            started = time.perf_counter()
+            with self.metrics.span("tool", incident.incident_id, spec.name):
+                result = self._run_tool(spec, incident, step)
+            actions.append(f"{result.command} -> {result.output}")
+            observed.update(spec.observe(result.output))
+            if logger:
+                _log_action(logger, incident, spec, result, started)
+        return self._pending_result(incident, actions, observed)
+
+    async def execute_async(
+        self,
+        incident: Incident,
+        plan: List[PlanStep],
+        *,
+        logger: logging.Logger | None = None,
+        latency: float = 0.0,
     ) -> ExecutionResult:
         actions = []
+        observed: Dict[str, float] = {}
         for step in plan:
-            if step.tool == "show_interface":
-                result = show_interface(incident)
-            elif step.tool == "show_interface_counters":
-                result = show_interface_counters(incident)
-            elif step.tool == "ping_gateway":
-                result = ping_gateway(incident)
-            elif step.tool == "reset_interface":
-                result = reset_interface(incident)
-            elif step.tool == "show_process_cpu":
-                result = show_process_cpu()
-            else:
+            spec = TOOLS.get(step.tool)
+            if spec is None:
                 continue
-            action_line = f"{result.command} -> {result.output}"
-            actions.append(action_line)
+            started = time.perf_counter()
+            with self.metrics.span("tool", incident.incident_id, spec.name):
+                result = await self._run_tool_async(spec, incident, step, latency)
+            actions.append(f"{result.command} -> {result.output}")
+            observed.update(spec.observe(result.output))
             if logger:
-                logger(f"[ACTION] {incident.incident_id} {action_line}")
+                _log_action(logger, incident, spec, result, started)
+        return self._pending_result(incident, actions, observed)
+
+    def _run_tool(self, spec: ToolSpec, incident: Incident, step: PlanStep) -> ToolResult:
+        if self.cache is None:
+            return spec.func(incident)
+        if not spec.read_only:
+            result = spec.func(incident)
+            self.cache.invalidate_device(incident.device_id)
+            return result
+        return self.cache.get_or_run(
+            (incident.device_id, step.command or spec.name), lambda: spec.func(incident)
+        )
+
+    async def _run_tool_async(
+        self, spec: ToolSpec, incident: Incident, step: PlanStep, latency: float
+    ) -> ToolResult:
+        if self.cache is None:
+            return await self._call_async(spec, incident, step, latency)
+        if not spec.read_only:
+            result = await self._call_async(spec, incident, step, latency)
+            self.cache.invalidate_device(incident.device_id)
+            return result
+        return await self.cache.get_or_run_async(
+            (incident.device_id, step.command or spec.name),
+            lambda: self._call_async(spec, incident, step, latency),
+        )
+
+    async def _call_async(
+        self, spec: ToolSpec, incident: Incident, step: PlanStep, latency: float
+    ) -> ToolResult:
+        if self.sessions is not None and step.command:
+            return await self.sessions.execute(incident.device_id, step.command)
+        return await spec.async_func(incident, latency)
+
+    @staticmethod
+    def _pending_result(
+        incident: Incident, actions: List[str], observed: Dict[str, float]
+    ) -> ExecutionResult:
         return ExecutionResult(
             incident_id=incident.incident_id,
             runbook_id="",
             actions=actions,
+            observed=observed,
             validation_passed=True,
             validation_reason="Validation pending",
             escalated=False,
             notes="Actions executed successfully",
         )
+
+
+def _log_action(
+    logger: logging.Logger,
+    incident: Incident,
+    spec: ToolSpec,
+    result: ToolResult,
+    started: float,
+) -> None:
+    logger.info(
+        "[ACTION] %s %s -> %s",
+        incident.incident_id,
+        result.command,
+        result.output,
+        extra={
+            "incident_id": incident.incident_id,
+            "tool": spec.name,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+        },
+    )
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import itertools
+import json
+import multiprocessing
+import platform
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from .db import TicketWriter
+from .models import Runbook
+from .rag import RunbookIndex
+from .retrieval_cache import RetrievalCache
+from .synthetic_data import OS_VERSIONS, make_telemetry_table
+from .telemetry import utcnow
+from .workflows import NetOpsWorkflow, RunContext
+
+VENDORS = ["cisco", "arista", "juniper", "nokia", "huawei"]
+STAGES = (
+    "prepare_data",
+    "detect",
+    "build_index",
+    "persist_index",
+    "query",
+    "query_batch",
+    "query_cached",
+    "search",
+    "plan",
+    "execute",
+    "validate",
+    "write_ticket",
+    "ticket_flush",
+)
+
+
+@dataclass(frozen=True)
+class BenchScale:
+    devices: int
+    runbooks: int
+    incidents: int
+
+
+@dataclass
+class StageTimer:
+    samples: Dict[str, List[float]] = field(default_factory=dict)
+    items: Dict[str, int] = field(default_factory=dict)
+
+    @contextmanager
+    def time(self, stage: str, items: int = 1) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        self.samples.setdefault(stage, []).append(time.perf_counter() - start)
+        self.items[stage] = self.items.get(stage, 0) + items
+
+
+def synthetic_runbooks(base: Sequence[Runbook], count: int) -> List[Runbook]:
+    """Expand the shipped runbooks into ``count`` vendor-specific variants."""
+    runbooks = list(base[:count])
+    for idx in range(len(runbooks), count):
+        template = base[idx % len(base)]
+        vendor = VENDORS[idx % len(VENDORS)]
+        runbooks.append(
+            template.model_copy(
+                update={
+                    "runbook_id": f"{template.runbook_id}-{vendor}-{idx:05d}",
+                    "title": f"{template.title} ({vendor} variant {idx})",
+                    "steps": [*template.steps, f"Review {vendor} advisory kb{idx}"],
+                    "os_versions": [OS_VERSIONS[idx % len(OS_VERSIONS)]],
+                }
+            )
+        )
+    return runbooks
+
+
+def summarize(samples: Sequence[float], items: int) -> Dict[str, float]:
+    values = np.asarray(samples) * 1000.0
+    total = float(np.sum(values)) / 1000.0
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": len(values),
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(values.max()),
+        "throughput_per_s": items / total if total > 0 else 0.0,
+    }
+
+
+def peak_rss_mb() -> float | None:
+    """High-water RSS of this process, which is why each scale runs in its own."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+def run_scale(
+    scale: BenchScale, *, seed: int, warmup: int, repeat: int, workdir: Path
+) -> Dict[str, object]:
+    base = RunbookIndex()
+    base.load_runbooks(Path("data/runbooks.yaml"))
+    runbooks = synthetic_runbooks(base.runbooks, scale.runbooks)
+    timer = StageTimer()
+    for rep in range(warmup + repeat):
+        sink = timer if rep >= warmup else StageTimer()
+        _run_once(scale, runbooks, seed=seed, timer=sink, workdir=workdir / f"rep-{rep}")
+    return {
+        "scale": asdict(scale),
+        "warmup": warmup,
+        "repeat": repeat,
+        "stages": {
+            stage: summarize(timer.samples[stage], timer.items[stage])
+            for stage in STAGES
+            if stage in timer.samples
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _run_once(
+    scale: BenchScale, runbooks: List[Runbook], *, seed: int, timer: StageTimer, workdir: Path
+) -> None:
+    workflow = NetOpsWorkflow(
+        RunContext(
+            seed=seed,
+            db_path=str(workdir / "bench.duckdb"),
+            log_path=str(workdir / "bench.log"),
+            devices=scale.devices,
+            incidents=scale.incidents,
+            # Stages time raw scoring; query_cached measures the cache on its own.
+            retrieval_cache_size=0,
+        )
+    )
+    with timer.time("prepare_data"):
+        incidents = workflow.prepare_data()
+    assert workflow.inventory is not None
+    samples = make_telemetry_table(
+        seed, workflow.inventory.interfaces_table(), utcnow(), minutes=15
+    )
+    with timer.time("detect", samples.num_rows):
+        workflow.detector.scan(samples)
+    workflow.index.runbooks = runbooks
+    with timer.time("build_index", len(runbooks)):
+        workflow.index.build()
+    with timer.time("persist_index", len(runbooks)):
+        workflow.index.persist()
+    workflow.agent.clear_plans()
+
+    matches = []
+    for incident in incidents:
+        with timer.time("query"):
+            matches.append(workflow.index.query(incident.summary, top_k=1)[0])
+    with timer.time("query_batch", len(incidents)):
+        workflow.index.query_batch([incident.summary for incident in incidents], top_k=1)
+    workflow.index.cache = RetrievalCache()
+    for incident in incidents:
+        with timer.time("query_cached"):
+            workflow.index.query(incident.summary, top_k=1)
+    workflow.index.cache = RetrievalCache(0)
+    workflow.index.build_inverted()
+    for incident in incidents:
+        with timer.time("search"):
+            workflow.index.search(incident.summary, top_k=1, category=incident.category)
+
+    results = []
+    for incident, (runbook, _) in zip(incidents, matches):
+        with timer.time("plan"):
+            plan = workflow.agent.plan(incident, runbook)
+        with timer.time("execute"):
+            result = workflow.agent.execute(incident, plan)
+        result.runbook_id = runbook.runbook_id
+        results.append(result)
+    with timer.time("validate", len(incidents)):
+        workflow.validator.evaluate(
+            incidents,
+            [runbook for runbook, _ in matches],
+            [result.observed for result in results],
+        )
+
+    for result in results:
+        with timer.time("write_ticket"):
+            workflow.db.write_ticket(
+                result.incident_id,
+                result.runbook_id,
+                result.notes,
+                result.validation_passed,
+                result.validation_reason,
+                result.escalated,
+            )
+    writer = TicketWriter(workflow.db, max_rows=len(results) + 1, max_age=float("inf"))
+    for result in results:
+        writer.add(result)
+    with timer.time("ticket_flush", len(results)):
+        writer.flush()
+    workflow.db.conn.close()
+
+
+def run_benchmarks(
+    devices: Sequence[int],
+    runbooks: Sequence[int],
+    incidents: Sequence[int],
+    *,
+    seed: int = 42,
+    warmup: int = 1,
+    repeat: int = 3,
+) -> Dict[str, object]:
+    """Benchmark every combination of the given scales in a scratch directory.
+
+    Every scale runs in a fresh spawned process, so its ``peak_rss_mb`` is its own
+    peak and not the running maximum of the scales before it.
+    """
+    scales = [BenchScale(*combo) for combo in itertools.product(devices, runbooks, incidents)]
+    with tempfile.TemporaryDirectory(prefix="netops-bench-") as tmp:
+        results = []
+        for idx, scale in enumerate(scales):
+            incident_cap = min(scale.incidents, scale.devices * 3)
+            scale = BenchScale(scale.devices, scale.runbooks, incident_cap)
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                future = pool.submit(
+                    run_scale,
+                    scale,
+                    seed=seed,
+                    warmup=warmup,
+                    repeat=repeat,
+                    workdir=Path(tmp) / str(idx),
+                )
+                results.append(future.result())
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "version": _package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, object], current: Dict[str, object], *, threshold: float = 0.2
+) -> List[str]:
+    """Return a line per stage whose p95 grew more than ``threshold`` at a matching scale."""
+    previous = {
+        json.dumps(entry["scale"], sort_keys=True): entry["stages"]
+        for entry in baseline["results"]  # type: ignore[union-attr]
+    }
+    regressions = []
+    for entry in current["results"]:  # type: ignore[union-attr]
+        key = json.dumps(entry["scale"], sort_keys=True)
+        for stage, stats in entry["stages"].items():
+            before = previous.get(key, {}).get(stage)
+            if not before or before["p95_ms"] <= 0:
+                continue
+            ratio = stats["p95_ms"] / before["p95_ms"]
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{stage} @ {entry['scale']}: p95 {before['p95_ms']:.3f}ms -> "
+                    f"{stats['p95_ms']:.3f}ms ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def _package_version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("netops-agent")
+    except Exception:  # noqa: BLE001 - running from a source checkout
+        return "unknown"
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
 
 from rich.console import Console
 
-from .db import NetOpsDatabase
-from .workflows import NetOpsWorkflow, RunContext
+# Subcommands import what they need inside their handlers so that lightweight
+# commands such as show-db never pay for scikit-learn, SciPy or pandas.
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -13,42 +17,610 @@ def build_parser() -> argparse.ArgumentParser:
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     run_parser = subparsers.add_parser("run", help="Run the end-to-end workflow")
-    run_parser.add_argument("--seed", type=int, default=42)
     run_parser.add_argument("--db-path", default="outputs/netops.duckdb")
-    run_parser.add_argument("--log-path", default="outputs/netops.log")
+    _add_logging_args(run_parser)
     run_parser.add_argument(
-        "--verbose",
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Maximum incidents executing at once (one at a time per device).",
+    )
+    run_parser.add_argument(
+        "--tool-latency",
+        type=float,
+        default=0.0,
+        help="Simulated seconds per device command; enables async execution when > 0.",
+    )
+    run_parser.add_argument(
+        "--devices",
+        type=int,
+        default=None,
+        help="Generate a vectorized synthetic fleet of this many devices.",
+    )
+    run_parser.add_argument(
+        "--interfaces-per-device",
+        type=int,
+        default=3,
+        help="Interfaces per device for --devices fleets.",
+    )
+    run_parser.add_argument(
+        "--incidents", type=int, default=3, help="Incidents to raise for --devices fleets."
+    )
+    run_parser.add_argument(
+        "--incremental",
         action="store_true",
-        help="Print execution logs to the console in addition to writing the log file.",
+        help="Upsert inventory by key instead of deleting and reloading every table.",
+    )
+    run_parser.add_argument(
+        "--telemetry-minutes",
+        type=int,
+        default=0,
+        help="Append this many minutes of synthetic per-interface samples to the telemetry store.",
+    )
+    run_parser.add_argument("--telemetry-dir", default="outputs/telemetry")
+    run_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes; incidents are sharded across them by device_id.",
+    )
+    run_parser.add_argument(
+        "--incident-source",
+        choices=["synthetic", "telemetry"],
+        default="synthetic",
+        help="Sample random incidents, or detect them from the telemetry store.",
+    )
+    run_parser.add_argument(
+        "--detection-window",
+        type=float,
+        default=15.0,
+        help="Minutes of telemetry scanned when --incident-source telemetry.",
+    )
+    run_parser.add_argument(
+        "--device-sim",
+        action="store_true",
+        help="Start a local simulated device server and send commands to it over TCP.",
+    )
+    run_parser.add_argument(
+        "--device-endpoint",
+        default=None,
+        help="host:port of a running device simulator (see the device-sim command).",
+    )
+    run_parser.add_argument(
+        "--connect-latency",
+        type=float,
+        default=0.0,
+        help="Simulated seconds per device login when using --device-sim.",
+    )
+    run_parser.add_argument(
+        "--no-session-pool",
+        dest="session_pool",
+        action="store_false",
+        help="Open a new device session for every command instead of reusing them.",
+    )
+    run_parser.add_argument("--max-sessions-per-device", type=int, default=1)
+    _add_retrieval_args(run_parser)
+    _add_execution_args(run_parser)
+    _add_scheduler_args(run_parser)
+    run_parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Record per-stage timings into the run_metrics table.",
+    )
+    run_parser.add_argument(
+        "--prometheus-out",
+        default=None,
+        help="Also write the stage histograms in Prometheus text format to this file.",
     )
 
+    stream_parser = subparsers.add_parser(
+        "stream", help="Process incidents streamed as NDJSON from a file or stdin"
+    )
+    stream_parser.add_argument(
+        "--input", default="-", help="NDJSON file with one incident per line ('-' for stdin)."
+    )
+    stream_parser.add_argument("--db-path", default="outputs/netops.duckdb")
+    _add_logging_args(stream_parser)
+    _add_retrieval_args(stream_parser)
+    _add_execution_args(stream_parser)
+    stream_parser.add_argument(
+        "--queue-size", type=int, default=256, help="Capacity of each inter-stage queue."
+    )
+    stream_parser.add_argument(
+        "--batch-size", type=int, default=64, help="Maximum incidents per retrieval batch."
+    )
+    stream_parser.add_argument(
+        "--report-interval", type=float, default=5.0, help="Seconds between throughput reports."
+    )
+    stream_parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Record per-stage timings into the run_metrics table.",
+    )
+    stream_parser.add_argument(
+        "--prometheus-out",
+        default=None,
+        help="Also write the stage histograms in Prometheus text format to this file.",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Keep a warm workflow and resolve incidents posted over local HTTP"
+    )
+    serve_parser.add_argument("--db-path", default="outputs/netops.duckdb")
+    _add_logging_args(serve_parser)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument(
+        "--socket", default=None, help="Listen on this Unix socket path instead of TCP."
+    )
+    _add_retrieval_args(serve_parser)
+    _add_execution_args(serve_parser)
+    _add_scheduler_args(serve_parser)
+    serve_parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Record per-stage timings into the run_metrics table.",
+    )
+
+    sim_parser = subparsers.add_parser(
+        "device-sim", help="Serve a line-based simulated device CLI from the DuckDB inventory"
+    )
+    sim_parser.add_argument("--db-path", default="outputs/netops.duckdb")
+    sim_parser.add_argument("--host", default="127.0.0.1")
+    sim_parser.add_argument("--port", type=int, default=2323)
+    sim_parser.add_argument("--command-latency", type=float, default=0.0)
+    sim_parser.add_argument("--connect-latency", type=float, default=0.0)
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Benchmark each pipeline stage at one or more scales"
+    )
+    bench_parser.add_argument("--seed", type=int, default=42)
+    bench_parser.add_argument("--devices", type=int, nargs="+", default=[100, 10_000])
+    bench_parser.add_argument("--runbooks", type=int, nargs="+", default=[3, 1_000])
+    bench_parser.add_argument("--incidents", type=int, nargs="+", default=[200])
+    bench_parser.add_argument("--warmup", type=int, default=1)
+    bench_parser.add_argument("--repeat", type=int, default=3)
+    bench_parser.add_argument("--output", default="outputs/bench.json")
+    bench_parser.add_argument(
+        "--baseline", default=None, help="Earlier bench JSON to compare p95 latencies against."
+    )
+    bench_parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Allowed relative p95 growth over --baseline before exiting non-zero.",
+    )
+
+    telemetry_parser = subparsers.add_parser(
+        "telemetry", help="Show windowed per-interface telemetry aggregates"
+    )
+    telemetry_parser.add_argument("--db-path", default="outputs/netops.duckdb")
+    telemetry_parser.add_argument("--telemetry-dir", default="outputs/telemetry")
+    telemetry_parser.add_argument(
+        "--window", type=float, default=15.0, help="Aggregate over the last N minutes."
+    )
+    telemetry_parser.add_argument(
+        "--sort", default="p95_packet_loss", help="Aggregate column to rank interfaces by."
+    )
+    telemetry_parser.add_argument("--limit", type=int, default=20)
+
     show_parser = subparsers.add_parser("show-db", help="Show DuckDB tables")
     show_parser.add_argument("--db-path", default="outputs/netops.duckdb")
+    show_parser.add_argument(
+        "--table",
+        choices=["devices", "interfaces", "incidents", "tickets", "run_metrics"],
+        default=None,
+        help="Show only this table (default: a page of every table).",
+    )
+    show_parser.add_argument(
+        "--where",
+        default=None,
+        help="SQL predicate applied to --table, e.g. \"severity = 'high'\".",
+    )
+    show_parser.add_argument("--limit", type=int, default=20, help="Rows per table.")
+    show_parser.add_argument("--offset", type=int, default=0, help="Rows to skip first.")
+    show_parser.add_argument(
+        "--summary",
+        choices=["category", "severity", "site"],
+        default=None,
+        help="Print ticket pass/fail/escalation counts grouped by this column instead.",
+    )
+    show_parser.add_argument(
+        "--format",
+        choices=["table", "jsonl"],
+        default="table",
+        help="Render pages as tables, or stream rows as JSON lines.",
+    )
+
+    imports_parser = subparsers.add_parser(
+        "check-imports", help="Fail if lightweight subcommands import heavy dependencies"
+    )
+    imports_parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=500.0,
+        help="Maximum wall-clock startup time per checked command.",
+    )
 
     return parser
 
 
-def main() -> None:
-    parser = build_parser()
-    args = parser.parse_args()
-    console = Console()
+def _add_logging_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--log-path", default="outputs/netops.log")
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print execution logs to the console in addition to writing the log file.",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Events below this level are dropped before they are formatted.",
+    )
+    parser.add_argument(
+        "--log-max-mb",
+        type=float,
+        default=50.0,
+        help="Rotate the JSONL log once it reaches this size (keeps 3 backups).",
+    )
+
+
+def _add_retrieval_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--retrieval",
+        choices=["tfidf", "bm25"],
+        default="tfidf",
+        help="Runbook retrieval engine; bm25 pre-filters by incident category and OS version.",
+    )
+    parser.add_argument(
+        "--retrieval-cache-size",
+        type=int,
+        default=4096,
+        help="Ranked results kept per normalized query text (0 disables the cache).",
+    )
+
+
+def _add_execution_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Seed for synthetic fleets, incidents and telemetry."
+    )
+    parser.add_argument(
+        "--correlation-window",
+        type=float,
+        default=300.0,
+        help="Seconds during which incidents for the same device, interface and site share "
+        "one remediation (0 disables correlation).",
+    )
+    parser.add_argument(
+        "--tool-cache-ttl",
+        type=float,
+        default=0.0,
+        help="Seconds to cache read-only device command results per device (0 disables).",
+    )
+
+
+def _add_scheduler_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--deadline",
+        action="append",
+        type=_deadline,
+        default=[],
+        metavar="SEVERITY=SECONDS",
+        help="Queue-wait deadline of a severity, repeatable (defaults: high=30 medium=120 "
+        "low=600).",
+    )
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=0,
+        help="Most incidents one wave may start; the rest run in later waves in priority "
+        "order (0 is unlimited). With --workers the cap applies per worker.",
+    )
+    parser.add_argument(
+        "--overload",
+        choices=["defer", "shed"],
+        default="defer",
+        help="With shed, low-severity incidents that miss the first --max-pending wave are "
+        "escalated unremediated instead of deferred.",
+    )
+
+
+def _deadline(value: str) -> tuple[str, float]:
+    from .scheduling import SEVERITY_ORDER
+
+    severity, _, seconds = value.partition("=")
+    severity = severity.strip().lower()
+    if severity not in SEVERITY_ORDER:
+        raise argparse.ArgumentTypeError(
+            f"unknown severity {severity!r} in {value!r}; "
+            f"expected one of {', '.join(SEVERITY_ORDER)}"
+        )
+    try:
+        deadline = float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected SEVERITY=SECONDS, got {value!r}") from None
+    if not deadline > 0:
+        raise argparse.ArgumentTypeError(f"deadline must be positive seconds, got {value!r}")
+    return severity, deadline
+
+
+def _context_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """``RunContext`` fields set by the options run, stream and serve share."""
+    return {
+        "seed": args.seed,
+        "db_path": args.db_path,
+        "log_path": args.log_path,
+        "verbose": args.verbose,
+        "log_level": args.log_level,
+        "log_max_bytes": int(args.log_max_mb * 1024 * 1024),
+        "retrieval": args.retrieval,
+        "retrieval_cache_size": args.retrieval_cache_size,
+        "correlation_window": args.correlation_window,
+        "tool_cache_ttl": args.tool_cache_ttl,
+    }
+
+
+def _run(args: argparse.Namespace, console: Console) -> None:
+    from .workflows import NetOpsWorkflow, RunContext
+
+    if args.devices is not None and args.incident_source == "synthetic":
+        interfaces = args.devices * args.interfaces_per_device
+        if args.incidents > interfaces:
+            sys.exit(
+                f"--incidents {args.incidents} exceeds the {interfaces} interfaces of "
+                f"--devices {args.devices} x --interfaces-per-device "
+                f"{args.interfaces_per_device}; each incident needs its own interface"
+            )
+    workflow = NetOpsWorkflow(
+        RunContext(
+            **_context_options(args),
+            concurrency=args.concurrency,
+            tool_latency=args.tool_latency,
+            devices=args.devices,
+            interfaces_per_device=args.interfaces_per_device,
+            incidents=args.incidents,
+            incremental=args.incremental,
+            device_endpoint=args.device_endpoint,
+            device_sim=args.device_sim,
+            connect_latency=args.connect_latency,
+            session_pool=args.session_pool,
+            max_sessions_per_device=args.max_sessions_per_device,
+            metrics=args.metrics or bool(args.prometheus_out),
+            prometheus_path=args.prometheus_out,
+            telemetry_dir=args.telemetry_dir,
+            telemetry_minutes=args.telemetry_minutes,
+            incident_source=args.incident_source,
+            detection_window=args.detection_window,
+            workers=args.workers,
+            deadlines=dict(args.deadline),
+            max_pending=args.max_pending,
+            overload=args.overload,
+        )
+    )
+    workflow.run()
+
+
+def _stream(args: argparse.Namespace, console: Console) -> None:
+    from .streaming import StreamPipeline
+    from .workflows import NetOpsWorkflow, RunContext
+
+    workflow = NetOpsWorkflow(
+        RunContext(
+            **_context_options(args),
+            metrics=args.metrics or bool(args.prometheus_out),
+            prometheus_path=args.prometheus_out,
+        )
+    )
+    workflow.db.init_schema()
+    workflow.build_index()
+    pipeline = StreamPipeline(
+        workflow,
+        queue_size=args.queue_size,
+        batch_size=args.batch_size,
+        report_interval=args.report_interval,
+    )
+    if args.input == "-":
+        stats = pipeline.run(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as stream:
+            stats = pipeline.run(stream)
+    workflow.log_correlation_stats()
+    workflow.log_cache_stats()
+    workflow.finish_metrics()
+    console.print(
+        f"Processed {stats.processed} incidents ({stats.rejected} rejected) "
+        f"in {stats.elapsed:.2f}s, {stats.rate:.1f} incidents/s"
+    )
+
+
+def _serve(args: argparse.Namespace, console: Console) -> None:
+    from .server import AgentServer, AgentService
+    from .workflows import NetOpsWorkflow, RunContext
 
-    if args.command == "run":
-        workflow = NetOpsWorkflow(
+    service = AgentService(
+        NetOpsWorkflow(
             RunContext(
-                seed=args.seed,
-                db_path=args.db_path,
-                log_path=args.log_path,
-                verbose=args.verbose,
+                **_context_options(args),
+                metrics=args.metrics,
+                deadlines=dict(args.deadline),
+                max_pending=args.max_pending,
+                overload=args.overload,
             )
         )
-        workflow.run()
-    elif args.command == "show-db":
-        db = NetOpsDatabase(args.db_path)
-        tables = db.show_tables()
-        for name, df in tables.items():
-            console.rule(f"{name}")
-            console.print(df)
+    )
+    try:
+        server = AgentServer(service, host=args.host, port=args.port, socket_path=args.socket)
+    except FileExistsError as exc:
+        sys.exit(str(exc))
+    service.start()
+    console.print(f"Serving incidents on {server.address} (SIGHUP reloads runbooks)")
+    server.serve_forever()
+
+
+def _device_sim(args: argparse.Namespace, console: Console) -> None:
+    from .db import NetOpsDatabase
+    from .device_sim import DeviceSimulator
+
+    simulator = DeviceSimulator.from_database(
+        NetOpsDatabase(args.db_path),
+        host=args.host,
+        port=args.port,
+        command_latency=args.command_latency,
+        connect_latency=args.connect_latency,
+    )
+    console.print(f"Serving simulated devices on {args.host}:{args.port}")
+    simulator.run_forever()
+
+
+def _bench(args: argparse.Namespace, console: Console) -> None:
+    from rich.table import Table
+
+    from .bench import compare, run_benchmarks
+
+    report = run_benchmarks(
+        args.devices,
+        args.runbooks,
+        args.incidents,
+        seed=args.seed,
+        warmup=args.warmup,
+        repeat=args.repeat,
+    )
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    for entry in report["results"]:
+        table = Table(title=f"bench {entry['scale']}")
+        for column in ("Stage", "p50 ms", "p95 ms", "p99 ms", "ops/s"):
+            table.add_column(column)
+        for stage, stats in entry["stages"].items():
+            table.add_row(
+                stage,
+                f"{stats['p50_ms']:.3f}",
+                f"{stats['p95_ms']:.3f}",
+                f"{stats['p99_ms']:.3f}",
+                f"{stats['throughput_per_s']:.1f}",
+            )
+        console.print(table)
+        peak = entry["peak_rss_mb"]
+        console.print(f"Peak RSS {peak:.1f} MB" if peak is not None else "Peak RSS unavailable")
+    console.print(f"Results written to {output}")
+    if args.baseline:
+        regressions = compare(
+            json.loads(Path(args.baseline).read_text()),
+            report,
+            threshold=args.max_regression,
+        )
+        for line in regressions:
+            console.print(f"REGRESSION {line}", markup=False)
+        if regressions:
+            sys.exit(1)
+
+
+def _telemetry(args: argparse.Namespace, console: Console) -> None:
+    from rich.table import Table
+
+    from .db import NetOpsDatabase
+    from .telemetry import TelemetryStore
+
+    aggregates = TelemetryStore(args.telemetry_dir).window_aggregates(
+        NetOpsDatabase(args.db_path), args.window
+    )
+    if aggregates.num_rows == 0:
+        console.print(f"No telemetry in the last {args.window:g} minutes")
+        return
+    if args.sort not in aggregates.column_names:
+        sys.exit(f"Unknown --sort column {args.sort!r}")
+    rows = aggregates.sort_by([(args.sort, "descending")]).slice(0, args.limit).to_pylist()
+    table = Table(title=f"Telemetry, last {args.window:g} minutes (by {args.sort})")
+    for column in aggregates.column_names:
+        table.add_column(column)
+    for row in rows:
+        table.add_row(
+            *(f"{value:.3f}" if isinstance(value, float) else str(value) for value in row.values())
+        )
+    console.print(table)
+
+
+def _show_db(args: argparse.Namespace, console: Console) -> None:
+    import duckdb
+
+    from .db import NetOpsDatabase
+
+    if args.where and not args.table:
+        sys.exit("--where needs --table")
+    try:
+        db = NetOpsDatabase(args.db_path, read_only=True)
+    except duckdb.Error as exc:
+        sys.exit(f"{args.db_path}: {exc}")
+    if args.summary:
+        columns, rows = db.ticket_summary(args.summary)
+        if args.format == "table":
+            console.rule(f"tickets by {args.summary}")
+        _print_rows(console, args.format, columns, iter([rows]))
+        return
+    for name in [args.table] if args.table else db.existing_tables():
+        try:
+            total = db.count(name, args.where)
+            columns, batches = db.scan(name, where=args.where, limit=args.limit, offset=args.offset)
+        except duckdb.Error as exc:
+            sys.exit(f"{name}: {exc}")
+        first, last = args.offset + 1, min(args.offset + args.limit, total)
+        if args.format == "table":
+            span = f"rows {first}-{last}" if first <= last else "no rows"
+            console.rule(f"{name} {span} of {total}")
+        _print_rows(console, args.format, columns, batches)
+
+
+def _print_rows(console: Console, fmt: str, columns: list, batches: Iterator[list]) -> None:
+    """Render each fetched batch as soon as it arrives, so only one is held at a time."""
+    from rich.table import Table
+
+    for number, rows in enumerate(batches):
+        if fmt == "jsonl":
+            for row in rows:
+                print(json.dumps(dict(zip(columns, row)), default=str))
+            continue
+        table = Table(show_header=number == 0)
+        for column in columns:
+            table.add_column(column)
+        for row in rows:
+            table.add_row(*("" if value is None else str(value) for value in row))
+        console.print(table)
+
+
+def _check_imports(args: argparse.Namespace, console: Console) -> None:
+    from .importcheck import check_startup
+
+    failures = 0
+    for report in check_startup(budget_ms=args.budget_ms):
+        status = "ok" if report.ok else "FAIL"
+        failures += not report.ok
+        console.print(
+            f"{status:4} {report.command:<10} {report.wall_ms:7.1f} ms  "
+            f"heavy={','.join(report.heavy) or '-'}",
+            markup=False,
+        )
+    if failures:
+        sys.exit(1)
+
+
+COMMANDS: Dict[str, Callable[[argparse.Namespace, Console], None]] = {
+    "run": _run,
+    "stream": _stream,
+    "serve": _serve,
+    "device-sim": _device_sim,
+    "bench": _bench,
+    "telemetry": _telemetry,
+    "show-db": _show_db,
+    "check-imports": _check_imports,
+}
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    COMMANDS[args.command](args, Console())
 
 
 if __name__ == "__main__":
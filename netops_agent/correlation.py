@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Mapping, Sequence, Tuple
+
+from .models import ExecutionResult, Incident
+
+GroupKey = Tuple[str, str, str, str]
+
+
+@dataclass
+class CorrelationStats:
+    groups: int = 0
+    suppressed: int = 0
+
+
+@dataclass
+class IncidentGroup:
+    key: GroupKey
+    primary: Incident
+    opened_at: float
+    size: int = 1
+    result: ExecutionResult | None = None
+
+    def fan_out(self, incident: Incident) -> ExecutionResult:
+        """The primary's ticket, re-addressed to a correlated member."""
+        assert self.result is not None, "primary must be resolved before its members"
+        if incident.incident_id == self.primary.incident_id:
+            return self.result
+        return self.result.model_copy(
+            update={
+                "incident_id": incident.incident_id,
+                "actions": [],
+                "notes": f"Correlated with {self.primary.incident_id}. {self.result.notes}",
+            }
+        )
+
+
+class IncidentCorrelator:
+    """Groups incidents for the same device, interface, site and category.
+
+    The first incident of a group is its primary and is the only one executed;
+    later incidents with the same key within ``window`` seconds of it join the
+    group. Groups live in a dict keyed by the hashed tuple and expire in arrival
+    order, so assignment is O(1) per incident. A ``window`` of 0 disables
+    correlation.
+
+    Groups outlive the ``assign`` call that opened them, so an incident in a later
+    batch (a later ``stream`` batch or daemon request) still joins a group opened
+    earlier and receives a copy of its primary's ticket. A group whose primary
+    was escalated, which includes being shed by the scheduler, is closed instead:
+    the next incident with its key opens a new group and is executed.
+    """
+
+    def __init__(self, window: float = 300.0) -> None:
+        self.window = window
+        self.stats = CorrelationStats()
+        self._open: Dict[GroupKey, IncidentGroup] = {}
+        self._expiry: Deque[IncidentGroup] = deque()
+
+    @staticmethod
+    def key(incident: Incident, site: str) -> GroupKey:
+        return (incident.device_id, incident.interface, site, incident.category)
+
+    def assign(
+        self,
+        incidents: Sequence[Incident],
+        sites: Mapping[str, str],
+        now: float | None = None,
+    ) -> List[IncidentGroup]:
+        """Return the group of each incident; an incident is primary if it opened one."""
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        groups = []
+        for incident in incidents:
+            key = self.key(incident, sites.get(incident.device_id, ""))
+            group = self._open.get(key) if self.window > 0 else None
+            if group is not None and group.result is not None and group.result.escalated:
+                group = None
+            if group is None:
+                group = IncidentGroup(key, incident, now)
+                self.stats.groups += 1
+                if self.window > 0:
+                    self._open[key] = group
+                    self._expiry.append(group)
+            else:
+                group.size += 1
+                self.stats.suppressed += 1
+            groups.append(group)
+        return groups
+
+    def _expire(self, now: float) -> None:
+        while self._expiry and now - self._expiry[0].opened_at > self.window:
+            group = self._expiry.popleft()
+            if self._open.get(group.key) is group:
+                del self._open[group.key]
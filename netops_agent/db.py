@@ -1,17 +1,62 @@
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Tuple
 
 import duckdb
-import pandas as pd
+from pydantic import BaseModel
 
-from .models import Device, Incident, Interface
+from .models import Device, ExecutionResult, Incident, Interface
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+TICKET_COLUMNS = (
+    "incident_id",
+    "runbook_id",
+    "notes",
+    "validation_passed",
+    "validation_reason",
+    "escalated",
+)
+
+# Tables show-db can page through, and the columns tickets can be summarized by.
+SHOW_TABLES = ("devices", "interfaces", "incidents", "tickets", "run_metrics")
+SUMMARY_KEYS = {"category": "n.category", "severity": "n.severity", "site": "d.site"}
+
+TABLE_KEYS = {
+    "devices": ("device_id",),
+    "interfaces": ("device_id", "name"),
+    "incidents": ("incident_id",),
+}
+
+
+@dataclass
+class SyncStats:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
 
 
 class NetOpsDatabase:
-    def __init__(self, path: str = "outputs/netops.duckdb") -> None:
+    def __init__(self, path: str = "outputs/netops.duckdb", *, read_only: bool = False) -> None:
+        """Open ``path``, creating it unless ``read_only``.
+
+        A read-only database also has file access disabled and its configuration
+        locked, so SQL pasted into queries (``show-db --where``) can neither
+        modify it nor read or write other files.
+        """
         self.path = Path(path)
+        if read_only:
+            self.conn = duckdb.connect(
+                str(self.path),
+                read_only=True,
+                config={"enable_external_access": False, "lock_configuration": True},
+            )
+            return
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = duckdb.connect(str(self.path))
 
@@ -46,13 +91,9 @@ class NetOpsDatabase:
                 summary VARCHAR,
                 category VARCHAR,
                 severity VARCHAR,
-<<<<<<< codex/design-end-to-end-agentic-solution-architecture-ejerf8
                 gateway VARCHAR,
                 should_fail BOOLEAN,
                 failure_reason VARCHAR
-=======
-                gateway VARCHAR
->>>>>>> main
             );
             """
         )
@@ -62,36 +103,153 @@ class NetOpsDatabase:
                 incident_id VARCHAR,
                 runbook_id VARCHAR,
                 notes VARCHAR,
-<<<<<<< codex/design-end-to-end-agentic-solution-architecture-ejerf8
                 validation_passed BOOLEAN,
                 validation_reason VARCHAR,
                 escalated BOOLEAN
-=======
-                validation_passed BOOLEAN
->>>>>>> main
+            );
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS run_metrics (
+                run_id VARCHAR,
+                incident_id VARCHAR,
+                stage VARCHAR,
+                tool VARCHAR,
+                started_at TIMESTAMP,
+                duration_ms DOUBLE
             );
             """
         )
 
     def load_devices(self, devices: Iterable[Device]) -> None:
-        df = pd.DataFrame([d.model_dump() for d in devices])
+        df = _records(devices)
         self.conn.execute("DELETE FROM devices")
         self.conn.register("devices_df", df)
         self.conn.execute("INSERT INTO devices SELECT * FROM devices_df")
 
     def load_interfaces(self, interfaces: Iterable[Interface]) -> None:
-        df = pd.DataFrame([i.model_dump() for i in interfaces])
+        df = _records(interfaces)
         self.conn.execute("DELETE FROM interfaces")
         self.conn.register("interfaces_df", df)
         self.conn.execute("INSERT INTO interfaces SELECT * FROM interfaces_df")
 
     def load_incidents(self, incidents: Iterable[Incident]) -> None:
-        df = pd.DataFrame([i.model_dump() for i in incidents])
+        df = _records(incidents)
         self.conn.execute("DELETE FROM incidents")
         self.conn.register("incidents_df", df)
         self.conn.execute("INSERT INTO incidents SELECT * FROM incidents_df")
 
-<<<<<<< codex/design-end-to-end-agentic-solution-architecture-ejerf8
+    def load_arrow(self, table: str, data: pa.Table) -> None:
+        """Replace ``table`` with an Arrow table, matching columns by name."""
+        columns = ", ".join(data.column_names)
+        self.conn.execute(f"DELETE FROM {table}")
+        self.conn.register(f"{table}_arrow", data)
+        self.conn.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_arrow")
+        self.conn.unregister(f"{table}_arrow")
+
+    def sync_devices(self, devices: Iterable[Device]) -> SyncStats:
+        return self.sync_table("devices", _records(devices))
+
+    def sync_interfaces(self, interfaces: Iterable[Interface]) -> SyncStats:
+        return self.sync_table("interfaces", _records(interfaces))
+
+    def sync_incidents(self, incidents: Iterable[Incident]) -> SyncStats:
+        return self.sync_table("incidents", _records(incidents))
+
+    def sync_table(self, table: str, data: pa.Table | pd.DataFrame) -> SyncStats:
+        """Upsert ``data`` into ``table`` by its key, leaving identical rows untouched.
+
+        Rows missing from ``data`` are kept; this is an upsert, not a replace.
+        """
+        keys = TABLE_KEYS[table]
+        columns = list(getattr(data, "column_names", None) or data.columns)
+        values = [column for column in columns if column not in keys]
+        staging = f"{table}_sync"
+        key_match = " AND ".join(f"t.{key} = s.{key}" for key in keys)
+        changed = " OR ".join(f"t.{col} IS DISTINCT FROM s.{col}" for col in values) or "FALSE"
+        assignments = ", ".join(f"{col} = s.{col}" for col in values)
+        self.conn.register(staging, data)
+        self.conn.execute("BEGIN TRANSACTION")
+        try:
+            total = self.conn.execute(f"SELECT count(*) FROM {staging}").fetchone()[0]
+            updated = 0
+            if values:
+                updated = self.conn.execute(
+                    f"UPDATE {table} AS t SET {assignments} FROM {staging} AS s "
+                    f"WHERE {key_match} AND ({changed})"
+                ).fetchone()[0]
+            inserted = self.conn.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"SELECT {', '.join(f's.{col}' for col in columns)} FROM {staging} AS s "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {table} AS t WHERE {key_match})"
+            ).fetchone()[0]
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        finally:
+            self.conn.unregister(staging)
+        self.conn.execute("COMMIT")
+        return SyncStats(inserted=inserted, updated=updated, unchanged=total - inserted - updated)
+
+    def device_os_versions(self, device_ids: Iterable[str]) -> dict[str, str]:
+        return self._device_column("os_version", device_ids)
+
+    def device_sites(self, device_ids: Iterable[str]) -> dict[str, str]:
+        return self._device_column("site", device_ids)
+
+    def _device_column(self, column: str, device_ids: Iterable[str]) -> dict[str, str]:
+        # A cursor keeps this safe to call from pipeline threads other than the owner.
+        cursor = self.conn.cursor()
+        try:
+            rows = cursor.execute(
+                f"SELECT device_id, {column} FROM devices WHERE list_contains(?, device_id)",
+                [sorted(set(device_ids))],
+            ).fetchall()
+        finally:
+            cursor.close()
+        return dict(rows)
+
+    def reset_interfaces(self, targets: pa.Table) -> int:
+        """Record a successful reset for each ``(device_id, name)`` row in ``targets``."""
+        self.conn.register("reset_targets", targets)
+        try:
+            return self.conn.execute(
+                "UPDATE interfaces AS i SET status = 'up', packet_loss = 0, error_rate = 0 "
+                "FROM (SELECT DISTINCT device_id, name FROM reset_targets) AS r "
+                "WHERE i.device_id = r.device_id AND i.name = r.name"
+            ).fetchone()[0]
+        finally:
+            self.conn.unregister("reset_targets")
+
+    def merge_shard(self, path: str | Path) -> int:
+        """Fold a worker's shard database into this one; returns the tickets merged.
+
+        Tickets and metrics are appended. Interface state is copied from the shard,
+        which owns every interface of its devices.
+        """
+        quoted = str(path).replace("'", "''")
+        self.conn.execute(f"ATTACH '{quoted}' AS shard (READ_ONLY)")
+        self.conn.execute("BEGIN TRANSACTION")
+        try:
+            columns = ", ".join(TICKET_COLUMNS)
+            merged = self.conn.execute(
+                f"INSERT INTO tickets ({columns}) SELECT {columns} FROM shard.tickets"
+            ).fetchone()[0]
+            self.conn.execute("INSERT INTO run_metrics SELECT * FROM shard.run_metrics")
+            self.conn.execute(
+                "UPDATE interfaces AS i SET status = s.status, packet_loss = s.packet_loss, "
+                "error_rate = s.error_rate FROM shard.interfaces AS s "
+                "WHERE i.device_id = s.device_id AND i.name = s.name"
+            )
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            self.conn.execute("DETACH shard")
+            raise
+        self.conn.execute("COMMIT")
+        self.conn.execute("DETACH shard")
+        return merged
+
     def write_ticket(
         self,
         incident_id: str,
@@ -104,16 +262,160 @@ class NetOpsDatabase:
         self.conn.execute(
             "INSERT INTO tickets VALUES (?, ?, ?, ?, ?, ?)",
             [incident_id, runbook_id, notes, passed, reason, escalated],
-=======
-    def write_ticket(self, incident_id: str, runbook_id: str, notes: str, passed: bool) -> None:
-        self.conn.execute(
-            "INSERT INTO tickets VALUES (?, ?, ?, ?)",
-            [incident_id, runbook_id, notes, passed],
->>>>>>> main
         )
 
-    def show_tables(self) -> dict[str, pd.DataFrame]:
-        tables = {}
-        for table in ["devices", "interfaces", "incidents", "tickets"]:
-            tables[table] = self.conn.execute(f"SELECT * FROM {table}").df()
-        return tables
+    def write_tickets(self, tickets: pa.Table | pd.DataFrame) -> None:
+        """Append a columnar batch of tickets in a single transaction."""
+        self.conn.execute("BEGIN TRANSACTION")
+        try:
+            self.conn.register("tickets_df", tickets)
+            self.conn.execute(
+                f"INSERT INTO tickets SELECT {', '.join(TICKET_COLUMNS)} FROM tickets_df"
+            )
+            self.conn.unregister("tickets_df")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def write_metrics(self, metrics: pa.Table | pd.DataFrame) -> None:
+        self.conn.register("run_metrics_df", metrics)
+        self.conn.execute("INSERT INTO run_metrics SELECT * FROM run_metrics_df")
+        self.conn.unregister("run_metrics_df")
+
+    def existing_tables(self) -> List[str]:
+        present = {row[0] for row in self.conn.execute("SHOW TABLES").fetchall()}
+        return [table for table in SHOW_TABLES if table in present]
+
+    def count(self, table: str, where: str | None = None) -> int:
+        return self.conn.execute(f"SELECT count(*) FROM {_select(table, where)}").fetchone()[0]
+
+    def scan(
+        self,
+        table: str,
+        *,
+        where: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        batch_size: int = 1000,
+    ) -> Tuple[List[str], Iterator[List[tuple]]]:
+        """Column names and a lazy iterator over ``batch_size`` row chunks of ``table``.
+
+        ``where`` is a SQL predicate. Rows are fetched from a dedicated cursor one
+        chunk at a time, so memory is bounded by the batch, not the result.
+        """
+        sql = f"SELECT * FROM {_select(table, where)}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        if offset:
+            sql += f" OFFSET {int(offset)}"
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql)
+        except Exception:
+            cursor.close()
+            raise
+        columns = [column[0] for column in cursor.description]
+        return columns, _batches(cursor, batch_size)
+
+    def ticket_summary(self, by: str) -> Tuple[List[str], List[tuple]]:
+        """Ticket pass/fail/escalation counts grouped by incident category, severity or site."""
+        key = SUMMARY_KEYS[by]
+        cursor = self.conn.execute(
+            f"""
+            SELECT
+                coalesce({key}, '(unknown)') AS {by},
+                count(*) AS tickets,
+                count(*) FILTER (WHERE t.validation_passed) AS passed,
+                count(*) FILTER (WHERE NOT t.validation_passed) AS failed,
+                count(*) FILTER (WHERE t.escalated) AS escalated,
+                round(100.0 * count(*) FILTER (WHERE t.validation_passed) / count(*), 1)
+                    AS pass_pct
+            FROM tickets AS t
+            LEFT JOIN incidents AS n USING (incident_id)
+            LEFT JOIN devices AS d ON d.device_id = n.device_id
+            GROUP BY 1
+            ORDER BY tickets DESC, 1
+            """
+        )
+        return [column[0] for column in cursor.description], cursor.fetchall()
+
+
+class TicketWriter:
+    """Buffers ticket rows column-wise and flushes them to DuckDB in bulk.
+
+    A flush happens once ``max_rows`` results are buffered or the oldest buffered
+    result is older than ``max_age`` seconds, checked on :meth:`add` and
+    :meth:`flush_if_due`, and always on :meth:`flush`/exit.
+    """
+
+    def __init__(self, db: NetOpsDatabase, max_rows: int = 1000, max_age: float = 5.0) -> None:
+        self.db = db
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self.written = 0
+        self._columns: dict[str, list] = {column: [] for column in TICKET_COLUMNS}
+        self._first_buffered_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._columns["incident_id"])
+
+    def __enter__(self) -> "TicketWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.flush()
+
+    def add(self, result: ExecutionResult) -> None:
+        for column in TICKET_COLUMNS:
+            self._columns[column].append(getattr(result, column))
+        if self._first_buffered_at is None:
+            self._first_buffered_at = time.monotonic()
+        if len(self) >= self.max_rows:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self) -> int:
+        """Flush if the oldest buffered result has waited ``max_age`` seconds.
+
+        Long-running loops call this while idle, so the last rows of a burst do
+        not wait for the next :meth:`add`.
+        """
+        if self._first_buffered_at is None:
+            return 0
+        if time.monotonic() - self._first_buffered_at < self.max_age:
+            return 0
+        return self.flush()
+
+    def flush(self) -> int:
+        count = len(self)
+        if count == 0:
+            return 0
+        import pyarrow as pa
+
+        self.db.write_tickets(pa.table(self._columns))
+        self._columns = {column: [] for column in TICKET_COLUMNS}
+        self._first_buffered_at = None
+        self.written += count
+        return count
+
+
+def _select(table: str, where: str | None) -> str:
+    if table not in SHOW_TABLES:
+        raise ValueError(f"unknown table {table!r}; expected one of {', '.join(SHOW_TABLES)}")
+    return f"{table} WHERE {where}" if where else table
+
+
+def _batches(cursor: duckdb.DuckDBPyConnection, size: int) -> Iterator[List[tuple]]:
+    try:
+        while rows := cursor.fetchmany(size):
+            yield rows
+    finally:
+        cursor.close()
+
+
+def _records(rows: Iterable[BaseModel]) -> pa.Table:
+    import pyarrow as pa
+
+    return pa.Table.from_pylist([row.model_dump() for row in rows])
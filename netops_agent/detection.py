@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+import pyarrow as pa
+
+from .models import Incident
+
+# (summary, category) per anomaly kind, in precedence order when several apply.
+KINDS = (
+    ("Interface flapping detected", "interfaces"),
+    ("Interface down detected", "interfaces"),
+    ("High packet loss observed", "connectivity"),
+    ("High error rate observed", "connectivity"),
+)
+SEVERITIES = ("low", "medium", "high")
+NONE = -1
+
+
+@dataclass(frozen=True)
+class DetectionThresholds:
+    packet_loss: float = 8.0
+    error_rate: float = 1.5
+    zscore: float = 4.0
+    # Trailing samples forming each rolling baseline, and the fewest worth scoring.
+    baseline: int = 10
+    min_baseline: int = 5
+    # Floor for the baseline deviation so near-constant series do not explode.
+    min_std: float = 0.25
+    flaps: int = 3
+
+
+@dataclass
+class DetectionBatch:
+    """Per-interface detection outcome for one sample batch, as parallel arrays."""
+
+    device_id: np.ndarray
+    interface: np.ndarray
+    kind: np.ndarray
+    severity: np.ndarray
+    packet_loss: np.ndarray
+    zscore: np.ndarray
+    flaps: np.ndarray
+    samples: int
+
+    @property
+    def flagged(self) -> np.ndarray:
+        return np.flatnonzero(self.kind != NONE)
+
+
+class AnomalyDetector:
+    """Threshold, rolling z-score and flap detection over telemetry sample batches.
+
+    Samples are sorted into one contiguous run per interface, and every statistic
+    is computed with cumulative sums and ``reduceat`` over the whole batch, so the
+    cost is a few NumPy passes regardless of how many interfaces are present.
+    """
+
+    def __init__(
+        self,
+        thresholds: DetectionThresholds = DetectionThresholds(),
+        *,
+        gateway: str = "10.0.0.1",
+        prefix: str = "det-",
+    ) -> None:
+        self.thresholds = thresholds
+        self.gateway = gateway
+        self.prefix = prefix
+
+    def scan(self, samples: pa.Table) -> DetectionBatch:
+        t = self.thresholds
+        if samples.num_rows == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return DetectionBatch(
+                device_id=np.zeros(0, dtype=object),
+                interface=np.zeros(0, dtype=object),
+                kind=empty,
+                severity=empty,
+                packet_loss=np.zeros(0),
+                zscore=np.zeros(0),
+                flaps=empty,
+                samples=0,
+            )
+        device = _encode(samples.column("device_id"))
+        interface = _encode(samples.column("interface"))
+        device_codes = device.indices.to_numpy().astype(np.int64)
+        interface_codes = interface.indices.to_numpy().astype(np.int64)
+        series = device_codes * max(1, len(interface.dictionary)) + interface_codes
+        ts = samples.column("ts").to_numpy()
+        order = np.lexsort((ts, series))
+        series = series[order]
+        loss = samples.column("packet_loss").to_numpy()[order]
+        errors = samples.column("error_rate").to_numpy()[order]
+        status = _encode(samples.column("status"))
+        values = status.dictionary.to_pylist()
+        down_code = values.index("down") if "down" in values else NONE
+        down = status.indices.to_numpy()[order] == down_code
+
+        count = len(series)
+        starts = np.flatnonzero(np.r_[True, series[1:] != series[:-1]])
+        last = np.r_[starts[1:], count] - 1
+
+        last_z = _trailing_zscore(loss, starts, last, t.baseline, t.min_baseline, t.min_std)
+        changes = np.r_[False, down[1:] != down[:-1]]
+        changes[starts] = False
+        flaps = np.add.reduceat(changes.astype(np.int64), starts)
+
+        last_loss, last_errors = loss[last], errors[last]
+        is_flapping = flaps >= t.flaps
+        is_down = down[last]
+        is_lossy = (last_loss >= t.packet_loss) | (last_z >= t.zscore)
+        is_erroring = last_errors >= t.error_rate
+        kind = np.select([is_flapping, is_down, is_lossy, is_erroring], [0, 1, 2, 3], NONE)
+        severity = np.select(
+            [
+                kind == 0,
+                kind == 1,
+                (kind == 2) & (last_loss < t.packet_loss),
+                kind == 2,
+                kind == 3,
+            ],
+            [
+                np.where(flaps >= 2 * t.flaps, 2, 1),
+                2,
+                0,
+                np.where((last_loss >= 2 * t.packet_loss) | (last_z >= 2 * t.zscore), 2, 1),
+                np.where(last_errors >= 2 * t.error_rate, 2, 1),
+            ],
+            NONE,
+        )
+        latest = order[last]
+        return DetectionBatch(
+            device_id=np.asarray(device.dictionary.to_pylist(), dtype=object)[device_codes[latest]],
+            interface=np.asarray(interface.dictionary.to_pylist(), dtype=object)[
+                interface_codes[latest]
+            ],
+            kind=kind,
+            severity=severity,
+            packet_loss=last_loss,
+            zscore=last_z,
+            flaps=flaps,
+            samples=count,
+        )
+
+    def detect(self, samples: pa.Table) -> List[Incident]:
+        """Scan ``samples`` and build an incident for every flagged interface."""
+        return [Incident(**row) for row in self.incident_table(self.scan(samples)).to_pylist()]
+
+    def incident_table(self, batch: DetectionBatch) -> pa.Table:
+        """Flagged interfaces as rows of the ``incidents`` table schema."""
+        flagged = batch.flagged
+        count = len(flagged)
+        width = max(4, len(str(count)))
+        ids = [f"{self.prefix}{number:0{width}d}" for number in range(1, count + 1)]
+        kinds = batch.kind[flagged]
+        return pa.table(
+            {
+                "incident_id": pa.array(ids, pa.string()),
+                "device_id": pa.array(batch.device_id[flagged], pa.string()),
+                "interface": pa.array(batch.interface[flagged], pa.string()),
+                "summary": pa.array(np.array([k[0] for k in KINDS])[kinds], pa.string()),
+                "category": pa.array(np.array([k[1] for k in KINDS])[kinds], pa.string()),
+                "severity": pa.array(np.array(SEVERITIES)[batch.severity[flagged]], pa.string()),
+                "gateway": pa.array(np.full(count, self.gateway), pa.string()),
+                "should_fail": pa.array(np.zeros(count, dtype=bool)),
+                "failure_reason": pa.array(np.full(count, ""), pa.string()),
+            }
+        )
+
+
+def _encode(column: pa.ChunkedArray) -> pa.DictionaryArray:
+    array = column.combine_chunks()
+    if pa.types.is_dictionary(array.type):
+        return array.cast(pa.dictionary(pa.int32(), pa.string()))
+    return array.dictionary_encode()
+
+
+def _trailing_zscore(
+    values: np.ndarray,
+    starts: np.ndarray,
+    positions: np.ndarray,
+    window: int,
+    min_count: int,
+    min_std: float,
+) -> np.ndarray:
+    """Z-score of ``values[positions]`` against up to ``window`` earlier samples.
+
+    ``starts[i]`` is the first sample of the series containing ``positions[i]``;
+    the baseline never reaches into a previous series.
+    """
+    sums = np.zeros(len(values) + 1)
+    np.cumsum(values, out=sums[1:])
+    squares = np.zeros(len(values) + 1)
+    np.cumsum(values * values, out=squares[1:])
+    lower = np.maximum(starts, positions - window)
+    counts = positions - lower
+    safe = np.maximum(counts, 1)
+    mean = (sums[positions] - sums[lower]) / safe
+    variance = (squares[positions] - squares[lower]) / safe - mean * mean
+    std = np.maximum(np.sqrt(np.maximum(variance, 0.0)), min_std)
+    return np.where(counts >= min_count, (values[positions] - mean) / std, 0.0)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import zlib
+from typing import Tuple
+
+from .db import NetOpsDatabase
+from .inventory import InventoryStore
+
+
+class DeviceSimulator:
+    """Line-based CLI server answering show/ping/reset commands from interface state.
+
+    A client opens a TCP connection, sends ``login <device_id>`` and then one
+    command per line; every command gets exactly one response line. Each login
+    costs ``connect_latency`` seconds and each command ``command_latency``.
+    Interface state lives in a columnar :class:`InventoryStore` that resets mutate.
+    """
+
+    def __init__(
+        self,
+        inventory: InventoryStore,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        command_latency: float = 0.0,
+        connect_latency: float = 0.0,
+    ) -> None:
+        self.inventory = inventory
+        self.host = host
+        self.port = port
+        self.command_latency = command_latency
+        self.connect_latency = connect_latency
+        self.connections = 0
+        self.commands = 0
+        self._server: asyncio.AbstractServer | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_database(cls, db: NetOpsDatabase, **kwargs: object) -> "DeviceSimulator":
+        return cls(InventoryStore.from_database(db), **kwargs)  # type: ignore[arg-type]
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.host, self.port
+
+    async def serve(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def run_forever(self) -> None:
+        """Serve on the current thread until interrupted."""
+
+        async def _main() -> None:
+            await self.serve()
+            assert self._server is not None
+            async with self._server:
+                await self._server.serve_forever()
+
+        asyncio.run(_main())
+
+    def start_in_thread(self) -> Tuple[str, int]:
+        """Run the server on a private event loop in a daemon thread."""
+        ready = threading.Event()
+
+        def _run() -> None:
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.serve())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=_run, name="device-sim", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.address
+
+    def stop(self) -> None:
+        if self._loop is None or self._server is None:
+            return
+
+        async def _close() -> None:
+            assert self._server is not None
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(_close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        device_id: str | None = None
+        try:
+            while line := await reader.readline():
+                command = line.decode().strip()
+                if command == "exit":
+                    break
+                if device_id is None:
+                    device_id, response = await self._login(command)
+                else:
+                    response = await self._execute(device_id, command)
+                writer.write(response.encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _login(self, command: str) -> Tuple[str | None, str]:
+        parts = command.split()
+        if len(parts) != 2 or parts[0] != "login":
+            return None, "% Login required"
+        await asyncio.sleep(self.connect_latency)
+        if parts[1] not in self.inventory:
+            return None, f"% Unknown device {parts[1]}"
+        return parts[1], f"OK {self.inventory.hostname(parts[1])}"
+
+    async def _execute(self, device_id: str, command: str) -> str:
+        if command == "keepalive":
+            return "OK"
+        self.commands += 1
+        await asyncio.sleep(self.command_latency)
+        inventory = self.inventory
+        words = command.replace(";", " ").split()
+        if "shutdown" in words:
+            name = words[words.index("interface") + 1] if "interface" in words else ""
+            row = inventory.interface_row(device_id, name)
+            if row is None:
+                return f"% Invalid interface {name}"
+            inventory.set_interface(row, status="up", packet_loss=0.0, error_rate=0.0)
+            return "Interface reset completed"
+        if command.startswith("show interface"):
+            name = words[2] if len(words) > 2 else ""
+            row = inventory.interface_row(device_id, name)
+            if row is None:
+                return f"% Invalid interface {name}"
+            packet_loss, error_rate = inventory.packet_loss[row], inventory.error_rate[row]
+            if words[-1] == "counters":
+                return f"Errors: {round(error_rate * 100)}, Drops: {round(packet_loss * 10)}"
+            return (
+                f"{name} is {inventory.status[row]}, packet loss {packet_loss:.2f}%, "
+                f"error rate {error_rate:.2f}%"
+            )
+        if command.startswith("ping"):
+            losses = inventory.packet_loss[inventory.interface_rows(device_id)]
+            worst = float(losses.max()) if losses.size else 0.0
+            return f"Success rate {round(100 - worst)} percent"
+        if command == "show process cpu":
+            return f"CPU utilization {20 + zlib.crc32(device_id.encode()) % 70}%"
+        return f"% Unknown command: {command}"
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, List
+
+# Structured fields copied from ``extra={...}`` onto each JSONL record when present.
+FIELDS = ("incident_id", "stage", "runbook_id", "tool", "latency_ms")
+_TAG = re.compile(r"\[([A-Z][A-Z-]*)\]\s*")
+_ENCODER = json.JSONEncoder(default=str)
+
+
+def event_of(record: logging.LogRecord) -> Dict[str, Any]:
+    """The JSON-ready form of ``record``, built once and cached on the record.
+
+    A leading ``[TAG]`` in the message becomes the ``stage`` unless one was passed
+    explicitly.
+    """
+    cached = record.__dict__.get("_event")
+    if cached is not None:
+        return cached
+    message = record.getMessage()
+    tag = _TAG.match(message)
+    event: Dict[str, Any] = {
+        "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+            timespec="milliseconds"
+        ),
+        "level": record.levelname,
+        "stage": tag.group(1).lower() if tag else None,
+        "message": message[tag.end() :] if tag else message,
+    }
+    for name in FIELDS:
+        value = record.__dict__.get(name)
+        if value is not None:
+            event[name] = value
+    if record.exc_info and not record.exc_text:
+        record.exc_text = logging.Formatter().formatException(record.exc_info)
+    if record.exc_text:
+        event["exception"] = record.exc_text
+    record._event = event
+    return event
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return _ENCODER.encode(event_of(record))
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last ``capacity`` events in memory for debugging."""
+
+    def __init__(self, capacity: int = 1000) -> None:
+        super().__init__()
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.events.append(event_of(record))
+
+    def recent(self, limit: int | None = None, incident_id: str | None = None) -> List[Dict]:
+        """The last ``limit`` events, oldest first; ``None`` returns all of them."""
+        events = list(self.events)
+        if incident_id is not None:
+            events = [event for event in events if event.get("incident_id") == incident_id]
+        if limit is None:
+            return events
+        return events[-limit:] if limit > 0 else []
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records unformatted, so message formatting happens on the writer thread.
+
+    The stock handler formats on the caller's thread. Log arguments must therefore
+    not be mutated after the call; every call site passes strings and numbers.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, pipeline: "LogPipeline") -> None:
+        super().__init__(log_queue)
+        self.pipeline = pipeline
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonLinesFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-rotated JSONL file that leaves flushing to the listener.
+
+    The stock handler flushes after every record and formats, seeks and stats the
+    file again to decide on rollover. This one counts the bytes it wrote, and the
+    listener flushes once the queue runs dry, so a burst of events costs one write.
+    """
+
+    def __init__(self, path: Path, max_bytes: int, backups: int) -> None:
+        super().__init__(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        self.setFormatter(JsonLinesFormatter())
+        self.size = self.stream.seek(0, 2)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.write(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+    def write(self, line: str) -> None:
+        """Append one formatted line, rotating first if it would exceed ``maxBytes``."""
+        # The size is in bytes, as on disk; only non-ASCII text needs encoding to count.
+        size = len(line) if line.isascii() else len(line.encode("utf-8"))
+        if self.maxBytes and self.size + size > self.maxBytes:
+            self.doRollover()
+            self.size = 0
+        self.stream.write(line)
+        self.size += size
+
+    def flush(self) -> None:
+        pass
+
+    def sync(self) -> None:
+        super().flush()
+
+
+class _Listener(logging.handlers.QueueListener):
+    def handle(self, record: logging.LogRecord | threading.Event | str) -> None:
+        # An Event is a flush marker: everything queued before it has been written.
+        if isinstance(record, threading.Event):
+            self.sync()
+            record.set()
+            return
+        # A string is an already formatted JSONL line, appended from another log.
+        if isinstance(record, str):
+            for handler in self.handlers:
+                if isinstance(handler, JsonLinesFileHandler):
+                    handler.write(record)
+        else:
+            super().handle(record)
+        if self.queue.empty():
+            self.sync()
+
+    def sync(self) -> None:
+        for handler in self.handlers:
+            if isinstance(handler, JsonLinesFileHandler):
+                handler.sync()
+
+
+class LogPipeline:
+    """Logger -> queue -> background listener -> rotating JSONL file.
+
+    Producers only pay for a level check and a queue put. The listener thread
+    formats each record and writes it to the file, to the ring buffer and, when
+    ``verbose`` is set, as text to stderr. Records below ``level`` are dropped by
+    the logger before any record object is built.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        path: str | Path,
+        *,
+        level: int | str = logging.INFO,
+        verbose: bool = False,
+        max_bytes: int = 50 * 1024 * 1024,
+        backups: int = 3,
+        ring_size: int = 1000,
+    ) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = JsonLinesFileHandler(path, max_bytes, backups)
+        self.ring = RingBufferHandler(ring_size)
+        self.handlers: List[logging.Handler] = [file_handler, self.ring]
+        if verbose:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(
+                logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+            )
+            self.handlers.append(console_handler)
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.listener = _Listener(self.queue, *self.handlers)
+        self.logger = logger
+        for handler in list(logger.handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                handler.pipeline.stop()
+        logger.handlers.clear()
+        logger.setLevel(level)
+        logger.propagate = False
+        self.handler = DeferredQueueHandler(self.queue, self)
+        logger.addHandler(self.handler)
+        self.listener.start()
+        atexit.register(self.stop)
+
+    @property
+    def running(self) -> bool:
+        return self.listener._thread is not None
+
+    def flush(self) -> None:
+        """Block until every record queued so far has been written."""
+        if self.running:
+            marker = threading.Event()
+            self.queue.put(marker)
+            marker.wait()
+
+    def append(self, path: str | Path) -> None:
+        """Queue every line of another JSONL log, such as a worker's, for the log file.
+
+        The lines go through the file handler, so its size count and rotation stay
+        correct.
+        """
+        if not self.running:
+            return
+        with open(path, encoding="utf-8") as lines:
+            for line in lines:
+                self.queue.put(line if line.endswith("\n") else line + "\n")
+
+    def stop(self) -> None:
+        """Drain the queue, stop the writer thread and close the log file."""
+        if not self.running:
+            return
+        self.logger.removeHandler(self.handler)
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+        atexit.unregister(self.stop)
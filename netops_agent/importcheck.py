@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+# Packages lightweight subcommands must not import at startup.
+HEAVY_MODULES = ("sklearn", "scipy", "pandas", "pyarrow", "numpy")
+
+# (label, argv) pairs checked by check_startup; "{db}" is replaced with a scratch database.
+LIGHT_COMMANDS: Tuple[Tuple[str, Sequence[str]], ...] = (
+    ("--help", ("--help",)),
+    ("show-db", ("show-db", "--db-path", "{db}")),
+)
+
+
+@dataclass
+class ImportReport:
+    command: str
+    wall_ms: float
+    heavy: List[str] = field(default_factory=list)
+    budget_ms: float = float("inf")
+
+    @property
+    def ok(self) -> bool:
+        return not self.heavy and self.wall_ms <= self.budget_ms
+
+
+def imported_packages(importtime_log: str) -> Dict[str, int]:
+    """Top-level packages and their cumulative import time (us) from ``-X importtime``."""
+    packages: Dict[str, int] = {}
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        package = name.strip().split(".")[0]
+        packages[package] = max(packages.get(package, 0), int(cumulative))
+    return packages
+
+
+def measure(label: str, argv: Sequence[str], *, budget_ms: float) -> ImportReport:
+    command = [sys.executable, "-m", "netops_agent.cli", *argv]
+    start = time.perf_counter()
+    subprocess.run(command, capture_output=True, check=False)
+    wall_ms = (time.perf_counter() - start) * 1000
+    traced = subprocess.run(
+        [sys.executable, "-X", "importtime", *command[1:]],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    packages = imported_packages(traced.stderr)
+    heavy = [name for name in HEAVY_MODULES if name in packages]
+    return ImportReport(command=label, wall_ms=wall_ms, heavy=heavy, budget_ms=budget_ms)
+
+
+def check_startup(budget_ms: float = 500.0) -> List[ImportReport]:
+    with tempfile.TemporaryDirectory(prefix="netops-imports-") as tmp:
+        db_path = str(Path(tmp) / "check.duckdb")
+        from .db import NetOpsDatabase
+
+        NetOpsDatabase(db_path).init_schema()
+        return [
+            measure(label, [arg.replace("{db}", db_path) for arg in argv], budget_ms=budget_ms)
+            for label, argv in LIGHT_COMMANDS
+        ]
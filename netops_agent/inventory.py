@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pyarrow as pa
+
+from .db import NetOpsDatabase
+from .models import Device, Interface
+
+# Columns from_arrow requires, mirroring the fields of Device and Interface.
+DEVICE_COLUMNS = {"device_id": str, "hostname": str, "site": str, "os_version": str}
+INTERFACE_COLUMNS = {
+    "device_id": str,
+    "name": str,
+    "status": str,
+    "packet_loss": float,
+    "error_rate": float,
+}
+
+
+class Categorical:
+    """A dictionary-encoded string column: int32 codes into a small list of values."""
+
+    def __init__(self, codes: np.ndarray, values: Sequence[str]) -> None:
+        self.codes = codes
+        self.values = list(values)
+        self._lookup = {value: code for code, value in enumerate(self.values)}
+
+    @classmethod
+    def from_arrow(cls, array: pa.Array | pa.ChunkedArray) -> "Categorical":
+        if isinstance(array, pa.ChunkedArray):
+            if pa.types.is_dictionary(array.type):
+                array = array.unify_dictionaries()
+            array = array.combine_chunks()
+        if array.null_count:
+            raise ValueError("categorical columns must not contain nulls")
+        if not pa.types.is_dictionary(array.type):
+            array = array.dictionary_encode()
+        # A writable copy, so that codes can be updated in place.
+        codes = np.array(array.indices.to_numpy(zero_copy_only=False), dtype=np.int32)
+        return cls(codes, array.dictionary.cast(pa.string()).to_pylist())
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+    def code(self, value: str, *, add: bool = False) -> int:
+        """Code for ``value``; -1 if absent unless ``add`` extends the dictionary."""
+        code = self._lookup.get(value, -1)
+        if code < 0 and add:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def take(self, rows: np.ndarray) -> "Categorical":
+        return Categorical(self.codes[rows], self.values)
+
+    def to_arrow(self) -> pa.DictionaryArray:
+        return pa.DictionaryArray.from_arrays(
+            pa.array(self.codes, type=pa.int32()), pa.array(self.values, type=pa.string())
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(len(value) for value in self.values)
+
+
+class InventoryStore:
+    """Devices and interfaces held as typed columns instead of model objects.
+
+    Repetitive strings (site, OS version, interface name, status) are dictionary
+    encoded, unique ones (device id, hostname) stay as Arrow string arrays, and
+    counters are float64 NumPy arrays. Interfaces are grouped by device, so
+    ``offsets[d]:offsets[d + 1]`` are the interfaces of device row ``d``. Models
+    are only built by the row accessors, and the ``*_table`` methods hand DuckDB
+    Arrow views over the same buffers.
+    """
+
+    def __init__(
+        self,
+        device_ids: pa.StringArray,
+        hostnames: pa.StringArray,
+        site: Categorical,
+        os_version: Categorical,
+        offsets: np.ndarray,
+        interface_device: np.ndarray,
+        name: Categorical,
+        status: Categorical,
+        packet_loss: np.ndarray,
+        error_rate: np.ndarray,
+    ) -> None:
+        self.device_ids = device_ids
+        self.hostnames = hostnames
+        self.site = site
+        self.os_version = os_version
+        self.offsets = offsets
+        self.interface_device = interface_device
+        self.name = name
+        self.status = status
+        self.packet_loss = packet_loss
+        self.error_rate = error_rate
+        self.device_index: Dict[str, int] = {
+            device_id: row for row, device_id in enumerate(device_ids.to_pylist())
+        }
+
+    @classmethod
+    def from_models(
+        cls, devices: Sequence[Device], interfaces: Sequence[Interface]
+    ) -> "InventoryStore":
+        return cls.from_arrow(
+            pa.Table.from_pylist([device.model_dump() for device in devices]),
+            pa.Table.from_pylist([interface.model_dump() for interface in interfaces]),
+        )
+
+    @classmethod
+    def from_database(cls, db: NetOpsDatabase) -> "InventoryStore":
+        return cls.from_arrow(
+            db.conn.execute("SELECT * FROM devices").fetch_arrow_table(),
+            db.conn.execute("SELECT * FROM interfaces").fetch_arrow_table(),
+        )
+
+    @classmethod
+    def from_arrow(cls, devices: pa.Table, interfaces: pa.Table) -> "InventoryStore":
+        """Build from Arrow tables with the devices/interfaces columns.
+
+        Raises ``ValueError`` for missing, mistyped or null columns, duplicate device
+        ids, or interfaces of unknown devices.
+        """
+        import pyarrow.compute as pc
+
+        _check_columns("devices", devices, DEVICE_COLUMNS)
+        _check_columns("interfaces", interfaces, INTERFACE_COLUMNS)
+        device_ids = devices.column("device_id").cast(pa.string()).combine_chunks()
+        if pc.count_distinct(device_ids).as_py() != len(device_ids):
+            raise ValueError("device_id values must be unique")
+        owners = pc.index_in(interfaces.column("device_id").cast(pa.string()), device_ids)
+        if owners.null_count:
+            raise ValueError("interfaces reference unknown device_id values")
+        owner_rows = owners.to_numpy().astype(np.int32, copy=False)
+        order = np.argsort(owner_rows, kind="stable")
+        grouped = interfaces.take(pa.array(order))
+        offsets = np.zeros(len(device_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owner_rows, minlength=len(device_ids)), out=offsets[1:])
+        return cls(
+            device_ids=device_ids,
+            hostnames=devices.column("hostname").cast(pa.string()).combine_chunks(),
+            site=Categorical.from_arrow(devices.column("site")),
+            os_version=Categorical.from_arrow(devices.column("os_version")),
+            offsets=offsets,
+            interface_device=owner_rows[order],
+            name=Categorical.from_arrow(grouped.column("name")),
+            status=Categorical.from_arrow(grouped.column("status")),
+            packet_loss=_floats(grouped.column("packet_loss")),
+            error_rate=_floats(grouped.column("error_rate")),
+        )
+
+    @property
+    def num_devices(self) -> int:
+        return len(self.device_ids)
+
+    @property
+    def num_interfaces(self) -> int:
+        return len(self.interface_device)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.offsets, self.interface_device, self.packet_loss, self.error_rate)
+        return (
+            self.device_ids.nbytes
+            + self.hostnames.nbytes
+            + sum(array.nbytes for array in arrays)
+            + sum(col.nbytes for col in (self.site, self.os_version, self.name, self.status))
+        )
+
+    def __contains__(self, device_id: object) -> bool:
+        return device_id in self.device_index
+
+    def hostname(self, device_id: str) -> str:
+        return self.hostnames[self.device_index[device_id]].as_py()
+
+    def device(self, device_id: str) -> Device:
+        row = self.device_index[device_id]
+        return Device(
+            device_id=device_id,
+            hostname=self.hostnames[row].as_py(),
+            site=self.site[row],
+            os_version=self.os_version[row],
+        )
+
+    def interface_rows(self, device_id: str) -> slice:
+        row = self.device_index[device_id]
+        return slice(int(self.offsets[row]), int(self.offsets[row + 1]))
+
+    def interface_row(self, device_id: str, name: str) -> int | None:
+        if device_id not in self.device_index:
+            return None
+        rows = self.interface_rows(device_id)
+        hits = np.flatnonzero(self.name.codes[rows] == self.name.code(name))
+        return rows.start + int(hits[0]) if hits.size else None
+
+    def interface(self, row: int) -> Interface:
+        return Interface(
+            device_id=self.device_ids[self.interface_device[row]].as_py(),
+            name=self.name[row],
+            status=self.status[row],
+            packet_loss=float(self.packet_loss[row]),
+            error_rate=float(self.error_rate[row]),
+        )
+
+    def interfaces_of(self, device_id: str) -> List[Interface]:
+        rows = self.interface_rows(device_id)
+        return [self.interface(row) for row in range(rows.start, rows.stop)]
+
+    def set_interface(
+        self, row: int, *, status: str, packet_loss: float, error_rate: float
+    ) -> None:
+        self.status.codes[row] = self.status.code(status, add=True)
+        self.packet_loss[row] = packet_loss
+        self.error_rate[row] = error_rate
+
+    def devices_table(self) -> pa.Table:
+        return pa.table(
+            {
+                "device_id": self.device_ids,
+                "hostname": self.hostnames,
+                "site": self.site.to_arrow(),
+                "os_version": self.os_version.to_arrow(),
+            }
+        )
+
+    def interfaces_table(self) -> pa.Table:
+        return pa.table(
+            {
+                "device_id": pa.DictionaryArray.from_arrays(
+                    pa.array(self.interface_device, type=pa.int32()), self.device_ids
+                ),
+                "name": self.name.to_arrow(),
+                "status": self.status.to_arrow(),
+                "packet_loss": pa.array(self.packet_loss),
+                "error_rate": pa.array(self.error_rate),
+            }
+        )
+
+
+def _check_columns(label: str, table: pa.Table, columns: Dict[str, type]) -> None:
+    missing = [name for name in columns if name not in table.column_names]
+    if missing:
+        raise ValueError(f"{label} table is missing columns: {', '.join(missing)}")
+    for name, kind in columns.items():
+        column = table.column(name)
+        value_type = column.type.value_type if pa.types.is_dictionary(column.type) else column.type
+        if kind is str:
+            valid = pa.types.is_string(value_type) or pa.types.is_large_string(value_type)
+        else:
+            valid = pa.types.is_floating(value_type) or pa.types.is_integer(value_type)
+        if not valid:
+            expected = "string" if kind is str else "numeric"
+            raise ValueError(f"{label}.{name} must be {expected}, not {column.type}")
+        if column.null_count:
+            raise ValueError(f"{label}.{name} has {column.null_count} null values")
+
+
+def _floats(column: pa.ChunkedArray) -> np.ndarray:
+    # Copy so the counters are writable; Arrow-backed NumPy views are read-only.
+    return np.array(column.cast(pa.float64()).to_numpy(), dtype=np.float64)
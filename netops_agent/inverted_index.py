@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .models import Runbook
+
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+Postings = Tuple[np.ndarray, np.ndarray]
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def runbook_text(runbook: Runbook) -> str:
+    return " ".join([runbook.title, runbook.category, *runbook.steps, *runbook.commands])
+
+
+class InvertedIndex:
+    """BM25 postings lists partitioned by runbook category.
+
+    Each partition maps a term to ``(doc_ids, impacts)`` arrays, where the impact is
+    the term's precomputed BM25 contribution for that document. Statistics are
+    corpus-wide, so scores from different partitions are comparable. A query only
+    reads the postings of its own terms in the selected partition. The partition
+    over every category is keyed by ``ALL``, which no category name can equal.
+    """
+
+    ALL = None
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.n_docs = 0
+        self.partitions: Dict[str | None, Dict[str, Postings]] = {}
+        # Per OS version, which documents apply to it; documents without
+        # os_versions apply to every version, including unknown ones.
+        self.os_docs: Dict[str, np.ndarray] = {}
+        self.unrestricted = np.zeros(0, dtype=bool)
+
+    @classmethod
+    def from_runbooks(cls, runbooks: Sequence[Runbook], **kwargs: float) -> "InvertedIndex":
+        index = cls(**kwargs)
+        index.build(
+            [tokenize(runbook_text(rb)) for rb in runbooks],
+            [rb.category for rb in runbooks],
+            [rb.os_versions for rb in runbooks],
+        )
+        return index
+
+    def build(
+        self,
+        documents: Sequence[Sequence[str]],
+        categories: Sequence[str],
+        os_versions: Sequence[Sequence[str]],
+    ) -> None:
+        self.n_docs = len(documents)
+        lengths = np.array([len(doc) for doc in documents], dtype=np.float64)
+        avg_length = float(lengths.mean()) if self.n_docs else 0.0
+        term_docs: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for doc_id, doc in enumerate(documents):
+            for term, tf in Counter(doc).items():
+                term_docs[term].append((doc_id, tf))
+
+        grouped: Dict[str | None, Dict[str, List[Tuple[int, float]]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for term, entries in term_docs.items():
+            idf = math.log(1 + (self.n_docs - len(entries) + 0.5) / (len(entries) + 0.5))
+            for doc_id, tf in entries:
+                norm = self.k1 * (1 - self.b + self.b * lengths[doc_id] / (avg_length or 1.0))
+                impact = idf * tf * (self.k1 + 1) / (tf + norm)
+                grouped[categories[doc_id]][term].append((doc_id, impact))
+                grouped[self.ALL][term].append((doc_id, impact))
+        self.partitions = {
+            category: {
+                term: (
+                    np.fromiter((d for d, _ in entries), dtype=np.int32, count=len(entries)),
+                    np.fromiter((w for _, w in entries), dtype=np.float32, count=len(entries)),
+                )
+                for term, entries in terms.items()
+            }
+            for category, terms in grouped.items()
+        }
+
+        self.unrestricted = np.array([not versions for versions in os_versions], dtype=bool)
+        self.os_docs = {}
+        for doc_id, versions in enumerate(os_versions):
+            for version in versions:
+                if version not in self.os_docs:
+                    self.os_docs[version] = self.unrestricted.copy()
+                self.os_docs[version][doc_id] = True
+
+    def search(
+        self,
+        text: str,
+        top_k: int = 1,
+        *,
+        category: str | None = None,
+        os_version: str | None = None,
+    ) -> List[Tuple[int, float]]:
+        """Return up to ``top_k`` ``(doc_id, score)`` pairs for documents sharing a term."""
+        partition = self.partitions.get(category or self.ALL)
+        if not partition:
+            return []
+        postings = [partition[term] for term in set(tokenize(text)) if term in partition]
+        if not postings:
+            return []
+        doc_ids = np.concatenate([ids for ids, _ in postings])
+        impacts = np.concatenate([weights for _, weights in postings])
+        if os_version is not None:
+            keep = self.os_docs.get(os_version, self.unrestricted)[doc_ids]
+            doc_ids, impacts = doc_ids[keep], impacts[keep]
+            if doc_ids.size == 0:
+                return []
+        candidates, inverse = np.unique(doc_ids, return_inverse=True)
+        scores = np.bincount(inverse, weights=impacts, minlength=candidates.size)
+        top_k = min(top_k, candidates.size)
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.lexsort((candidates[best], -scores[best]))]
+        return [(int(candidates[idx]), float(scores[idx])) for idx in best]
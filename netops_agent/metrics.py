@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterator, List, Tuple
+
+from .db import NetOpsDatabase
+
+# Upper bounds in seconds, Prometheus style; +Inf is implicit.
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+METRIC_COLUMNS = ("run_id", "incident_id", "stage", "tool", "started_at", "duration_ms")
+
+_NOOP: ContextManager[None] = nullcontext()
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        running = 0
+        rows = []
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            running += count
+            rows.append((bound, running))
+        return rows
+
+
+class MetricsRecorder:
+    """Times pipeline stages into histograms and keeps one row per span.
+
+    When ``enabled`` is false :meth:`span` returns a shared no-op context, so
+    instrumented code pays only for the call.
+    """
+
+    def __init__(self, enabled: bool = False, run_id: str | None = None) -> None:
+        self.enabled = enabled
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._rows: Dict[str, list] = {column: [] for column in METRIC_COLUMNS}
+        self._lock = threading.Lock()
+
+    def span(self, stage: str, incident_id: str = "", tool: str = "") -> ContextManager[None]:
+        if not self.enabled:
+            return _NOOP
+        return self._span(stage, incident_id, tool)
+
+    @contextmanager
+    def _span(self, stage: str, incident_id: str, tool: str) -> Iterator[None]:
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, incident_id, tool, started_at)
+
+    def observe(
+        self,
+        stage: str,
+        seconds: float,
+        incident_id: str = "",
+        tool: str = "",
+        started_at: float | None = None,
+    ) -> None:
+        with self._lock:
+            histogram = self.histograms.get((stage, tool))
+            if histogram is None:
+                histogram = self.histograms[(stage, tool)] = Histogram()
+            histogram.observe(seconds)
+            row = (
+                self.run_id,
+                incident_id,
+                stage,
+                tool,
+                started_at if started_at is not None else time.time(),
+                seconds * 1000.0,
+            )
+            for column, value in zip(METRIC_COLUMNS, row):
+                self._rows[column].append(value)
+
+    def persist(self, db: NetOpsDatabase) -> int:
+        """Append buffered spans to ``run_metrics`` and clear the buffer."""
+        with self._lock:
+            rows, self._rows = self._rows, {column: [] for column in METRIC_COLUMNS}
+        count = len(rows["stage"])
+        if count:
+            import pyarrow as pa
+
+            rows["started_at"] = pa.array(
+                [int(ts * 1_000_000) for ts in rows["started_at"]], type=pa.timestamp("us")
+            )
+            db.write_metrics(pa.table(rows))
+        return count
+
+    def to_prometheus(self) -> str:
+        name = "netops_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Time spent per pipeline stage.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for (stage, tool), histogram in sorted(self.histograms.items()):
+                labels = f'stage="{stage}"' + (f',tool="{tool}"' if tool else "")
+                for bound, count in histogram.cumulative():
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.total:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
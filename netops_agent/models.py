@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Dict, List
 
 from pydantic import BaseModel, Field
 
@@ -39,6 +39,8 @@ class Runbook(BaseModel):
     steps: List[str]
     commands: List[str]
     validation: List[str]
+    # Empty means the runbook applies to every OS version.
+    os_versions: List[str] = Field(default_factory=list)
 
 
 class ExecutionResult(BaseModel):
@@ -49,3 +51,5 @@ class ExecutionResult(BaseModel):
     validation_reason: str
     escalated: bool
     notes: str
+    # Readings taken from tool output during execution, such as cpu_utilization.
+    observed: Dict[str, float] = Field(default_factory=dict)
@@ -1,63 +1,306 @@
 from __future__ import annotations
 
+import hashlib
+from collections import Counter
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Sequence, Tuple
 
 import duckdb
 import numpy as np
 import yaml
-from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
 
+from .inverted_index import TOKEN_PATTERN, InvertedIndex, runbook_text
 from .models import Runbook
+from .retrieval_cache import Ranked, RetrievalCache, normalize
 
 
 class RunbookIndex:
-    def __init__(self, db_path: str = "outputs/netops.duckdb") -> None:
+    def __init__(self, db_path: str = "outputs/netops.duckdb", cache_size: int = 4096) -> None:
         self.db_path = db_path
-        self.vectorizer = TfidfVectorizer(stop_words="english")
+        self.cache = RetrievalCache(cache_size)
+        self.vocabulary: Dict[str, int] = {}
+        self.idf: np.ndarray | None = None
         self.runbooks: List[Runbook] = []
-        self.embeddings: np.ndarray | None = None
+        self.embeddings: sparse.csr_matrix | None = None
+        self.norms: np.ndarray | None = None
+        self.source_hash: str | None = None
+        self._inverted: InvertedIndex | None = None
+
+    @staticmethod
+    def hash_source(runbook_path: Path) -> str:
+        return hashlib.sha256(runbook_path.read_bytes()).hexdigest()
 
     def load_runbooks(self, runbook_path: Path) -> None:
-        payload = yaml.safe_load(runbook_path.read_text())
-        self.runbooks = [Runbook(**rb) for rb in payload.get("runbooks", [])]
+        """Parse ``runbook_path``; raises ``ValueError`` if it holds no valid runbooks."""
+        raw = runbook_path.read_bytes()
+        try:
+            payload = yaml.safe_load(raw) or {}
+        except yaml.YAMLError as exc:
+            raise ValueError(f"{runbook_path}: {exc}") from exc
+        runbooks = [Runbook(**rb) for rb in payload.get("runbooks") or []]
+        if not runbooks:
+            raise ValueError(f"{runbook_path} defines no runbooks")
+        self.runbooks = runbooks
+        self.source_hash = hashlib.sha256(raw).hexdigest()
+        self.cache.clear()
 
     def build(self) -> None:
-        corpus = [" ".join([rb.title, rb.category, *rb.steps, *rb.commands]) for rb in self.runbooks]
-        self.embeddings = self.vectorizer.fit_transform(corpus).toarray()
+        # scikit-learn is only needed to fit; warm starts and queries never import it.
+        from sklearn.feature_extraction.text import TfidfVectorizer
 
-    def persist(self) -> None:
-        if self.embeddings is None:
+        corpus = [runbook_text(rb) for rb in self.runbooks]
+        vectorizer = TfidfVectorizer(stop_words="english")
+        matrix = vectorizer.fit_transform(corpus).astype(np.float32)
+        self.vocabulary = {term: int(idx) for term, idx in vectorizer.vocabulary_.items()}
+        self.idf = np.asarray(vectorizer.idf_, dtype=np.float64)
+        self._set_embeddings(sparse.csr_matrix(matrix))
+
+    def transform(self, texts: Sequence[str]) -> sparse.csr_matrix:
+        """Encode texts exactly as the fitted TfidfVectorizer would (l2-normalized TF-IDF)."""
+        if self.idf is None:
             raise ValueError("Index not built")
-        conn = duckdb.connect(self.db_path)
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS runbooks (
-                runbook_id VARCHAR,
-                title VARCHAR,
-                category VARCHAR,
-                content VARCHAR,
-                embedding DOUBLE[]
-            );
-            """
+        indptr = [0]
+        indices: List[int] = []
+        counts: List[int] = []
+        for text in texts:
+            terms = Counter(
+                self.vocabulary[token]
+                for token in TOKEN_PATTERN.findall(text.lower())
+                if token in self.vocabulary
+            )
+            indices.extend(terms.keys())
+            counts.extend(terms.values())
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.asarray(counts, dtype=np.float64), indices, indptr),
+            shape=(len(texts), len(self.vocabulary)),
         )
-        conn.execute("DELETE FROM runbooks")
-        for rb, embedding in zip(self.runbooks, self.embeddings):
-            content = "\n".join([rb.title, *rb.steps, *rb.commands])
+        matrix.data *= self.idf[matrix.indices]
+        row_norms = np.repeat(self._row_norms(matrix), np.diff(matrix.indptr))
+        matrix.data /= np.where(row_norms > 0, row_norms, 1.0)
+        matrix.sort_indices()
+        return matrix
+
+    def persist(self, db_path: str | None = None) -> None:
+        """Write runbooks, sparse float32 vectors and the fitted vocabulary in bulk.
+
+        ``db_path`` defaults to the index's own database.
+        """
+        import pyarrow as pa
+
+        if self.embeddings is None or self.idf is None:
+            raise ValueError("Index not built")
+        embeddings = self.embeddings
+        rows = pa.table(
+            {
+                "runbook_id": [rb.runbook_id for rb in self.runbooks],
+                "title": [rb.title for rb in self.runbooks],
+                "category": [rb.category for rb in self.runbooks],
+                "content": ["\n".join([rb.title, *rb.steps, *rb.commands]) for rb in self.runbooks],
+                "payload": [rb.model_dump_json(by_alias=True) for rb in self.runbooks],
+                "term_indices": pa.ListArray.from_arrays(
+                    pa.array(embeddings.indptr, type=pa.int32()),
+                    pa.array(embeddings.indices, type=pa.int32()),
+                ),
+                "term_weights": pa.ListArray.from_arrays(
+                    pa.array(embeddings.indptr, type=pa.int32()),
+                    pa.array(embeddings.data, type=pa.float32()),
+                ),
+            }
+        )
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        with duckdb.connect(db_path or self.db_path) as conn:
+            conn.execute("BEGIN TRANSACTION")
+            conn.execute(
+                """
+                CREATE OR REPLACE TABLE runbooks (
+                    runbook_id VARCHAR,
+                    title VARCHAR,
+                    category VARCHAR,
+                    content VARCHAR,
+                    payload VARCHAR,
+                    term_indices INTEGER[],
+                    term_weights FLOAT[]
+                );
+                """
+            )
+            conn.execute(
+                """
+                CREATE OR REPLACE TABLE runbook_index (
+                    source_hash VARCHAR,
+                    n_terms INTEGER,
+                    terms VARCHAR[],
+                    idf DOUBLE[]
+                );
+                """
+            )
+            conn.register("runbooks_df", rows)
+            conn.execute("INSERT INTO runbooks SELECT * FROM runbooks_df")
+            conn.unregister("runbooks_df")
             conn.execute(
-                "INSERT INTO runbooks VALUES (?, ?, ?, ?, ?)",
-                [rb.runbook_id, rb.title, rb.category, content, embedding.tolist()],
+                "INSERT INTO runbook_index VALUES (?, ?, ?, ?)",
+                [self.source_hash, len(terms), terms, self.idf.tolist()],
             )
+            conn.execute("COMMIT")
 
-    def query(self, text: str, top_k: int = 1) -> List[Tuple[Runbook, float]]:
+    def restore(
+        self, source_hash: str, db_path: str | None = None, read_only: bool = False
+    ) -> bool:
+        """Load a persisted index if it was built from ``source_hash``.
+
+        Returns ``False`` when nothing usable is stored, or when ``read_only`` is set
+        and the database cannot be opened, leaving the index untouched.
+        """
+        try:
+            conn = duckdb.connect(db_path or self.db_path, read_only=read_only)
+        except duckdb.Error:
+            if not read_only:
+                raise
+            return False
+        with conn:
+            try:
+                meta = conn.execute(
+                    "SELECT n_terms, terms, idf FROM runbook_index WHERE source_hash = ?",
+                    [source_hash],
+                ).fetchone()
+                if meta is None:
+                    return False
+                rows = conn.execute(
+                    "SELECT payload, term_indices, term_weights FROM runbooks ORDER BY rowid"
+                ).fetchall()
+            except duckdb.CatalogException:
+                return False
+        n_terms, terms, idf = meta
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(indices) for _, indices, _ in rows])
+        indices = np.fromiter(
+            (idx for _, row_indices, _ in rows for idx in row_indices),
+            dtype=np.int32,
+            count=int(indptr[-1]),
+        )
+        weights = np.fromiter(
+            (w for _, _, row_weights in rows for w in row_weights),
+            dtype=np.float32,
+            count=int(indptr[-1]),
+        )
+        self.vocabulary = {term: idx for idx, term in enumerate(terms)}
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.runbooks = [Runbook.model_validate_json(payload) for payload, _, _ in rows]
+        self.source_hash = source_hash
+        self._set_embeddings(
+            sparse.csr_matrix((weights, indices, indptr), shape=(len(rows), n_terms))
+        )
+        return True
+
+    def _set_embeddings(self, embeddings: sparse.csr_matrix) -> None:
+        self.embeddings = embeddings
+        self.norms = self._row_norms(embeddings)
+        self._inverted = None
+        self.cache.clear()
+
+    @property
+    def inverted(self) -> InvertedIndex:
+        """BM25 inverted index over the same runbooks, built on first use."""
+        return self.build_inverted()
+
+    def build_inverted(self) -> InvertedIndex:
+        """Build the BM25 postings now instead of on the first search."""
+        if self._inverted is None:
+            self._inverted = InvertedIndex.from_runbooks(self.runbooks)
+        return self._inverted
+
+    def search(
+        self,
+        text: str,
+        top_k: int = 1,
+        *,
+        category: str | None = None,
+        os_version: str | None = None,
+    ) -> List[Tuple[Runbook, float]]:
+        """BM25 retrieval restricted to ``category``/``os_version`` where they have matches.
+
+        Falls back to the unfiltered corpus when the filtered partition has no hits.
+        """
         if self.embeddings is None:
             raise ValueError("Index not built")
-        query_vec = self.vectorizer.transform([text]).toarray()[0]
-        scores = self._cosine_similarity(self.embeddings, query_vec)
-        ranked = np.argsort(scores)[::-1][:top_k]
-        return [(self.runbooks[idx], float(scores[idx])) for idx in ranked]
+        key = ("bm25", normalize(text), category, os_version, top_k)
+        cached = self.cache.get(key) if self.cache.enabled else None
+        if cached is not None:
+            return cached
+        hits = self.inverted.search(text, top_k, category=category, os_version=os_version)
+        if not hits and (category or os_version):
+            hits = self.inverted.search(text, top_k)
+        ranked = [(self.runbooks[doc_id], score) for doc_id, score in hits]
+        self.cache.put(key, ranked)
+        return ranked
+
+    def query(self, text: str, top_k: int = 1) -> List[Tuple[Runbook, float]]:
+        return self.query_batch([text], top_k=top_k)[0]
+
+    def query_batch(
+        self, texts: Sequence[str], top_k: int = 1
+    ) -> List[List[Tuple[Runbook, float]]]:
+        """Score every text against the corpus in one sparse product.
+
+        Returns one ranked ``(runbook, score)`` list per input text, in input order.
+        Texts already in the retrieval cache, and repeats within the batch, are not
+        rescored.
+        """
+        if self.embeddings is None or self.norms is None:
+            raise ValueError("Index not built")
+        if not texts:
+            return []
+        if not self.cache.enabled:
+            return self._score_batch(texts, top_k)
+        keys = [("tfidf", normalize(text), top_k) for text in texts]
+        unique: Dict[Tuple[str, str, int], str] = {}
+        for key, text in zip(keys, texts):
+            unique.setdefault(key, text)
+        # Repeats within the batch are answered without rescoring, so they count as hits.
+        self.cache.stats.hits += len(keys) - len(unique)
+        ranked = {key: self.cache.get(key) for key in unique}
+        missing = [key for key, cached in ranked.items() if cached is None]
+        if missing:
+            scored = self._score_batch([unique[key] for key in missing], top_k)
+            for key, fresh in zip(missing, scored):
+                self.cache.put(key, fresh)
+                ranked[key] = fresh
+        return [list(ranked[key]) for key in keys]  # type: ignore[arg-type]
+
+    def _score_batch(self, texts: Sequence[str], top_k: int) -> List[Ranked]:
+        assert self.embeddings is not None and self.norms is not None
+        queries = self.transform(texts)
+        scores = self._cosine_similarity(queries, self.embeddings, self.norms)
+        ranked = self._top_k(scores, top_k)
+        return [
+            [(self.runbooks[idx], float(row_scores[idx])) for idx in row_ranked]
+            for row_scores, row_ranked in zip(scores, ranked)
+        ]
+
+    @staticmethod
+    def _row_norms(matrix: sparse.csr_matrix) -> np.ndarray:
+        return np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+
+    @classmethod
+    def _cosine_similarity(
+        cls, queries: sparse.csr_matrix, matrix: sparse.csr_matrix, norms: np.ndarray
+    ) -> np.ndarray:
+        dots = (queries @ matrix.T).toarray()
+        denominator = np.outer(cls._row_norms(queries) + 1e-8, norms)
+        return dots / (denominator + 1e-8)
 
     @staticmethod
-    def _cosine_similarity(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
-        denominator = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(vector) + 1e-8)
-        return (matrix @ vector) / (denominator + 1e-8)
+    def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Select the ``top_k`` columns per row without sorting the full row."""
+        n_docs = scores.shape[1]
+        top_k = max(0, min(top_k, n_docs))
+        if top_k == 0:
+            return np.empty((scores.shape[0], 0), dtype=np.intp)
+        if top_k < n_docs:
+            candidates = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        else:
+            candidates = np.tile(np.arange(n_docs), (scores.shape[0], 1))
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        return np.take_along_axis(candidates, order, axis=1)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Hashable, List, Tuple
+
+from .inverted_index import tokenize
+
+if TYPE_CHECKING:
+    from .models import Runbook
+
+Ranked = List[Tuple["Runbook", float]]
+
+
+@dataclass
+class RetrievalStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def normalize(text: str) -> str:
+    """Canonical form of a query: its sorted lower-case tokens.
+
+    Both retrieval engines score a bag of these tokens, so texts with the same
+    normal form always rank identically.
+    """
+    return " ".join(sorted(tokenize(text)))
+
+
+class RetrievalCache:
+    """Bounded LRU of ranked runbook lists.
+
+    Keys carry the normalized text plus everything else that changes the ranking
+    (engine, category, OS version, ``top_k``). ``max_entries`` of 0 disables the
+    cache. Not thread-safe: use it from the thread that does retrieval.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self.stats = RetrievalStats()
+        self._entries: OrderedDict[Hashable, Ranked] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Hashable) -> Ranked | None:
+        ranked = self._entries.get(key)
+        if ranked is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return list(ranked)
+
+    def put(self, key: Hashable, ranked: Ranked) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = list(ranked)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry; called whenever the index is rebuilt or reloaded."""
+        if self._entries:
+            self.stats.invalidations += 1
+        self._entries.clear()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import heapq
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .models import ExecutionResult, Incident
+
+SEVERITY_ORDER = ("high", "medium", "low")
+DEFAULT_DEADLINES = {"high": 30.0, "medium": 120.0, "low": 600.0}
+OVERLOAD_MODES = ("defer", "shed")
+
+
+@dataclass(frozen=True)
+class SchedulerPolicy:
+    # Seconds an incident may wait between admission and the start of its execution.
+    deadlines: Mapping[str, float] = field(default_factory=lambda: dict(DEFAULT_DEADLINES))
+    # Incidents one wave may start; the rest wait for later waves or are shed. 0 is unlimited.
+    max_pending: int = 0
+    overload: str = "defer"
+    sheddable: Tuple[str, ...] = ("low",)
+
+
+@dataclass
+class SeverityStats:
+    scheduled: int = 0
+    started: int = 0
+    deadline_misses: int = 0
+    deferred: int = 0
+    shed: int = 0
+    # Recent queue waits in seconds; bounded so long-running daemons stay flat.
+    waits: Deque[float] = field(default_factory=lambda: deque(maxlen=100_000))
+
+    def percentiles(self) -> Tuple[float, float, float]:
+        if not self.waits:
+            return 0.0, 0.0, 0.0
+        p50, p95, p99 = np.percentile(np.fromiter(self.waits, dtype=np.float64), [50, 95, 99])
+        return float(p50), float(p95), float(p99)
+
+
+@dataclass
+class SchedulePlan:
+    """Indices into the planned incidents: execution waves in order, and the shed ones."""
+
+    waves: List[List[int]]
+    shed: List[int]
+
+
+class PriorityScheduler:
+    """Orders incidents by severity, then by age, through a priority queue.
+
+    Each round admits a batch of incidents and pops them highest severity first,
+    earliest admitted first within a severity. A round holding more than
+    ``max_pending`` incidents is split, in that order, into waves of at most
+    ``max_pending``; each wave starts only after the previous one has been
+    validated and ticketed. With ``overload="shed"``, sheddable incidents that miss
+    the first wave are shed without execution instead. Queue wait is measured from
+    admission to the start of execution and checked against the per-severity
+    deadline.
+    """
+
+    def __init__(self, policy: SchedulerPolicy = SchedulerPolicy()) -> None:
+        if policy.overload not in OVERLOAD_MODES:
+            raise ValueError(f"overload must be one of {OVERLOAD_MODES}, not {policy.overload!r}")
+        self.policy = policy
+        self.stats: Dict[str, SeverityStats] = {}
+        self._admitted: Dict[str, Tuple[float, str]] = {}
+
+    @staticmethod
+    def rank(severity: str) -> int:
+        return SEVERITY_ORDER.index(severity) if severity in SEVERITY_ORDER else len(SEVERITY_ORDER)
+
+    def deadline(self, severity: str) -> float:
+        deadlines = self.policy.deadlines
+        return deadlines.get(severity, max(deadlines.values(), default=float("inf")))
+
+    def plan(
+        self,
+        incidents: Sequence[Incident],
+        now: float | None = None,
+        arrivals: Sequence[float] | None = None,
+    ) -> SchedulePlan:
+        """Admit ``incidents`` and return the order to execute them in.
+
+        ``arrivals`` are monotonic admission times per incident and default to
+        ``now``. Incidents admitted at the same time keep their input order.
+        """
+        now = time.monotonic() if now is None else now
+        heap = []
+        for index, incident in enumerate(incidents):
+            arrived = arrivals[index] if arrivals is not None else now
+            heapq.heappush(heap, (self.rank(incident.severity), arrived, index))
+            self._admitted[incident.incident_id] = (arrived, incident.severity)
+            self._severity(incident.severity).scheduled += 1
+        order = [heapq.heappop(heap)[2] for _ in range(len(heap))]
+        capacity = self.policy.max_pending
+        if capacity <= 0 or len(order) <= capacity:
+            return SchedulePlan(waves=[order] if order else [], shed=[])
+
+        first, overflow = order[:capacity], order[capacity:]
+        shed = []
+        if self.policy.overload == "shed":
+            shed = [i for i in overflow if incidents[i].severity in self.policy.sheddable]
+            overflow = [i for i in overflow if incidents[i].severity not in self.policy.sheddable]
+        for index in shed:
+            self._severity(incidents[index].severity).shed += 1
+            self._admitted.pop(incidents[index].incident_id, None)
+        for index in overflow:
+            self._severity(incidents[index].severity).deferred += 1
+        later = [overflow[i : i + capacity] for i in range(0, len(overflow), capacity)]
+        return SchedulePlan(waves=[first, *later], shed=shed)
+
+    def started(self, incident: Incident, now: float | None = None) -> float | None:
+        """Record that ``incident`` left the queue; returns its wait in seconds."""
+        admitted = self._admitted.pop(incident.incident_id, None)
+        if admitted is None:
+            return None
+        arrived, severity = admitted
+        wait = (time.monotonic() if now is None else now) - arrived
+        stats = self._severity(severity)
+        stats.started += 1
+        stats.waits.append(wait)
+        if wait > self.deadline(severity):
+            stats.deadline_misses += 1
+        return wait
+
+    @staticmethod
+    def shed_result(incident: Incident) -> ExecutionResult:
+        return ExecutionResult(
+            incident_id=incident.incident_id,
+            runbook_id="",
+            actions=[],
+            validation_passed=False,
+            validation_reason=f"Shed under overload ({incident.severity} severity)",
+            escalated=True,
+            notes="Not remediated: the scheduler shed this incident under overload.",
+        )
+
+    def report(self) -> List[Tuple[str, SeverityStats]]:
+        """Per-severity stats, highest severity first."""
+        return sorted(self.stats.items(), key=lambda item: self.rank(item[0]))
+
+    def _severity(self, severity: str) -> SeverityStats:
+        stats = self.stats.get(severity)
+        if stats is None:
+            stats = self.stats[severity] = SeverityStats()
+        return stats
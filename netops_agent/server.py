@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import signal
+import socketserver
+import stat
+import time
+from dataclasses import asdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from pydantic import ValidationError
+
+from .models import Incident
+from .workflows import NetOpsWorkflow
+
+# Request bodies above this size are rejected before they are read.
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+class AgentService:
+    """A warm workflow answering incident requests.
+
+    The runbook index, compiled plans, validation checks and the DuckDB
+    connection are set up once and reused, so a request only pays for its own
+    processing. Requests are handled one at a time, the same way the workflow
+    itself runs.
+    """
+
+    def __init__(self, workflow: NetOpsWorkflow) -> None:
+        self.workflow = workflow
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.incidents = 0
+        self.reloads = 0
+        self.reload_errors = 0
+
+    def start(self) -> None:
+        self.workflow.db.init_schema()
+        self.workflow.build_index()
+
+    def resolve(self, payload: Any) -> List[Dict[str, Any]]:
+        """Process one incident object or a list of them; raises ``ValidationError``."""
+        items = payload if isinstance(payload, list) else [payload]
+        incidents = [Incident.model_validate(item) for item in items]
+        self.workflow.record_incidents(incidents)
+        results = self.workflow.process(incidents)
+        self.requests += 1
+        self.incidents += len(incidents)
+        return [result.model_dump() for result in results]
+
+    def reload(self) -> Dict[str, Any]:
+        """Re-read the runbooks; plans and checks are recompiled on next use.
+
+        Raises ``ValueError`` when the runbooks do not load, in which case the
+        previous index keeps serving.
+        """
+        try:
+            self.workflow.build_index()
+        except Exception:
+            self.reload_errors += 1
+            self.workflow.logger.exception("[SERVE] reload failed; keeping the current runbooks")
+            raise
+        self.reloads += 1
+        index = self.workflow.index
+        self.workflow.logger.info(
+            "[SERVE] reloaded %d runbooks (source %s)",
+            len(index.runbooks),
+            (index.source_hash or "")[:12],
+        )
+        return {"runbooks": len(index.runbooks), "source": index.source_hash}
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "uptime_s": round(time.monotonic() - self.started_at, 3),
+            "runbooks": len(self.workflow.index.runbooks),
+            "requests": self.requests,
+            "incidents": self.incidents,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+            "retrieval_cache": {
+                **asdict(self.workflow.index.cache.stats),
+                "size": len(self.workflow.index.cache),
+            },
+            "scheduler": self.scheduler_stats(),
+        }
+
+    def scheduler_stats(self) -> Dict[str, Dict[str, Any]]:
+        scheduler = self.workflow.scheduler
+        report = {}
+        for severity, stats in scheduler.report():
+            p50, p95, p99 = stats.percentiles()
+            report[severity] = {
+                "scheduled": stats.scheduled,
+                "started": stats.started,
+                "wait_p50_ms": round(p50 * 1000, 3),
+                "wait_p95_ms": round(p95 * 1000, 3),
+                "wait_p99_ms": round(p99 * 1000, 3),
+                "deadline_s": scheduler.deadline(severity),
+                "deadline_misses": stats.deadline_misses,
+                "deferred": stats.deferred,
+                "shed": stats.shed,
+            }
+        return report
+
+    def events(self, limit: int = 100, incident_id: str | None = None) -> List[Dict[str, Any]]:
+        return self.workflow.log_pipeline.ring.recent(limit, incident_id=incident_id)
+
+    def close(self) -> None:
+        self.workflow.tickets.flush()
+        self.workflow.log_correlation_stats()
+        self.workflow.log_scheduler_stats()
+        self.workflow.log_cache_stats()
+        self.workflow.finish_metrics()
+        self.workflow.db.conn.close()
+        self.workflow.log_pipeline.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """``POST /incidents``, ``POST /reload``, ``GET /health`` and ``GET /events``."""
+
+    server: _TCPServer | _UnixServer
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        service = self.server.service
+        if url.path == "/health":
+            self._reply(HTTPStatus.OK, service.health())
+        elif url.path == "/events":
+            query = parse_qs(url.query)
+            raw = query.get("limit", ["100"])[0]
+            try:
+                limit = int(raw)
+            except ValueError:
+                limit = -1
+            if limit < 0:
+                self._reply(
+                    HTTPStatus.BAD_REQUEST, {"error": f"limit must be an integer >= 0: {raw!r}"}
+                )
+                return
+            incident_id = query.get("incident_id", [None])[0]
+            self._reply(HTTPStatus.OK, service.events(limit, incident_id))
+        else:
+            self._reply(HTTPStatus.NOT_FOUND, {"error": f"no route {url.path}"})
+
+    def do_POST(self) -> None:
+        path = urlsplit(self.path).path
+        service = self.server.service
+        if path == "/reload":
+            try:
+                self._reply(HTTPStatus.OK, service.reload())
+            except ValueError as exc:
+                self._reply(HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(exc)})
+            except Exception as exc:
+                self._reply(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)})
+            return
+        if path != "/incidents":
+            self._reply(HTTPStatus.NOT_FOUND, {"error": f"no route {path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._reply(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "body too large"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"null")
+            results = service.resolve(payload)
+        except json.JSONDecodeError as exc:
+            self._reply(HTTPStatus.BAD_REQUEST, {"error": f"invalid JSON: {exc}"})
+            return
+        except ValidationError as exc:
+            self._reply(HTTPStatus.UNPROCESSABLE_ENTITY, {"error": exc.errors(include_url=False)})
+            return
+        except Exception as exc:
+            service.workflow.logger.exception("[SERVE] request failed")
+            self._reply(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)})
+            return
+        self._reply(HTTPStatus.OK, results if isinstance(payload, list) else results[0])
+
+    def _reply(self, status: HTTPStatus, body: Any) -> None:
+        data = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        self.server.service.workflow.logger.debug("[HTTP] " + format, *args)
+
+
+class _TCPServer(HTTPServer):
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int], service: AgentService) -> None:
+        self.service = service
+        super().__init__(address, _Handler)
+
+
+class _UnixServer(socketserver.UnixStreamServer):
+    def __init__(self, path: str, service: AgentService) -> None:
+        self.service = service
+        super().__init__(path, _Handler)
+
+    def get_request(self) -> Tuple[Any, Any]:
+        # BaseHTTPRequestHandler expects a (host, port) client address.
+        request, _ = super().get_request()
+        return request, ("unix", 0)
+
+
+def _remove_stale_socket(path: Path) -> None:
+    try:
+        mode = path.lstat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket; refusing to replace it")
+    path.unlink()
+
+
+class AgentServer:
+    """Serve an :class:`AgentService` over local HTTP on TCP or a Unix socket.
+
+    ``SIGHUP`` reloads the runbooks and ``SIGTERM``/``SIGINT`` stop the server
+    once the current request is done. Both only set a flag that the serve loop
+    checks between requests, so a request is never interrupted halfway. A reload
+    that fails is logged and the previous runbooks keep serving.
+
+    ``socket_path`` may name a stale socket from an earlier run, which is replaced;
+    any other existing file there is left alone and ``FileExistsError`` is raised.
+    """
+
+    def __init__(
+        self,
+        service: AgentService,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        socket_path: str | None = None,
+    ) -> None:
+        self.service = service
+        self.socket_path = socket_path
+        if socket_path:
+            _remove_stale_socket(Path(socket_path))
+            self.server: socketserver.BaseServer = _UnixServer(socket_path, service)
+        else:
+            self.server = _TCPServer((host, port), service)
+        self.server.timeout = 0.5
+        self._reload = False
+        self._stop = False
+
+    @property
+    def address(self) -> str:
+        if self.socket_path:
+            return f"unix:{self.socket_path}"
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def request_reload(self, *_: object) -> None:
+        self._reload = True
+
+    def request_stop(self, *_: object) -> None:
+        self._stop = True
+
+    def serve_forever(self) -> None:
+        signal.signal(signal.SIGHUP, self.request_reload)
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+        logger = self.service.workflow.logger
+        logger.info("[SERVE] listening on %s", self.address)
+        try:
+            while not self._stop:
+                self.server.handle_request()
+                self.service.workflow.tickets.flush_if_due()
+                if self._reload:
+                    self._reload = False
+                    with contextlib.suppress(Exception):
+                        self.service.reload()
+        finally:
+            self.server.server_close()
+            if self.socket_path:
+                Path(self.socket_path).unlink(missing_ok=True)
+            logger.info("[SERVE] stopped after %d requests", self.service.requests)
+            self.service.close()
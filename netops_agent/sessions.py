@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict
+
+from .tools import ToolResult
+
+
+@dataclass
+class PoolStats:
+    connects: int = 0
+    reuses: int = 0
+    commands: int = 0
+    keepalives: int = 0
+    evictions: int = 0
+
+
+class DeviceSession:
+    def __init__(
+        self, device_id: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.device_id = device_id
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    @classmethod
+    async def open(cls, host: str, port: int, device_id: str) -> "DeviceSession":
+        reader, writer = await asyncio.open_connection(host, port)
+        session = cls(device_id, reader, writer)
+        reply = await session.send(f"login {device_id}")
+        if not reply.startswith("OK"):
+            await session.close()
+            raise ConnectionError(f"{device_id}: {reply}")
+        return session
+
+    async def send(self, line: str) -> str:
+        self.writer.write(line.encode() + b"\n")
+        await self.writer.drain()
+        reply = await self.reader.readline()
+        if not reply:
+            raise ConnectionError(f"{self.device_id}: connection closed")
+        return reply.decode().rstrip("\n")
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class DeviceSessionPool:
+    """Reuses per-device CLI sessions to a device endpoint.
+
+    At most ``max_per_device`` sessions are open per device, counting sessions the
+    keepalive is pinging. Idle sessions are pinged every ``keepalive_interval``
+    seconds and closed once idle for longer than ``idle_timeout``, or when a ping
+    gets no reply within ``keepalive_timeout``. With ``pooled=False`` every command
+    opens and closes its own session, which is useful as a baseline.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        max_per_device: int = 1,
+        idle_timeout: float = 60.0,
+        keepalive_interval: float = 15.0,
+        keepalive_timeout: float = 5.0,
+        pooled: bool = True,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.max_per_device = max_per_device
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_timeout = keepalive_timeout
+        self.pooled = pooled
+        self.stats = PoolStats()
+        self._idle: Dict[str, Deque[DeviceSession]] = defaultdict(deque)
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._keepalive_task: asyncio.Task[None] | None = None
+
+    async def execute(self, device_id: str, command: str) -> ToolResult:
+        async with self._limit(device_id):
+            session = await self._acquire(device_id)
+            try:
+                output = await session.send(command)
+            except BaseException:
+                await session.close()
+                raise
+            self.stats.commands += 1
+            session.last_used = time.monotonic()
+            await self._release(session)
+        return ToolResult(command=command, output=output)
+
+    async def close(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            # Wait for it, so a session it was pinging is closed before we return.
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._keepalive_task
+            self._keepalive_task = None
+        for sessions in self._idle.values():
+            while sessions:
+                await sessions.popleft().close()
+
+    def _limit(self, device_id: str) -> asyncio.Semaphore:
+        limit = self._limits.get(device_id)
+        if limit is None:
+            limit = self._limits[device_id] = asyncio.Semaphore(self.max_per_device)
+        return limit
+
+    async def _acquire(self, device_id: str) -> DeviceSession:
+        idle = self._idle[device_id]
+        while idle:
+            session = idle.pop()
+            if time.monotonic() - session.last_used <= self.idle_timeout:
+                self.stats.reuses += 1
+                return session
+            self.stats.evictions += 1
+            await session.close()
+        if self.pooled and self._keepalive_task is None:
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+        self.stats.connects += 1
+        return await DeviceSession.open(self.host, self.port, device_id)
+
+    async def _release(self, session: DeviceSession) -> None:
+        if self.pooled:
+            self._idle[session.device_id].append(session)
+        else:
+            await session.close()
+
+    async def _keepalive(self) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            now = time.monotonic()
+            for sessions in list(self._idle.values()):
+                for session in list(sessions):
+                    limit = self._limit(session.device_id)
+                    # Handed out by execute while an earlier ping was awaited, or every
+                    # slot is busy; either way there is nothing to ping this round.
+                    if session not in sessions or limit.locked():
+                        continue
+                    # A session being pinged holds a slot like one running a command,
+                    # so execute cannot open an extra session meanwhile.
+                    async with limit:
+                        sessions.remove(session)
+                        if now - session.last_used > self.idle_timeout:
+                            self.stats.evictions += 1
+                            await session.close()
+                            continue
+                        pinged = False
+                        try:
+                            await asyncio.wait_for(
+                                session.send("keepalive"), self.keepalive_timeout
+                            )
+                            pinged = True
+                        except (ConnectionError, asyncio.TimeoutError):
+                            self.stats.evictions += 1
+                        finally:
+                            # Also reached when the pool closes mid-ping: the session is
+                            # in no deque and its reply is unread, so it must be closed.
+                            if not pinged:
+                                session.writer.close()
+                        if not pinged:
+                            continue
+                        self.stats.keepalives += 1
+                        sessions.append(session)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import multiprocessing
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .correlation import CorrelationStats
+from .models import ExecutionResult, Incident
+from .rag import RunbookIndex
+from .synthetic_data import incidents_from_table
+
+if TYPE_CHECKING:
+    from .workflows import NetOpsWorkflow, RunContext
+
+RUNBOOK_PATH = Path("data/runbooks.yaml")
+
+# The warm index of this worker process, fitted once by the pool initializer.
+_index: RunbookIndex | None = None
+
+
+@dataclass
+class ShardTask:
+    shard: int
+    context: RunContext
+    run_id: str
+    devices: pa.Table
+    interfaces: pa.Table
+    incidents: pa.Table
+
+
+@dataclass
+class ShardResult:
+    shard: int
+    results: List[ExecutionResult]
+    correlation: CorrelationStats
+
+
+def shard_of(device_ids: pa.Array, shards: int) -> np.ndarray:
+    """Shard number of every device id.
+
+    CRC32 rather than ``hash()``, which is salted per process.
+    """
+    crcs = np.fromiter(
+        (zlib.crc32(device_id.encode()) for device_id in device_ids.to_pylist()),
+        dtype=np.int64,
+        count=len(device_ids),
+    )
+    return crcs % shards
+
+
+def shard_paths(context: RunContext, shard: int) -> tuple[Path, Path]:
+    """Database and log file of ``shard``, next to the main database."""
+    directory = Path(context.db_path).parent / "shards"
+    return directory / f"shard-{shard}.duckdb", directory / f"shard-{shard}.log"
+
+
+def run_sharded(workflow: NetOpsWorkflow, incidents: List[Incident]) -> List[ExecutionResult]:
+    """Process ``incidents`` on ``context.workers`` processes, sharded by device.
+
+    Every incident of a device lands on the same shard, so correlation groups,
+    interface resets and validation see exactly the state a single process would.
+    The warm index is snapshotted next to the shard databases and each worker
+    restores it once, read-only. Each worker then runs :meth:`NetOpsWorkflow.process`
+    against a shard database holding only its devices, and the shards are then
+    merged into the main database. Results keep the input order.
+    """
+    context = workflow.context
+    inventory = workflow.inventory
+    assert inventory is not None, "prepare_data must run before sharding"
+    if not incidents:
+        return []
+    shards = context.workers
+    device_shard = shard_of(inventory.device_ids, shards)
+    interface_shard = device_shard[inventory.interface_device]
+    incident_rows = pa.Table.from_pylist([incident.model_dump() for incident in incidents])
+    owners = pc.index_in(incident_rows.column("device_id"), value_set=inventory.device_ids)
+    # Incidents of unknown devices all go to shard 0, where they fail validation as usual.
+    incident_shard = np.where(
+        owners.is_null().to_numpy(zero_copy_only=False),
+        0,
+        device_shard[owners.fill_null(0).to_numpy()],
+    )
+    devices, interfaces = inventory.devices_table(), inventory.interfaces_table()
+    # Workers cannot open the main database while this process holds its write lock.
+    index_path = shard_index_path(context)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    workflow.index.persist(str(index_path))
+
+    tasks, positions = [], []
+    for shard in range(shards):
+        rows = np.flatnonzero(incident_shard == shard)
+        if rows.size == 0:
+            continue
+        db_path, log_path = shard_paths(context, shard)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        for stale in (
+            db_path,
+            db_path.with_name(db_path.name + ".wal"),
+            log_path,
+            *log_path.parent.glob(log_path.name + ".[0-9]*"),
+        ):
+            stale.unlink(missing_ok=True)
+        tasks.append(
+            ShardTask(
+                shard=shard,
+                context=replace(
+                    context,
+                    db_path=str(db_path),
+                    log_path=str(log_path),
+                    workers=1,
+                    prometheus_path=None,
+                ),
+                run_id=workflow.metrics.run_id,
+                devices=devices.filter(pa.array(device_shard == shard)),
+                interfaces=interfaces.filter(pa.array(interface_shard == shard)),
+                incidents=incident_rows.take(pa.array(rows)),
+            )
+        )
+        positions.append(rows)
+
+    workflow.logger.info("[SHARDS] %d incidents across %d workers", len(incidents), len(tasks))
+    with ProcessPoolExecutor(
+        max_workers=len(tasks) or 1,
+        # Spawned, not forked: a forked child would inherit DuckDB's threads and locks.
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(
+            str(index_path),
+            workflow.index.source_hash,
+            str(RUNBOOK_PATH),
+            context.retrieval_cache_size,
+        ),
+    ) as pool:
+        outcomes = list(pool.map(_run_shard, tasks))
+
+    results: List[ExecutionResult] = [None] * len(incidents)  # type: ignore[list-item]
+    for task, rows, outcome in zip(tasks, positions, outcomes):
+        for row, result in zip(rows, outcome.results):
+            results[row] = result
+        merged = workflow.db.merge_shard(task.context.db_path)
+        workflow.correlator.stats.groups += outcome.correlation.groups
+        workflow.correlator.stats.suppressed += outcome.correlation.suppressed
+        _append_log(workflow, Path(task.context.log_path))
+        workflow.logger.info(
+            "[SHARD] %d devices=%d incidents=%d tickets=%d",
+            outcome.shard,
+            task.devices.num_rows,
+            task.incidents.num_rows,
+            merged,
+        )
+    return results
+
+
+def shard_index_path(context: RunContext) -> Path:
+    """Read-only snapshot of the runbook index that workers start from."""
+    return Path(context.db_path).parent / "shards" / "runbook-index.duckdb"
+
+
+def _init_worker(index_path: str, source_hash: str, runbook_path: str, cache_size: int) -> None:
+    global _index
+    index = RunbookIndex(index_path, cache_size=cache_size)
+    if not index.restore(source_hash, read_only=True):
+        index.load_runbooks(Path(runbook_path))
+        index.build()
+    _index = index
+
+
+def _run_shard(task: ShardTask) -> ShardResult:
+    from .workflows import NetOpsWorkflow
+
+    assert _index is not None, "worker was not initialized"
+    workflow = NetOpsWorkflow(task.context)
+    workflow.index = _index
+    workflow.metrics.run_id = task.run_id
+    try:
+        workflow.db.init_schema()
+        workflow.db.load_arrow("devices", task.devices)
+        workflow.db.load_arrow("interfaces", task.interfaces)
+        workflow.db.load_arrow("incidents", task.incidents)
+        results = workflow.process(incidents_from_table(task.incidents))
+        workflow.log_scheduler_stats()
+        workflow.log_cache_stats()
+        workflow.finish_metrics()
+    finally:
+        workflow.db.conn.close()
+        workflow.log_pipeline.stop()
+    return ShardResult(task.shard, results, workflow.correlator.stats)
+
+
+def _append_log(workflow: NetOpsWorkflow, path: Path) -> None:
+    # A worker's own rotated backups (.3, .2, .1) hold its oldest lines.
+    backups = sorted(
+        path.parent.glob(path.name + ".[0-9]*"), key=lambda backup: -int(backup.suffix[1:])
+    )
+    for part in [*backups, path]:
+        if part.exists():
+            workflow.log_pipeline.append(part)
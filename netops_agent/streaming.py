@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List
+
+from pydantic import ValidationError
+
+from .models import Incident
+from .workflows import NetOpsWorkflow
+
+_DONE = object()
+
+
+@dataclass
+class StreamStats:
+    received: int = 0
+    rejected: int = 0
+    processed: int = 0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def rate(self) -> float:
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def parse_ndjson(
+    lines: Iterable[str], *, on_error: Callable[[int, str], None] | None = None
+) -> Iterator[Incident]:
+    """Yield incidents from NDJSON lines, skipping blank and invalid records."""
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield Incident.model_validate_json(line)
+        except ValidationError as exc:
+            if on_error:
+                on_error(line_no, str(exc.errors()[0]["msg"]))
+
+
+class StreamPipeline:
+    """Parse → retrieve → plan/execute → validate/ticket, one thread per stage.
+
+    Stages are joined by bounded queues, so a slow stage blocks its producers and
+    the number of in-flight incidents never exceeds the sum of the queue sizes.
+    Validation and tickets run in batches on the calling thread, which owns the
+    DuckDB connection.
+    """
+
+    def __init__(
+        self,
+        workflow: NetOpsWorkflow,
+        *,
+        queue_size: int = 256,
+        batch_size: int = 64,
+        report_interval: float = 5.0,
+    ) -> None:
+        self.workflow = workflow
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.report_interval = report_interval
+        self.stats = StreamStats()
+        self._errors: List[BaseException] = []
+
+    def run(self, lines: Iterable[str]) -> StreamStats:
+        parsed: queue.Queue[Any] = queue.Queue(maxsize=self.queue_size)
+        matched: queue.Queue[Any] = queue.Queue(maxsize=self.queue_size)
+        resolved: queue.Queue[Any] = queue.Queue(maxsize=self.queue_size)
+        stages = [
+            threading.Thread(target=self._parse_stage, args=(lines, parsed), daemon=True),
+            threading.Thread(target=self._retrieve_stage, args=(parsed, matched), daemon=True),
+            threading.Thread(target=self._execute_stage, args=(matched, resolved), daemon=True),
+        ]
+        self.stats = StreamStats(started_at=time.perf_counter())
+        for stage in stages:
+            stage.start()
+        next_report = self.stats.started_at + self.report_interval
+        item: Any = None
+        with self.workflow.tickets:
+            while item is not _DONE:
+                batch = []
+                try:
+                    item = resolved.get(timeout=0.5)
+                    while item is not _DONE:
+                        batch.append(item)
+                        if len(batch) >= self.batch_size:
+                            break
+                        item = resolved.get_nowait()
+                except queue.Empty:
+                    pass
+                if batch:
+                    self._finish_batch(batch)
+                self.workflow.tickets.flush_if_due()
+                now = time.perf_counter()
+                if now >= next_report:
+                    self._report(parsed, matched, resolved)
+                    next_report = now + self.report_interval
+        for stage in stages:
+            stage.join()
+        self.stats.finished_at = time.perf_counter()
+        if self._errors:
+            raise self._errors[0]
+        return self.stats
+
+    def _finish_batch(self, batch: List[Any]) -> None:
+        self.workflow.record_incidents([incident for incident, *_ in batch])
+        # Stages are FIFO, so a group's primary is resolved no later than its members.
+        primaries = [item for item in batch if item[3] is not None]
+        if primaries:
+            incidents, groups, runbooks, resolved = (list(column) for column in zip(*primaries))
+            with self.workflow.metrics.span("validation_batch"):
+                self.workflow.validate_results(incidents, runbooks, resolved)
+            for group, result in zip(groups, resolved):
+                group.result = result
+        results = [group.fan_out(incident) for incident, group, _, _ in batch]
+        for result in results:
+            with self.workflow.metrics.span("ticket", result.incident_id):
+                self.workflow.tickets.add(result)
+        self.stats.processed += len(results)
+
+    def _report(self, *queues: queue.Queue) -> None:
+        depths = "/".join(str(q.qsize()) for q in queues)
+        self.workflow.console.print(
+            f"[STREAM] received={self.stats.received} processed={self.stats.processed} "
+            f"rejected={self.stats.rejected} rate={self.stats.rate:.1f}/s queues={depths}",
+            markup=False,
+        )
+
+    def _reject(self, line_no: int, reason: str) -> None:
+        self.stats.rejected += 1
+        self.workflow.logger.warning("[STREAM] rejected line %d: %s", line_no, reason)
+
+    def _parse_stage(self, lines: Iterable[str], outbox: queue.Queue) -> None:
+        try:
+            for incident in parse_ndjson(lines, on_error=self._reject):
+                self.stats.received += 1
+                outbox.put(incident)
+        except BaseException as exc:  # noqa: BLE001 - surfaced from run()
+            self._errors.append(exc)
+        finally:
+            outbox.put(_DONE)
+
+    def _retrieve_stage(self, inbox: queue.Queue, outbox: queue.Queue) -> None:
+        done = False
+        try:
+            while not done:
+                batch: List[Incident] = []
+                item = inbox.get()
+                while item is not _DONE:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = inbox.get_nowait()
+                    except queue.Empty:
+                        break
+                done = item is _DONE
+                if not batch:
+                    continue
+                groups = self.workflow.correlate(batch)
+                primaries = [
+                    incident for incident, group in zip(batch, groups) if group.primary is incident
+                ]
+                matches = iter(self.workflow.retrieve(primaries) if primaries else [])
+                for incident, group in zip(batch, groups):
+                    match = next(matches) if group.primary is incident else None
+                    outbox.put((incident, group, match))
+        except BaseException as exc:  # noqa: BLE001 - surfaced from run()
+            self._errors.append(exc)
+            self._drain(inbox)
+        finally:
+            outbox.put(_DONE)
+
+    def _execute_stage(self, inbox: queue.Queue, outbox: queue.Queue) -> None:
+        try:
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    break
+                incident, group, match = item
+                if match is None:
+                    outbox.put((incident, group, None, None))
+                    continue
+                result = self.workflow.resolve_incident(incident, match)
+                outbox.put((incident, group, match[0], result))
+        except BaseException as exc:  # noqa: BLE001 - surfaced from run()
+            self._errors.append(exc)
+            self._drain(inbox)
+        finally:
+            outbox.put(_DONE)
+
+    @staticmethod
+    def _drain(inbox: queue.Queue) -> None:
+        """Unblock upstream producers after a failure by discarding their output."""
+        while inbox.get() is not _DONE:
+            pass
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import random
-from typing import List
+from datetime import datetime
+from typing import List, Sequence
+
+import numpy as np
+import pyarrow as pa
 
 from .models import Device, Incident, Interface
 
@@ -72,3 +76,145 @@ def make_incidents(seed: int, interfaces: List[Interface]) -> List[Incident]:
             )
         )
     return incidents
+
+
+def _padded_ids(prefix: str, count: int, width: int) -> np.ndarray:
+    numbers = np.char.zfill(np.arange(1, count + 1).astype(str), width)
+    return np.char.add(prefix, numbers)
+
+
+def _dictionary(indices: np.ndarray, values: Sequence[str] | np.ndarray) -> pa.DictionaryArray:
+    return pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()), pa.array(values))
+
+
+def make_device_table(seed: int, count: int) -> pa.Table:
+    """Vectorized equivalent of :func:`make_devices` returning an Arrow table."""
+    rng = np.random.default_rng(seed)
+    width = max(3, len(str(count)))
+    numbers = np.char.zfill(np.arange(1, count + 1).astype(str), max(2, len(str(count))))
+    host_sites = np.asarray(SITES)[rng.integers(0, len(SITES), count)]
+    hostnames = np.char.add(np.char.add(np.char.add("core-", host_sites), "-"), numbers)
+    return pa.table(
+        {
+            "device_id": pa.array(_padded_ids("dev-", count, width)),
+            "hostname": pa.array(hostnames),
+            "site": _dictionary(rng.integers(0, len(SITES), count), SITES),
+            "os_version": _dictionary(rng.integers(0, len(OS_VERSIONS), count), OS_VERSIONS),
+        }
+    )
+
+
+def make_interface_table(seed: int, devices: pa.Table, per_device: int = 3) -> pa.Table:
+    """Vectorized equivalent of :func:`make_interfaces` returning an Arrow table."""
+    rng = np.random.default_rng(seed)
+    count = devices.num_rows * per_device
+    names = [f"GigabitEthernet0/{index}" for index in range(1, per_device + 1)]
+    # Two "up" entries keep the same 2:1 up/down ratio as make_interfaces.
+    statuses = np.array([0, 0, 1], dtype=np.int32)[rng.integers(0, 3, count)]
+    return pa.table(
+        {
+            "device_id": _dictionary(
+                np.repeat(np.arange(devices.num_rows), per_device),
+                devices.column("device_id").combine_chunks(),
+            ),
+            "name": _dictionary(np.tile(np.arange(per_device), devices.num_rows), names),
+            "status": _dictionary(statuses, ["up", "down"]),
+            "packet_loss": np.round(rng.uniform(0, 15, count), 2),
+            "error_rate": np.round(rng.uniform(0, 2, count), 2),
+        }
+    )
+
+
+def make_incident_table(seed: int, interfaces: pa.Table, count: int = 3) -> pa.Table:
+    """Vectorized equivalent of :func:`make_incidents` returning an Arrow table.
+
+    Every incident is raised on a different interface, so ``count`` may not exceed
+    the number of interfaces.
+    """
+    if count > interfaces.num_rows:
+        raise ValueError(
+            f"cannot raise {count} incidents on {interfaces.num_rows} interfaces; "
+            "each incident needs its own interface"
+        )
+    rng = np.random.default_rng(seed)
+    picked = interfaces.take(pa.array(rng.choice(interfaces.num_rows, size=count, replace=False)))
+    down = picked.column("status").to_numpy(zero_copy_only=False).astype(str) == "down"
+    lossy = picked.column("packet_loss").to_numpy() > 8
+    kind = np.select([down, lossy], [0, 1], default=2)
+    should_fail = np.arange(count) == 0
+    return pa.table(
+        {
+            "incident_id": pa.array(_padded_ids("inc-", count, max(4, len(str(count))))),
+            "device_id": picked.column("device_id").cast(pa.string()),
+            "interface": picked.column("name").cast(pa.string()),
+            "summary": _dictionary(
+                kind,
+                ["Interface down detected", "High packet loss observed", "CPU utilization high"],
+            ),
+            "category": _dictionary(kind, ["interfaces", "connectivity", "system"]),
+            "severity": _dictionary(rng.integers(0, len(SEVERITIES), count), SEVERITIES),
+            "gateway": pa.array(np.full(count, "10.0.0.1")),
+            "should_fail": pa.array(should_fail),
+            "failure_reason": _dictionary(
+                (~should_fail).astype(np.int32),
+                ["Device not responding to automated remediation", ""],
+            ),
+        }
+    )
+
+
+def make_telemetry_table(
+    seed: int,
+    interfaces: pa.Table,
+    end: datetime,
+    minutes: int = 30,
+    interval: int = 60,
+    flap_ratio: float = 0.02,
+    fault_ratio: float = 0.03,
+    drift_ratio: float = 0.01,
+) -> pa.Table:
+    """Emit one sample per interface every ``interval`` seconds up to ``end``.
+
+    A ``fault_ratio`` share of interfaces report their snapshot state, including
+    any down status or high loss; the rest are up, with counters wandering around
+    a fifth of their snapshot values. On top of that, a ``drift_ratio`` share
+    drift upwards and a ``flap_ratio`` share toggle between up and down, so only
+    a few percent of the fleet looks anomalous.
+    """
+    rng = np.random.default_rng(seed)
+    count = interfaces.num_rows
+    steps = max(1, minutes * 60 // interval)
+    offsets = np.arange(steps - 1, -1, -1, dtype=np.int64) * interval * 1_000_000
+    times = np.datetime64(end, "us") - offsets.astype("timedelta64[us]")
+    faulty = rng.random(count) < fault_ratio
+    base_loss = interfaces.column("packet_loss").to_numpy()
+    base_errors = interfaces.column("error_rate").to_numpy()
+    base_loss = np.where(faulty, base_loss, base_loss * 0.2)
+    base_errors = np.where(faulty, base_errors, base_errors * 0.2)
+    drift = np.where(rng.random(count) < drift_ratio, rng.uniform(0.1, 0.5, count), 0.0)
+    trend = np.arange(steps)[:, None] * drift[None, :]
+    loss = np.clip(base_loss + trend + rng.normal(0, 0.5, (steps, count)), 0, 100)
+    errors = np.clip(base_errors + rng.normal(0, 0.05, (steps, count)), 0, None)
+    snapshot_down = interfaces.column("status").to_numpy(zero_copy_only=False).astype(str) == "down"
+    down = faulty & snapshot_down
+    flapping = rng.random(count) < flap_ratio
+    status = np.where(flapping, rng.random((steps, count)) < 0.5, down).astype(np.int32)
+    device = interfaces.column("device_id").cast(pa.string()).dictionary_encode()
+    name = interfaces.column("name").cast(pa.string()).dictionary_encode()
+    device = device.combine_chunks() if isinstance(device, pa.ChunkedArray) else device
+    name = name.combine_chunks() if isinstance(name, pa.ChunkedArray) else name
+    return pa.table(
+        {
+            "ts": pa.array(np.repeat(times, count)),
+            "device_id": _dictionary(np.tile(device.indices.to_numpy(), steps), device.dictionary),
+            "interface": _dictionary(np.tile(name.indices.to_numpy(), steps), name.dictionary),
+            "status": _dictionary(status.ravel(), ["up", "down"]),
+            "packet_loss": np.round(loss.ravel(), 2),
+            "error_rate": np.round(errors.ravel(), 2),
+        }
+    )
+
+
+def incidents_from_table(incidents: pa.Table) -> List[Incident]:
+    """Materialize incident rows as models; meant for the handful the agent will run."""
+    return [Incident(**row) for row in incidents.to_pylist()]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .db import NetOpsDatabase
+
+_STRINGS = pa.dictionary(pa.int32(), pa.string())
+TELEMETRY_SCHEMA = pa.schema(
+    [
+        ("ts", pa.timestamp("us")),
+        ("device_id", _STRINGS),
+        ("interface", _STRINGS),
+        ("status", _STRINGS),
+        ("packet_loss", pa.float64()),
+        ("error_rate", pa.float64()),
+    ]
+)
+
+
+def _hour_key(hour: np.datetime64) -> str:
+    return np.datetime_as_string(hour, unit="h").replace("-", "").replace("T", "")
+
+
+def utcnow() -> datetime:
+    """Naive UTC now, matching the naive ``ts`` column."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class TelemetryStore:
+    """Append-only interface samples in hourly Parquet partitions.
+
+    Files live under ``root/hour=YYYYMMDDHH/part-<id>.parquet`` and are never
+    rewritten. Window queries only open partitions whose hour overlaps the window
+    and then let DuckDB skip row groups by their ``ts`` statistics.
+    """
+
+    def __init__(self, root: str | Path = "outputs/telemetry") -> None:
+        self.root = Path(root)
+
+    def partitions(self) -> List[Path]:
+        return sorted(self.root.glob("hour=*"))
+
+    def files(self, since: datetime | None = None) -> List[Path]:
+        floor = _hour_key(np.datetime64(since, "h")) if since is not None else ""
+        return [
+            path
+            for partition in self.partitions()
+            if partition.name.split("=", 1)[1] >= floor
+            for path in sorted(partition.glob("*.parquet"))
+        ]
+
+    def append(self, samples: pa.Table) -> int:
+        """Write ``samples`` into their hourly partitions; returns the files written."""
+        samples = samples.select(TELEMETRY_SCHEMA.names).cast(TELEMETRY_SCHEMA)
+        if samples.num_rows == 0:
+            return 0
+        hours = samples.column("ts").to_numpy().astype("datetime64[h]")
+        keys, inverse = np.unique(hours, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(keys) + 1))
+        for idx, hour in enumerate(keys):
+            part = samples.take(pa.array(order[bounds[idx] : bounds[idx + 1]]))
+            part = part.sort_by("ts")
+            directory = self.root / f"hour={_hour_key(hour)}"
+            directory.mkdir(parents=True, exist_ok=True)
+            pq.write_table(part, directory / f"part-{uuid.uuid4().hex[:12]}.parquet")
+        return len(keys)
+
+    def register(self, db: NetOpsDatabase, name: str = "telemetry") -> bool:
+        """Expose every partition as a DuckDB view; False while the store is empty."""
+        if not self.files():
+            return False
+        pattern = str((self.root / "hour=*" / "*.parquet").resolve()).replace("'", "''")
+        db.conn.execute(
+            f"CREATE OR REPLACE VIEW {name} AS "
+            f"SELECT * FROM read_parquet('{pattern}', hive_partitioning = true)"
+        )
+        return True
+
+    def read_window(self, minutes: float, now: datetime | None = None) -> pa.Table:
+        """Raw samples from the last ``minutes``, read from overlapping partitions only."""
+        end = now or utcnow()
+        start = end - timedelta(minutes=minutes)
+        files = [str(path) for path in self.files(since=start)]
+        if not files:
+            return TELEMETRY_SCHEMA.empty_table()
+        # Read with Arrow rather than DuckDB so string columns stay dictionary encoded.
+        return pq.read_table(
+            files,
+            schema=TELEMETRY_SCHEMA,
+            filters=[("ts", ">", start), ("ts", "<=", end)],
+        )
+
+    def window_aggregates(
+        self, db: NetOpsDatabase, minutes: float, now: datetime | None = None
+    ) -> pa.Table:
+        """Per-interface avg, p95 and per-minute slope over the last ``minutes``."""
+        end = now or utcnow()
+        start = end - timedelta(minutes=minutes)
+        files = [str(path) for path in self.files(since=start)]
+        if not files:
+            return pa.table(
+                {
+                    "device_id": pa.array([], pa.string()),
+                    "interface": pa.array([], pa.string()),
+                    "samples": pa.array([], pa.int64()),
+                }
+            )
+        return db.conn.execute(
+            """
+            SELECT
+                device_id,
+                interface,
+                count(*) AS samples,
+                avg(packet_loss) AS avg_packet_loss,
+                quantile_cont(packet_loss, 0.95) AS p95_packet_loss,
+                regr_slope(packet_loss, epoch(ts)) * 60 AS packet_loss_per_min,
+                avg(error_rate) AS avg_error_rate,
+                quantile_cont(error_rate, 0.95) AS p95_error_rate,
+                regr_slope(error_rate, epoch(ts)) * 60 AS error_rate_per_min,
+                arg_max(status, ts) AS last_status
+            FROM read_parquet(?)
+            WHERE ts > ? AND ts <= ?
+            GROUP BY device_id, interface
+            ORDER BY device_id, interface
+            """,
+            [files, start, end],
+        ).fetch_arrow_table()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Tuple
+
+from .tools import ToolResult
+
+CacheKey = Tuple[str, str]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    @property
+    def saved(self) -> int:
+        """Device round trips avoided by cache hits."""
+        return self.hits
+
+
+class ToolCache:
+    """TTL cache of read-only tool results keyed by ``(device_id, command)``.
+
+    Keys carry the device, and the workflow runs one incident per device at a
+    time, so two requests for the same key never overlap and there is nothing to
+    coalesce. Not thread-safe: use one cache per thread or event loop.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 10_000) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: Dict[CacheKey, Tuple[float, ToolResult]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> ToolResult | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return result
+
+    def put(self, key: CacheKey, result: ToolResult) -> None:
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+
+    def invalidate_device(self, device_id: str) -> int:
+        """Drop every cached result for ``device_id``; returns how many were removed."""
+        stale = [key for key in self._entries if key[0] == device_id]
+        for key in stale:
+            del self._entries[key]
+        self.stats.invalidations += len(stale)
+        return len(stale)
+
+    def get_or_run(self, key: CacheKey, run: Callable[[], ToolResult]) -> ToolResult:
+        cached = self.get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return cached
+        self.stats.misses += 1
+        result = run()
+        self.put(key, result)
+        return result
+
+    async def get_or_run_async(
+        self, key: CacheKey, run: Callable[[], Awaitable[ToolResult]]
+    ) -> ToolResult:
+        cached = self.get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return cached
+        self.stats.misses += 1
+        result = await run()
+        self.put(key, result)
+        return result
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import re
 from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Tuple
 
 from .models import Incident
 
@@ -35,7 +38,140 @@ def reset_interface(incident: Incident) -> ToolResult:
     return ToolResult(command=command, output=output)
 
 
-def show_process_cpu() -> ToolResult:
+def show_process_cpu(incident: Incident | None = None) -> ToolResult:
     command = "show process cpu"
     output = "CPU utilization 45%"
     return ToolResult(command=command, output=output)
+
+
+# Async variants simulate the I/O wait of a real device round trip.
+
+
+async def show_interface_async(incident: Incident, latency: float = 0.0) -> ToolResult:
+    await asyncio.sleep(latency)
+    return show_interface(incident)
+
+
+async def show_interface_counters_async(incident: Incident, latency: float = 0.0) -> ToolResult:
+    await asyncio.sleep(latency)
+    return show_interface_counters(incident)
+
+
+async def ping_gateway_async(incident: Incident, latency: float = 0.0) -> ToolResult:
+    await asyncio.sleep(latency)
+    return ping_gateway(incident)
+
+
+async def reset_interface_async(incident: Incident, latency: float = 0.0) -> ToolResult:
+    await asyncio.sleep(latency)
+    return reset_interface(incident)
+
+
+async def show_process_cpu_async(
+    incident: Incident | None = None, latency: float = 0.0
+) -> ToolResult:
+    await asyncio.sleep(latency)
+    return show_process_cpu()
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """A registered tool and the runbook commands it handles.
+
+    A command matches when it contains every ``patterns`` entry and no ``excludes`` entry.
+    ``observes`` pairs a validation field with a regex whose first group reads that
+    field's value from the tool output.
+    """
+
+    name: str
+    description: str
+    func: Callable[[Incident], ToolResult]
+    async_func: Callable[[Incident, float], Awaitable[ToolResult]]
+    read_only: bool
+    patterns: Tuple[str, ...]
+    excludes: Tuple[str, ...] = ()
+    observes: Tuple[Tuple[str, str], ...] = ()
+
+    def matches(self, command: str) -> bool:
+        return all(p in command for p in self.patterns) and not any(
+            e in command for e in self.excludes
+        )
+
+    def observe(self, output: str) -> Dict[str, float]:
+        """Readings reported by ``output``, keyed by validation field."""
+        readings = {}
+        for field, pattern in self.observes:
+            match = re.search(pattern, output)
+            if match:
+                readings[field] = float(match.group(1))
+        return readings
+
+
+# Registration order is match priority when compiling runbook commands.
+TOOLS: Dict[str, ToolSpec] = {}
+
+
+def register_tool(spec: ToolSpec) -> ToolSpec:
+    TOOLS[spec.name] = spec
+    return spec
+
+
+def match_tool(command: str) -> ToolSpec | None:
+    for spec in TOOLS.values():
+        if spec.matches(command):
+            return spec
+    return None
+
+
+register_tool(
+    ToolSpec(
+        name="show_interface",
+        description="Check interface status",
+        func=show_interface,
+        async_func=show_interface_async,
+        read_only=True,
+        patterns=("show interface",),
+        excludes=("counters",),
+    )
+)
+register_tool(
+    ToolSpec(
+        name="show_interface_counters",
+        description="Check interface counters",
+        func=show_interface_counters,
+        async_func=show_interface_counters_async,
+        read_only=True,
+        patterns=("counters",),
+    )
+)
+register_tool(
+    ToolSpec(
+        name="ping_gateway",
+        description="Ping gateway",
+        func=ping_gateway,
+        async_func=ping_gateway_async,
+        read_only=True,
+        patterns=("ping",),
+    )
+)
+register_tool(
+    ToolSpec(
+        name="reset_interface",
+        description="Reset interface",
+        func=reset_interface,
+        async_func=reset_interface_async,
+        read_only=False,
+        patterns=("shutdown",),
+    )
+)
+register_tool(
+    ToolSpec(
+        name="show_process_cpu",
+        description="Check CPU",
+        func=show_process_cpu,
+        async_func=show_process_cpu_async,
+        read_only=True,
+        patterns=("process cpu",),
+        observes=(("cpu_utilization", r"CPU utilization (\d+(?:\.\d+)?)%"),),
+    )
+)
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+from .db import NetOpsDatabase
+from .models import Incident, Runbook
+
+# Validation field -> (SQL column, literal type it compares against). ``i`` is the
+# incident's interfaces row; ``t`` holds readings taken from the incident's tool output.
+FIELDS: Dict[str, Tuple[str, type]] = {
+    "interface_status": ("i.status", str),
+    "packet_loss": ("i.packet_loss", float),
+    "error_rate": ("i.error_rate", float),
+    "cpu_utilization": ("t.cpu_utilization", float),
+}
+# Fields read from tool output (see ToolSpec.observes) rather than from the interfaces table.
+OBSERVED_FIELDS = ("cpu_utilization",)
+COMPARISONS = {"==": "=", "!=": "<>", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+FLIPPED = {"==": "==", "!=": "!=", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<number>\d+(?:\.\d*)?|\.\d+)"
+    r"|(?P<string>'[^']*'|\"[^\"]*\")"
+    r"|(?P<op>==|!=|<=|>=|<|>)"
+    r"|(?P<paren>[()])"
+    r"|(?P<name>[A-Za-z_]\w*))"
+)
+
+Value = Union[str, float, bool]
+
+
+class ValidationSyntaxError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Compare:
+    field: str
+    op: str
+    value: Value
+
+
+@dataclass(frozen=True)
+class BoolOp:
+    op: str
+    operands: Tuple["Predicate", ...]
+
+
+@dataclass(frozen=True)
+class Not:
+    operand: "Predicate"
+
+
+Predicate = Union[Compare, BoolOp, Not]
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = _TOKEN.match(expression, pos)
+        if match is None or match.end() == pos:
+            raise ValidationSyntaxError(f"Unexpected input at {pos} in {expression!r}")
+        kind = match.lastgroup or ""
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser for ``or``/``and``/``not`` over field comparisons."""
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+
+    def parse(self) -> Predicate:
+        predicate = self._or()
+        if self.pos != len(self.tokens):
+            raise ValidationSyntaxError(
+                f"Unexpected {self.tokens[self.pos][1]!r} in {self.expression!r}"
+            )
+        return predicate
+
+    def _peek(self) -> Tuple[str, str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else ("end", "")
+
+    def _take(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token[0] == "end":
+            raise ValidationSyntaxError(f"Unexpected end of {self.expression!r}")
+        self.pos += 1
+        return token
+
+    def _keyword(self, word: str) -> bool:
+        if self._peek() == ("name", word):
+            self.pos += 1
+            return True
+        return False
+
+    def _or(self) -> Predicate:
+        operands = [self._and()]
+        while self._keyword("or"):
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else BoolOp("or", tuple(operands))
+
+    def _and(self) -> Predicate:
+        operands = [self._not()]
+        while self._keyword("and"):
+            operands.append(self._not())
+        return operands[0] if len(operands) == 1 else BoolOp("and", tuple(operands))
+
+    def _not(self) -> Predicate:
+        if self._keyword("not"):
+            return Not(self._not())
+        if self._peek() == ("paren", "("):
+            self.pos += 1
+            predicate = self._or()
+            if self._take() != ("paren", ")"):
+                raise ValidationSyntaxError(f"Expected ')' in {self.expression!r}")
+            return predicate
+        return self._compare()
+
+    def _compare(self) -> Compare:
+        left = self._take()
+        kind, op = self._take()
+        if kind != "op":
+            raise ValidationSyntaxError(f"Expected a comparison in {self.expression!r}")
+        right = self._take()
+        if left[0] != "name" and right[0] == "name":
+            left, right, op = right, left, FLIPPED[op]
+        if left[0] != "name" or left[1] in ("and", "or", "not", "true", "false"):
+            raise ValidationSyntaxError(f"Expected a field name in {self.expression!r}")
+        value = self._literal(right)
+        expected = FIELDS.get(left[1], (None, type(value)))[1]
+        if not isinstance(value, expected):
+            raise ValidationSyntaxError(
+                f"{left[1]} compares against {expected.__name__}, got {right[1]}"
+            )
+        return Compare(left[1], op, value)
+
+    def _literal(self, token: Tuple[str, str]) -> Value:
+        kind, text = token
+        if kind == "number":
+            return float(text)
+        if kind == "string":
+            return text[1:-1]
+        if token in (("name", "true"), ("name", "false")):
+            return text == "true"
+        raise ValidationSyntaxError(f"Expected a literal, got {text!r} in {self.expression!r}")
+
+
+def parse(expression: str) -> Predicate:
+    """Parse a runbook validation expression; raises :class:`ValidationSyntaxError`."""
+    return _Parser(expression).parse()
+
+
+def fields(predicate: Predicate) -> List[str]:
+    if isinstance(predicate, Compare):
+        return [predicate.field]
+    if isinstance(predicate, Not):
+        return fields(predicate.operand)
+    return list(dict.fromkeys(name for op in predicate.operands for name in fields(op)))
+
+
+def to_sql(predicate: Predicate, params: List[Value]) -> str:
+    """Render ``predicate`` over the validation query, appending literals to ``params``.
+
+    Unknown fields render as NULL, so the check is reported as not observed rather
+    than guessed.
+    """
+    if isinstance(predicate, Compare):
+        column = FIELDS.get(predicate.field, (None, None))[0]
+        if column is None:
+            return "NULL::BOOLEAN"
+        params.append(predicate.value)
+        return f"({column} {COMPARISONS[predicate.op]} ?)"
+    if isinstance(predicate, Not):
+        return f"(NOT {to_sql(predicate.operand, params)})"
+    joined = f" {predicate.op.upper()} ".join(to_sql(op, params) for op in predicate.operands)
+    return f"({joined})"
+
+
+@dataclass(frozen=True)
+class Check:
+    expression: str
+    predicate: Predicate
+    sql: str
+    params: Tuple[Value, ...]
+    observed_sql: str
+
+
+def compile_check(expression: str) -> Check:
+    predicate = parse(expression)
+    params: List[Value] = []
+    sql = to_sql(predicate, params)
+    observed = [
+        f"'{name}=' || coalesce(CAST({FIELDS[name][0]} AS VARCHAR), 'NULL')"
+        for name in fields(predicate)
+        if name in FIELDS
+    ]
+    observed_sql = f"concat_ws(', ', {', '.join(observed)})" if observed else "''"
+    return Check(expression, predicate, sql, tuple(params), observed_sql)
+
+
+class RunbookValidator:
+    """Evaluates runbook validation checks for a batch of incidents in one query.
+
+    Each runbook's expressions are parsed once into a predicate AST and compiled to
+    SQL. :meth:`evaluate` joins every incident to its interface row and to the
+    readings its tools observed, and computes all distinct checks as columns of a
+    single DuckDB query; pass/fail and reasons are then combined per runbook with
+    NumPy masks. A check on a value nobody observed fails as "not observed".
+    """
+
+    def __init__(self, db: NetOpsDatabase) -> None:
+        self.db = db
+        self._checks: Dict[str, Tuple[Check, ...]] = {}
+
+    def compile(self, runbook: Runbook) -> Tuple[Check, ...]:
+        checks = self._checks.get(runbook.runbook_id)
+        if checks is None:
+            checks = tuple(compile_check(expression) for expression in runbook.validation)
+            self._checks[runbook.runbook_id] = checks
+        return checks
+
+    def clear(self) -> None:
+        self._checks.clear()
+
+    def evaluate(
+        self,
+        incidents: Sequence[Incident],
+        runbooks: Sequence[Runbook],
+        observed: Sequence[Mapping[str, float]] | None = None,
+    ) -> List[Tuple[bool, str]]:
+        """Return ``(passed, reason)`` per incident, validated against its runbook.
+
+        ``observed`` holds each incident's readings from tool output, e.g.
+        ``ExecutionResult.observed``.
+        """
+        count = len(incidents)
+        if count == 0:
+            return []
+        unique = {runbook.runbook_id: runbook for runbook in runbooks}
+        columns: Dict[str, int] = {}
+        checks: List[Check] = []
+        for runbook in unique.values():
+            for check in self.compile(runbook):
+                if check.expression not in columns:
+                    columns[check.expression] = len(checks)
+                    checks.append(check)
+        outcomes, seen = self._query(incidents, checks, observed)
+
+        runbook_ids = np.array([rb.runbook_id for rb in runbooks], dtype=object)
+        passed = np.ones(count, dtype=bool)
+        reasons = np.full(count, "No validation checks defined", dtype=object)
+        for runbook in unique.values():
+            rows = runbook_ids == runbook.runbook_id
+            for check in self.compile(runbook):
+                column = columns[check.expression]
+                unknown = np.ma.getmaskarray(outcomes[column])
+                failed = rows & passed & ~np.ma.filled(outcomes[column], False)
+                reasons[failed & unknown] = f"{check.expression} not observed"
+                failed_known = failed & ~unknown
+                reasons[failed_known] = (
+                    f"{check.expression} failed (" + seen[column][failed_known] + ")"
+                )
+                passed &= ~failed
+            if runbook.validation:
+                reasons[rows & passed] = "Passed " + "; ".join(runbook.validation)
+        return list(zip(passed.tolist(), reasons.tolist()))
+
+    def _query(
+        self,
+        incidents: Sequence[Incident],
+        checks: Sequence[Check],
+        observed: Sequence[Mapping[str, float]] | None,
+    ) -> Tuple[List[np.ma.MaskedArray], List[np.ndarray]]:
+        if not checks:
+            return [], []
+        import pyarrow as pa
+
+        targets = pa.table(
+            {
+                "pos": np.arange(len(incidents), dtype=np.int64),
+                "device_id": [incident.device_id for incident in incidents],
+                "name": [incident.interface for incident in incidents],
+                **{
+                    name: pa.array(
+                        [readings.get(name) for readings in observed]
+                        if observed is not None
+                        else [None] * len(incidents),
+                        type=pa.float64(),
+                    )
+                    for name in OBSERVED_FIELDS
+                },
+            }
+        )
+        select = []
+        params: List[Value] = []
+        for idx, check in enumerate(checks):
+            select.append(f"{check.sql} AS pass_{idx}")
+            select.append(f"{check.observed_sql} AS seen_{idx}")
+            params.extend(check.params)
+        self.db.conn.register("validation_targets", targets)
+        try:
+            rows = self.db.conn.execute(
+                f"SELECT {', '.join(select)} FROM validation_targets AS t "
+                "LEFT JOIN interfaces AS i ON i.device_id = t.device_id AND i.name = t.name "
+                "ORDER BY t.pos",
+                params,
+            ).fetchnumpy()
+        finally:
+            self.db.conn.unregister("validation_targets")
+        outcomes = [np.ma.asarray(rows[f"pass_{idx}"]) for idx in range(len(checks))]
+        observed = [
+            np.ma.filled(np.ma.asarray(rows[f"seen_{idx}"]).astype(object), "")
+            for idx in range(len(checks))
+        ]
+        return outcomes, observed
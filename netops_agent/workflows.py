@@ -1,17 +1,46 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, List, Tuple
 
 from rich.console import Console
 from rich.table import Table
 
-from .agent import NetOpsAgent
-from .db import NetOpsDatabase
-from .models import ExecutionResult, Incident
+from .agent import NetOpsAgent, PlanStep
+from .correlation import IncidentCorrelator, IncidentGroup
+from .db import NetOpsDatabase, SyncStats, TicketWriter
+from .detection import AnomalyDetector
+from .device_sim import DeviceSimulator
+from .eventlog import LogPipeline
+from .inventory import InventoryStore
+from .metrics import MetricsRecorder
+from .models import ExecutionResult, Incident, Runbook
 from .rag import RunbookIndex
-from .synthetic_data import make_devices, make_incidents, make_interfaces
+from .scheduling import DEFAULT_DEADLINES, PriorityScheduler, SchedulerPolicy
+from .sessions import DeviceSessionPool
+from .synthetic_data import (
+    incidents_from_table,
+    make_device_table,
+    make_devices,
+    make_incident_table,
+    make_incidents,
+    make_interface_table,
+    make_interfaces,
+    make_telemetry_table,
+)
+from .telemetry import TelemetryStore, utcnow
+from .tool_cache import ToolCache
+from .validation import RunbookValidator
+
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 
 @dataclass
@@ -20,6 +49,35 @@ class RunContext:
     db_path: str = "outputs/netops.duckdb"
     log_path: str = "outputs/netops.log"
     verbose: bool = False
+    ticket_batch_size: int = 1000
+    ticket_flush_interval: float = 5.0
+    concurrency: int = 1
+    tool_latency: float = 0.0
+    devices: int | None = None
+    interfaces_per_device: int = 3
+    incidents: int = 3
+    incremental: bool = False
+    tool_cache_ttl: float = 0.0
+    device_endpoint: str | None = None
+    device_sim: bool = False
+    connect_latency: float = 0.0
+    session_pool: bool = True
+    max_sessions_per_device: int = 1
+    metrics: bool = False
+    prometheus_path: str | None = None
+    retrieval: str = "tfidf"
+    correlation_window: float = 300.0
+    telemetry_dir: str = "outputs/telemetry"
+    telemetry_minutes: int = 0
+    incident_source: str = "synthetic"
+    detection_window: float = 15.0
+    workers: int = 1
+    log_level: str = "INFO"
+    log_max_bytes: int = 50 * 1024 * 1024
+    retrieval_cache_size: int = 4096
+    deadlines: Dict[str, float] | None = None
+    max_pending: int = 0
+    overload: str = "defer"
 
 
 class NetOpsWorkflow:
@@ -27,126 +85,577 @@ class NetOpsWorkflow:
         self.context = context
         self.console = Console()
         self.db = NetOpsDatabase(context.db_path)
-        self.index = RunbookIndex(context.db_path)
-        self.agent = NetOpsAgent()
+        self.index = RunbookIndex(context.db_path, cache_size=context.retrieval_cache_size)
+        self.inventory: InventoryStore | None = None
+        self.telemetry = TelemetryStore(context.telemetry_dir)
+        self.detector = AnomalyDetector()
+        self.metrics = MetricsRecorder(enabled=context.metrics)
+        self.agent = NetOpsAgent(
+            cache=ToolCache(ttl=context.tool_cache_ttl) if context.tool_cache_ttl > 0 else None,
+            metrics=self.metrics,
+        )
+        self.validator = RunbookValidator(self.db)
+        self.correlator = IncidentCorrelator(window=context.correlation_window)
+        self.scheduler = PriorityScheduler(
+            SchedulerPolicy(
+                deadlines={**DEFAULT_DEADLINES, **(context.deadlines or {})},
+                max_pending=context.max_pending,
+                overload=context.overload,
+            )
+        )
+        self.tickets = TicketWriter(
+            self.db,
+            max_rows=context.ticket_batch_size,
+            max_age=context.ticket_flush_interval,
+        )
         self.logger = self._setup_logger()
 
-    def _setup_logger(self) -> "logging.Logger":
-        import logging
-
+    def _setup_logger(self) -> logging.Logger:
         logger = logging.getLogger("netops-agent")
-        logger.setLevel(logging.INFO)
-        logger.handlers.clear()
-        formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-
-        log_path = Path(self.context.log_path)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_path)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-
-        if self.context.verbose:
-            console_handler = logging.StreamHandler()
-            console_handler.setFormatter(formatter)
-            logger.addHandler(console_handler)
-
+        self.log_pipeline = LogPipeline(
+            logger,
+            self.context.log_path,
+            level=self.context.log_level.upper(),
+            verbose=self.context.verbose,
+            max_bytes=self.context.log_max_bytes,
+        )
         return logger
 
     def prepare_data(self) -> List[Incident]:
+        if self.context.devices is not None:
+            return self.prepare_fleet_data()
         devices = make_devices(self.context.seed)
         interfaces = make_interfaces(self.context.seed, devices)
-        incidents = make_incidents(self.context.seed, interfaces)
         self.db.init_schema()
-        self.db.load_devices(devices)
-        self.db.load_interfaces(interfaces)
-        self.db.load_incidents(incidents)
+        self._load_inventory(InventoryStore.from_models(devices, interfaces))
+        if self.context.incident_source == "telemetry":
+            return self.detect_incidents()
+        incidents = make_incidents(self.context.seed, interfaces)
+        if self.context.incremental:
+            self._log_sync("incidents", self.db.sync_incidents(incidents))
+        else:
+            self.db.load_incidents(incidents)
         return incidents
 
+    def prepare_fleet_data(self) -> List[Incident]:
+        """Generate a fleet of ``context.devices`` columnar and load it as Arrow."""
+        seed = self.context.seed
+        devices = make_device_table(seed, self.context.devices or 0)
+        interfaces = make_interface_table(seed, devices, self.context.interfaces_per_device)
+        self.db.init_schema()
+        self._load_inventory(InventoryStore.from_arrow(devices, interfaces))
+        if self.context.incident_source == "telemetry":
+            return self.detect_incidents()
+        incidents = make_incident_table(seed, interfaces, self.context.incidents)
+        self._load_table("incidents", incidents)
+        return incidents_from_table(incidents)
+
+    def detect_incidents(self) -> List[Incident]:
+        """Raise incidents from anomalies in the last ``detection_window`` minutes of telemetry."""
+        import pyarrow.compute as pc
+
+        assert self.inventory is not None
+        samples = self.telemetry.read_window(self.context.detection_window)
+        # Partitions may hold samples of devices no longer in the inventory.
+        samples = samples.filter(
+            pc.is_in(samples.column("device_id"), value_set=self.inventory.device_ids)
+        )
+        with self.metrics.span("detection"):
+            started = time.perf_counter()
+            batch = self.detector.scan(samples)
+            incidents = self.detector.incident_table(batch)
+            elapsed = time.perf_counter() - started
+        self.logger.info(
+            "[DETECTION] scanned %d samples over %d interfaces in %.1fms: %d incidents",
+            batch.samples,
+            len(batch.kind),
+            elapsed * 1000,
+            incidents.num_rows,
+        )
+        self._load_table("incidents", incidents)
+        return incidents_from_table(incidents)
+
+    def _load_inventory(self, inventory: InventoryStore) -> None:
+        """Keep the columnar inventory and hand its Arrow views to DuckDB."""
+        self.inventory = inventory
+        self._load_table("devices", inventory.devices_table())
+        self._load_table("interfaces", inventory.interfaces_table())
+        if self.context.telemetry_minutes > 0:
+            self.emit_telemetry(self.context.telemetry_minutes)
+
+    def emit_telemetry(self, minutes: int) -> None:
+        """Append ``minutes`` of synthetic samples ending now for every interface."""
+        assert self.inventory is not None
+        samples = make_telemetry_table(
+            self.context.seed, self.inventory.interfaces_table(), utcnow(), minutes
+        )
+        partitions = self.telemetry.append(samples)
+        self.telemetry.register(self.db)
+        self.logger.info(
+            "[TELEMETRY] appended %d samples into %d partitions under %s",
+            samples.num_rows,
+            partitions,
+            self.telemetry.root,
+        )
+
+    def _load_table(self, table: str, data: pa.Table) -> None:
+        if self.context.incremental:
+            self._log_sync(table, self.db.sync_table(table, data))
+        else:
+            self.db.load_arrow(table, data)
+
+    def _log_sync(self, table: str, stats: SyncStats) -> None:
+        self.logger.info(
+            "[SYNC] %s inserted=%d updated=%d unchanged=%d",
+            table,
+            stats.inserted,
+            stats.updated,
+            stats.unchanged,
+        )
+
     def build_index(self) -> None:
-        self.index.load_runbooks(Path("data/runbooks.yaml"))
-        self.index.build()
-        self.index.persist()
+        """Load the runbook index and swap it in once it is complete.
+
+        Raises ``ValueError`` when the runbooks do not load; the current index, its
+        compiled plans and validation checks then stay in use.
+        """
+        runbook_path = Path("data/runbooks.yaml")
+        source_hash = RunbookIndex.hash_source(runbook_path)
+        index = RunbookIndex(self.context.db_path, cache_size=self.context.retrieval_cache_size)
+        if index.restore(source_hash):
+            self.logger.info("[INDEX] warm start from DuckDB (source %s)", source_hash[:12])
+        else:
+            index.load_runbooks(runbook_path)
+            index.build()
+            index.persist()
+            self.logger.info(
+                "[INDEX] rebuilt %d runbooks (source %s)", len(index.runbooks), source_hash[:12]
+            )
+        self.index = index
+        self.agent.clear_plans()
+        self.validator.clear()
+
+    def record_incidents(self, incidents: List[Incident]) -> None:
+        """Upsert incidents received by ``stream`` or ``serve`` so their tickets join them."""
+        latest = {incident.incident_id: incident for incident in incidents}
+        self.db.sync_incidents(latest.values())
+
+    def correlate(self, incidents: List[Incident], now: float | None = None) -> List[IncidentGroup]:
+        """Assign each incident to a correlation group and log suppressed duplicates."""
+        sites = self.db.device_sites(incident.device_id for incident in incidents)
+        groups = self.correlator.assign(incidents, sites, now)
+        for incident, group in zip(incidents, groups):
+            if group.primary is not incident:
+                self.logger.info(
+                    "[CORRELATED] %s joins %s",
+                    incident.incident_id,
+                    group.primary.incident_id,
+                    extra={"incident_id": incident.incident_id},
+                )
+        return groups
 
-    def run_incident(self, incident: Incident) -> ExecutionResult:
-        runbook, score = self.index.query(incident.summary, top_k=1)[0]
+    def retrieve(self, incidents: List[Incident]) -> List[Tuple[Runbook, float]]:
+        """Best runbook per incident using the configured retrieval engine."""
+        if self.context.retrieval == "bm25":
+            os_versions = self.db.device_os_versions(incident.device_id for incident in incidents)
+            matches = []
+            for incident in incidents:
+                ranked = self.index.search(
+                    incident.summary,
+                    top_k=1,
+                    category=incident.category,
+                    os_version=os_versions.get(incident.device_id),
+                )
+                matches.append(ranked[0] if ranked else self.index.query(incident.summary)[0])
+            return matches
+        ranked = self.index.query_batch([incident.summary for incident in incidents], top_k=1)
+        return [candidates[0] for candidates in ranked]
+
+    def run_incident(
+        self, incident: Incident, match: Tuple[Runbook, float] | None = None
+    ) -> ExecutionResult:
+        if match is None:
+            with self.metrics.span("retrieval", incident.incident_id):
+                match = self.index.query(incident.summary, top_k=1)[0]
+        result = self.resolve_incident(incident, match)
+        with self.metrics.span("validation", incident.incident_id):
+            self.validate_results([incident], [match[0]], [result])
+        with self.metrics.span("ticket", incident.incident_id):
+            self.tickets.add(result)
+        return result
+
+    def resolve_incident(self, incident: Incident, match: Tuple[Runbook, float]) -> ExecutionResult:
+        """Plan and execute one incident; validation is left to :meth:`validate_results`."""
+        runbook, score = match
+        plan = self._plan_incident(incident, runbook, score)
+        result = self.agent.execute(incident, plan, logger=self.logger)
+        return self._finish_incident(runbook, score, result)
+
+    async def run_incident_async(
+        self,
+        incident: Incident,
+        match: Tuple[Runbook, float],
+        limit: asyncio.Semaphore,
+        device_locks: Dict[str, asyncio.Semaphore],
+    ) -> ExecutionResult:
+        """Run one incident, holding its device lock and a global slot while executing.
+
+        Validation and the ticket are left to the caller, which batches them in input order.
+        """
+        runbook, score = match
+        plan = self._plan_incident(incident, runbook, score)
+        async with device_locks[incident.device_id], limit:
+            self.scheduler.started(incident)
+            result = await self.agent.execute_async(
+                incident,
+                plan,
+                logger=self.logger,
+                latency=self.context.tool_latency,
+            )
+        return self._finish_incident(runbook, score, result)
+
+    def _open_session_pool(self) -> DeviceSessionPool | None:
+        if not self.context.device_endpoint:
+            return None
+        host, _, port = self.context.device_endpoint.rpartition(":")
+        pool = DeviceSessionPool(
+            host,
+            int(port),
+            max_per_device=self.context.max_sessions_per_device,
+            pooled=self.context.session_pool,
+        )
+        self.agent.sessions = pool
+        return pool
+
+    def _plan_incident(self, incident: Incident, runbook: Runbook, score: float) -> List[PlanStep]:
+        fields = {"incident_id": incident.incident_id, "runbook_id": runbook.runbook_id}
         self.logger.info(
             "[PLAN] %s matched runbook %s (score %.2f)",
             incident.incident_id,
             runbook.runbook_id,
             score,
+            extra=fields,
         )
         for step in runbook.steps:
-            self.logger.info("[STEP] %s %s", incident.incident_id, step)
-        plan = self.agent.plan(incident, runbook)
-        result = self.agent.execute(incident, plan, logger=self.logger.info)
+            self.logger.info("[STEP] %s %s", incident.incident_id, step, extra=fields)
+        with self.metrics.span("plan", incident.incident_id):
+            return self.agent.plan(incident, runbook)
+
+    @staticmethod
+    def _finish_incident(
+        runbook: Runbook, score: float, result: ExecutionResult
+    ) -> ExecutionResult:
         result.runbook_id = runbook.runbook_id
-<<<<<<< codex/design-end-to-end-agentic-solution-architecture-ejerf8
-        result.validation_passed = not incident.should_fail
-        result.validation_reason = (
-            "Synthetic validation failed"
-            if incident.should_fail
-            else "Synthetic validation passed"
-        )
-        result.escalated = (not result.validation_passed) or incident.severity == "high"
         result.notes = f"Matched runbook {runbook.title} (score {score:.2f})."
-        self.logger.info(
-            "[VALIDATION] %s %s (%s)",
-            result.incident_id,
-            "PASS" if result.validation_passed else "FAIL",
-            result.validation_reason,
+        return result
+
+    def validate_results(
+        self,
+        incidents: List[Incident],
+        runbooks: List[Runbook],
+        results: List[ExecutionResult],
+    ) -> None:
+        """Check post-remediation interface state for a batch and decide escalation."""
+        self._apply_resets(incidents, runbooks)
+        outcomes = self.validator.evaluate(
+            incidents, runbooks, [result.observed for result in results]
         )
-        if result.escalated:
+        for incident, result, (passed, reason) in zip(incidents, results, outcomes):
+            if incident.should_fail and passed:
+                passed, reason = False, incident.failure_reason or "Synthetic validation failed"
+            result.validation_passed = passed
+            result.validation_reason = reason
+            result.escalated = (not passed) or incident.severity == "high"
+            fields = {"incident_id": result.incident_id, "runbook_id": result.runbook_id}
             self.logger.info(
-                "[ESCALATION] %s escalated to human. reason=%s severity=%s",
+                "[VALIDATION] %s %s (%s)",
                 result.incident_id,
-                incident.failure_reason or "Policy escalation",
-                incident.severity,
+                "PASS" if passed else "FAIL",
+                reason,
+                extra=fields,
+            )
+            if result.escalated:
+                self.logger.info(
+                    "[ESCALATION] %s escalated to human. reason=%s severity=%s",
+                    result.incident_id,
+                    incident.failure_reason or "Policy escalation",
+                    incident.severity,
+                    extra=fields,
+                )
+            self.logger.info(
+                "[RESULT] %s validation=%s runbook=%s",
+                result.incident_id,
+                "PASS" if passed else "FAIL",
+                result.runbook_id,
+                extra=fields,
+            )
+
+    def _apply_resets(self, incidents: List[Incident], runbooks: List[Runbook]) -> None:
+        # Forced failures model a device that ignored remediation, so their state stays put.
+        reset = [
+            incident
+            for incident, runbook in zip(incidents, runbooks)
+            if not incident.should_fail
+            and any(step.tool == "reset_interface" for step in self.agent.compile(runbook))
+        ]
+        if not reset:
+            return
+        import pyarrow as pa
+
+        self.db.reset_interfaces(
+            pa.table(
+                {
+                    "device_id": [incident.device_id for incident in reset],
+                    "name": [incident.interface for incident in reset],
+                }
             )
-        self.db.write_ticket(
-            result.incident_id,
-            result.runbook_id,
-            result.notes,
-            result.validation_passed,
-            result.validation_reason,
-            result.escalated,
-        )
-=======
-        result.notes = f"Matched runbook {runbook.title} (score {score:.2f})."
-        self.db.write_ticket(result.incident_id, result.runbook_id, result.notes, result.validation_passed)
->>>>>>> main
-        self.logger.info(
-            "[RESULT] %s validation=%s runbook=%s",
-            result.incident_id,
-            "PASS" if result.validation_passed else "FAIL",
-            result.runbook_id,
         )
-        return result
 
     def run(self) -> None:
         incidents = self.prepare_data()
         self.build_index()
-        results = [self.run_incident(incident) for incident in incidents]
+        if self.context.workers > 1:
+            from .sharding import run_sharded
+
+            results = run_sharded(self, incidents)
+        else:
+            results = self.process(incidents)
+        self.log_correlation_stats()
+        self.log_scheduler_stats()
+        self.log_cache_stats()
+        self.finish_metrics()
         self._render_results(results)
 
+    def process(self, incidents: List[Incident]) -> List[ExecutionResult]:
+        """Correlate, resolve, validate and ticket ``incidents``; results keep input order.
+
+        Primaries run in the scheduler's priority order. Each wave is validated and
+        ticketed before the next one starts. An incident's queue wait runs from the
+        moment its correlation group opened, which for a batch is when ``process``
+        was called; a batch therefore shares one admission time and keeps its input
+        order within a severity.
+        """
+        admitted = time.monotonic()
+        with self.metrics.span("correlation"):
+            groups = self.correlate(incidents, now=admitted)
+        opened = [group for incident, group in zip(incidents, groups) if group.primary is incident]
+        primaries = [group.primary for group in opened]
+        with self.metrics.span("retrieval_batch"):
+            matches = self.retrieve(primaries)
+        with self.metrics.span("schedule"):
+            plan = self.scheduler.plan(
+                primaries, now=admitted, arrivals=[group.opened_at for group in opened]
+            )
+        for index in plan.shed:
+            opened[index].result = self.scheduler.shed_result(primaries[index])
+        results: List[ExecutionResult | None] = [None] * len(incidents)
+        settle = partial(self._ticket_resolved, incidents, groups, results)
+        simulator = self._start_device_simulator() if self.context.device_sim else None
+        try:
+            with self.tickets:
+                if self.executes_async:
+                    asyncio.run(self._run_waves_async(plan.waves, opened, matches, settle))
+                else:
+                    for wave in plan.waves:
+                        self._run_wave(wave, opened, matches)
+                        settle()
+                settle()
+        finally:
+            if simulator is not None:
+                simulator.stop()
+                self.logger.info(
+                    "[DEVICE-SIM] connections=%d commands=%d",
+                    simulator.connections,
+                    simulator.commands,
+                )
+        return results  # type: ignore[return-value]
+
+    @property
+    def executes_async(self) -> bool:
+        return bool(
+            self.context.concurrency > 1
+            or self.context.tool_latency > 0
+            or self.context.device_endpoint
+        )
+
+    def _run_wave(
+        self, wave: List[int], opened: List[IncidentGroup], matches: List[Tuple[Runbook, float]]
+    ) -> None:
+        resolved = []
+        for index in wave:
+            incident = opened[index].primary
+            self.scheduler.started(incident)
+            resolved.append(self.resolve_incident(incident, matches[index]))
+        self._finish_wave(wave, opened, matches, resolved)
+
+    async def _run_waves_async(
+        self,
+        waves: List[List[int]],
+        opened: List[IncidentGroup],
+        matches: List[Tuple[Runbook, float]],
+        settle: Callable[[], None],
+    ) -> None:
+        """Run ``waves`` in order on one event loop, so device sessions outlive a wave."""
+        async with self._session_pool():
+            for wave in waves:
+                resolved = await self._execute_all_async(
+                    [opened[i].primary for i in wave], [matches[i] for i in wave]
+                )
+                self._finish_wave(wave, opened, matches, resolved)
+                settle()
+
+    def _finish_wave(
+        self,
+        wave: List[int],
+        opened: List[IncidentGroup],
+        matches: List[Tuple[Runbook, float]],
+        resolved: List[ExecutionResult],
+    ) -> None:
+        with self.metrics.span("validation_batch"):
+            self.validate_results(
+                [opened[i].primary for i in wave], [matches[i][0] for i in wave], resolved
+            )
+        for index, result in zip(wave, resolved):
+            opened[index].result = result
+
+    def _ticket_resolved(
+        self,
+        incidents: List[Incident],
+        groups: List[IncidentGroup],
+        results: List[ExecutionResult | None],
+    ) -> None:
+        """Ticket every incident whose group has a result and that has no ticket yet."""
+        for position, (incident, group) in enumerate(zip(incidents, groups)):
+            if results[position] is None and group.result is not None:
+                result = results[position] = group.fan_out(incident)
+                with self.metrics.span("ticket", result.incident_id):
+                    self.tickets.add(result)
+        with self.metrics.span("ticket_flush"):
+            self.tickets.flush()
+
+    def finish_metrics(self) -> None:
+        """Persist recorded spans to run_metrics and write the Prometheus dump if asked."""
+        if not self.metrics.enabled:
+            return
+        count = self.metrics.persist(self.db)
+        self.logger.info("[METRICS] run %s recorded %d spans", self.metrics.run_id, count)
+        if self.context.prometheus_path:
+            path = Path(self.context.prometheus_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(self.metrics.to_prometheus())
+
+    def _start_device_simulator(self) -> DeviceSimulator:
+        """Serve the loaded interface state locally and point the agent at it."""
+        simulator = DeviceSimulator.from_database(
+            self.db,
+            command_latency=self.context.tool_latency,
+            connect_latency=self.context.connect_latency,
+        )
+        host, port = simulator.start_in_thread()
+        self.context.device_endpoint = f"{host}:{port}"
+        self.logger.info("[DEVICE-SIM] listening on %s", self.context.device_endpoint)
+        return simulator
+
+    def log_correlation_stats(self) -> None:
+        self.logger.info(
+            "[CORRELATION] groups=%d suppressed=%d window=%.0fs",
+            self.correlator.stats.groups,
+            self.correlator.stats.suppressed,
+            self.correlator.window,
+        )
+
+    def log_scheduler_stats(self) -> None:
+        for severity, stats in self.scheduler.report():
+            p50, p95, p99 = stats.percentiles()
+            self.logger.info(
+                "[SCHEDULER] %s scheduled=%d started=%d wait_p50=%.1fms wait_p95=%.1fms "
+                "wait_p99=%.1fms deadline=%gs misses=%d deferred=%d shed=%d",
+                severity,
+                stats.scheduled,
+                stats.started,
+                p50 * 1000,
+                p95 * 1000,
+                p99 * 1000,
+                self.scheduler.deadline(severity),
+                stats.deadline_misses,
+                stats.deferred,
+                stats.shed,
+            )
+
+    def log_cache_stats(self) -> None:
+        retrieval = self.index.cache
+        if retrieval.enabled:
+            self.logger.info(
+                "[RETRIEVAL-CACHE] hits=%d misses=%d evictions=%d invalidations=%d size=%d",
+                retrieval.stats.hits,
+                retrieval.stats.misses,
+                retrieval.stats.evictions,
+                retrieval.stats.invalidations,
+                len(retrieval),
+            )
+        cache = self.agent.cache
+        if cache is None:
+            return
+        self.logger.info(
+            "[CACHE] hits=%d misses=%d invalidations=%d saved=%d",
+            cache.stats.hits,
+            cache.stats.misses,
+            cache.stats.invalidations,
+            cache.stats.saved,
+        )
+
+    async def run_incidents_async(
+        self, incidents: List[Incident], matches: List[Tuple[Runbook, float]]
+    ) -> List[ExecutionResult]:
+        """Execute incidents concurrently; results keep the input order."""
+        async with self._session_pool():
+            return await self._execute_all_async(incidents, matches)
+
+    async def _execute_all_async(
+        self, incidents: List[Incident], matches: List[Tuple[Runbook, float]]
+    ) -> List[ExecutionResult]:
+        limit = asyncio.Semaphore(max(1, self.context.concurrency))
+        device_locks: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(1))
+        results = await asyncio.gather(
+            *(
+                self.run_incident_async(incident, match, limit, device_locks)
+                for incident, match in zip(incidents, matches)
+            )
+        )
+        return list(results)
+
+    @asynccontextmanager
+    async def _session_pool(self) -> AsyncIterator[None]:
+        """Open the device session pool, if any, for the duration of the block."""
+        pool = self._open_session_pool()
+        try:
+            yield
+        finally:
+            if pool is not None:
+                await pool.close()
+                self.agent.sessions = None
+                self.logger.info(
+                    "[SESSIONS] connects=%d reuses=%d commands=%d keepalives=%d evictions=%d",
+                    pool.stats.connects,
+                    pool.stats.reuses,
+                    pool.stats.commands,
+                    pool.stats.keepalives,
+                    pool.stats.evictions,
+                )
+
     def _render_results(self, results: List[ExecutionResult]) -> None:
         table = Table(title="NetOps Agent Results")
         table.add_column("Incident")
         table.add_column("Runbook")
         table.add_column("Validation")
-<<<<<<< codex/design-end-to-end-agentic-solution-architecture-ejerf8
         table.add_column("Escalation")
-=======
->>>>>>> main
         table.add_column("Notes")
         for result in results:
             table.add_row(
                 result.incident_id,
                 result.runbook_id,
                 "PASS" if result.validation_passed else "FAIL",
-<<<<<<< codex/design-end-to-end-agentic-solution-architecture-ejerf8
                 "YES" if result.escalated else "NO",
-=======
->>>>>>> main
                 result.notes,
             )
         self.console.print(table)
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+RUNBOOKS = Path(__file__).resolve().parents[1] / "data" / "runbooks.yaml"
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch) -> Path:
+    """A working directory holding a copy of the runbooks and an ``outputs`` folder."""
+    (tmp_path / "data").mkdir()
+    (tmp_path / "outputs").mkdir()
+    shutil.copy(RUNBOOKS, tmp_path / "data" / "runbooks.yaml")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
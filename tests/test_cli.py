@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from netops_agent.cli import build_parser
+
+
+def test_deadline_parses_known_severities():
+    args = build_parser().parse_args(["run", "--deadline", "HIGH=5", "--deadline", "low=0.5"])
+    assert dict(args.deadline) == {"high": 5.0, "low": 0.5}
+
+
+@pytest.mark.parametrize("value", ["critical=5", "=5", "high=-1", "high=0", "high=x", "high"])
+def test_deadline_rejects_bad_values(value):
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["run", "--deadline", value])
+
+
+def test_shared_pipeline_options_match_across_commands():
+    parser = build_parser()
+    shared = (
+        "seed",
+        "log_path",
+        "verbose",
+        "log_level",
+        "log_max_mb",
+        "retrieval",
+        "retrieval_cache_size",
+        "correlation_window",
+        "tool_cache_ttl",
+    )
+    defaults = [
+        {name: getattr(parser.parse_args([command]), name) for name in shared}
+        for command in ("run", "stream", "serve")
+    ]
+    assert defaults[0] == defaults[1] == defaults[2]
+
+
+def test_show_db_where_cannot_modify_the_database(tmp_path):
+    from rich.console import Console
+
+    from netops_agent.cli import COMMANDS
+    from netops_agent.db import NetOpsDatabase
+
+    path = str(tmp_path / "netops.duckdb")
+    db = NetOpsDatabase(path)
+    db.init_schema()
+    db.conn.close()
+    args = build_parser().parse_args(
+        ["show-db", "--db-path", path, "--table", "tickets", "--where", "1=1; DROP TABLE tickets"]
+    )
+    with pytest.raises(SystemExit):
+        COMMANDS["show-db"](args, Console())
+    assert "tickets" in NetOpsDatabase(path, read_only=True).existing_tables()
+
+
+def test_shared_options_reach_the_run_context():
+    from netops_agent.cli import _context_options
+    from netops_agent.workflows import RunContext
+
+    for command in ("run", "stream", "serve"):
+        args = build_parser().parse_args([command, "--seed", "7", "--log-max-mb", "0.5"])
+        context = RunContext(**_context_options(args))
+        assert (context.seed, context.log_max_bytes) == (7, 512 * 1024)
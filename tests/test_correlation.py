@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+
+from netops_agent.correlation import IncidentCorrelator
+from netops_agent.models import ExecutionResult, Incident
+from netops_agent.scheduling import PriorityScheduler
+
+SITES = {"dev-1": "site-a", "dev-2": "site-a"}
+
+
+def _incident(number: int, device: str = "dev-1", interface: str = "Gi0/1") -> Incident:
+    return Incident(
+        incident_id=f"inc-{number:04d}",
+        device_id=device,
+        interface=interface,
+        summary="Interface down detected",
+        category="interface",
+        severity="high",
+        gateway="10.0.0.1",
+    )
+
+
+def test_groups_same_key_and_counts_suppressed():
+    correlator = IncidentCorrelator(window=60)
+    incidents = [_incident(1), _incident(2), _incident(3, device="dev-2"), _incident(4)]
+    groups = correlator.assign(incidents, SITES, now=0.0)
+    assert groups[0] is groups[1] is groups[3]
+    assert groups[2] is not groups[0]
+    assert groups[0].size == 3
+    assert (correlator.stats.groups, correlator.stats.suppressed) == (2, 2)
+
+
+def test_group_expires_after_window():
+    correlator = IncidentCorrelator(window=60)
+    first = correlator.assign([_incident(1)], SITES, now=0.0)[0]
+    assert correlator.assign([_incident(2)], SITES, now=60.0)[0] is first
+    reopened = correlator.assign([_incident(3)], SITES, now=61.0)[0]
+    assert reopened is not first
+    assert reopened.primary.incident_id == "inc-0003"
+
+
+def test_zero_window_disables_grouping():
+    correlator = IncidentCorrelator(window=0)
+    groups = correlator.assign([_incident(1), _incident(2)], SITES, now=0.0)
+    assert groups[0] is not groups[1]
+    assert correlator.stats.suppressed == 0
+
+
+def test_fan_out_readdresses_primary_result():
+    correlator = IncidentCorrelator(window=60)
+    incidents = [_incident(1), _incident(2)]
+    group = correlator.assign(incidents, SITES, now=0.0)[0]
+    with pytest.raises(AssertionError):
+        group.fan_out(incidents[1])
+    group.result = ExecutionResult(
+        incident_id="inc-0001",
+        runbook_id="RB-1",
+        actions=["shutdown", "no shutdown"],
+        validation_passed=True,
+        validation_reason="ok",
+        escalated=False,
+        notes="Resolved.",
+    )
+    assert group.fan_out(incidents[0]) is group.result
+    member = group.fan_out(incidents[1])
+    assert member.incident_id == "inc-0002"
+    assert member.actions == []
+    assert member.notes == "Correlated with inc-0001. Resolved."
+
+
+def test_later_batch_joins_open_group_unless_its_primary_escalated():
+    correlator = IncidentCorrelator(window=60)
+    first = correlator.assign([_incident(1)], SITES, now=0.0)[0]
+    first.result = PriorityScheduler.shed_result(first.primary)
+    reopened = correlator.assign([_incident(2)], SITES, now=1.0)[0]
+    assert reopened is not first and reopened.primary.incident_id == "inc-0002"
+    assert correlator.assign([_incident(3)], SITES, now=2.0)[0] is reopened
+    assert (correlator.stats.groups, correlator.stats.suppressed) == (2, 1)
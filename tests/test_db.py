@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import duckdb
+import pytest
+
+from netops_agent.db import NetOpsDatabase, TicketWriter
+from netops_agent.models import Device, ExecutionResult, Incident
+
+
+def _result(number: int, passed: bool = True) -> ExecutionResult:
+    return ExecutionResult(
+        incident_id=f"inc-{number}",
+        runbook_id="RB-1",
+        actions=[],
+        validation_passed=passed,
+        validation_reason="ok" if passed else "packet_loss too high",
+        escalated=not passed,
+        notes="",
+    )
+
+
+@pytest.fixture
+def db(tmp_path) -> NetOpsDatabase:
+    db = NetOpsDatabase(str(tmp_path / "netops.duckdb"))
+    db.init_schema()
+    return db
+
+
+def _populate(db: NetOpsDatabase) -> None:
+    db.load_devices(
+        [
+            Device(device_id="dev-1", hostname="core-1", site="ams", os_version="ios-xe-17"),
+            Device(device_id="dev-2", hostname="core-2", site="fra", os_version="ios-xe-17"),
+        ]
+    )
+    db.load_incidents(
+        [
+            Incident(
+                incident_id=f"inc-{number}",
+                device_id=f"dev-{1 + number % 2}",
+                interface="Gi0/1",
+                summary="Interface down detected",
+                category="interface" if number < 4 else "cpu",
+                severity="high",
+                gateway="10.0.0.1",
+            )
+            for number in range(5)
+        ]
+    )
+    with TicketWriter(db) as tickets:
+        for number in range(6):
+            tickets.add(_result(number, passed=number % 3 != 0))
+
+
+def test_scan_yields_bounded_batches(db):
+    _populate(db)
+    columns, batches = db.scan("incidents", batch_size=2)
+    assert columns[0] == "incident_id"
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    _, batches = db.scan("incidents", where="category = 'interface'", limit=3, offset=1)
+    assert [row[0] for batch in batches for row in batch] == ["inc-1", "inc-2", "inc-3"]
+    assert db.count("incidents", "category = 'cpu'") == 1
+    with pytest.raises(ValueError):
+        db.scan("runbooks")
+
+
+def test_ticket_summary_groups_by_incident_and_device(db):
+    _populate(db)
+    columns, rows = db.ticket_summary("category")
+    assert columns == ["category", "tickets", "passed", "failed", "escalated", "pass_pct"]
+    assert rows == [
+        ("interface", 4, 2, 2, 2, 50.0),
+        ("(unknown)", 1, 1, 0, 0, 100.0),
+        ("cpu", 1, 1, 0, 0, 100.0),
+    ]
+    _, rows = db.ticket_summary("site")
+    assert {row[0]: row[1] for row in rows} == {"ams": 3, "fra": 2, "(unknown)": 1}
+
+
+@pytest.mark.parametrize(
+    "where",
+    [
+        "1=1; DROP TABLE tickets",
+        "1=1; DELETE FROM tickets",
+        "1=1; COPY tickets TO '{tmp}/leak.csv'",
+        "incident_id IN (SELECT column0 FROM read_csv('/etc/hostname'))",
+    ],
+)
+def test_read_only_database_rejects_writes_and_file_access(db, tmp_path, where):
+    _populate(db)
+    db.conn.close()
+    reader = NetOpsDatabase(str(tmp_path / "netops.duckdb"), read_only=True)
+    with pytest.raises(duckdb.Error):
+        reader.count("tickets", where.format(tmp=tmp_path))
+    assert reader.count("tickets") == 6
+    assert not (tmp_path / "leak.csv").exists()
+
+
+def test_ticket_writer_flushes_on_row_count(db):
+    writer = TicketWriter(db, max_rows=3, max_age=60)
+    for number in range(7):
+        writer.add(_result(number))
+    assert (writer.written, len(writer), db.count("tickets")) == (6, 1, 6)
+    writer.flush()
+    assert db.count("tickets") == 7
+
+
+def test_ticket_writer_flushes_on_age_while_idle(db, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("netops_agent.db.time", SimpleNamespace(monotonic=lambda: clock[0]))
+    writer = TicketWriter(db, max_rows=100, max_age=5)
+    assert writer.flush_if_due() == 0
+    writer.add(_result(1))
+    clock[0] += 4
+    writer.add(_result(2))
+    assert writer.flush_if_due() == 0 and db.count("tickets") == 0
+    clock[0] += 1
+    assert writer.flush_if_due() == 2 and db.count("tickets") == 2
+    writer.add(_result(3))
+    clock[0] += 5
+    writer.add(_result(4))
+    assert (len(writer), db.count("tickets")) == (0, 4)
+
+
+def test_sync_table_counts_inserted_updated_and_unchanged_rows(db):
+    import pyarrow as pa
+
+    def interfaces(rows):
+        return pa.Table.from_pylist(
+            [
+                {"device_id": d, "name": n, "status": s, "packet_loss": p, "error_rate": 0.0}
+                for d, n, s, p in rows
+            ]
+        )
+
+    first = [
+        ("dev-1", "Gi0/1", "up", 0.0),
+        ("dev-1", "Gi0/2", "up", None),
+        ("dev-2", "Gi0/1", "down", 3.0),
+    ]
+    stats = db.sync_table("interfaces", interfaces(first))
+    assert (stats.inserted, stats.updated, stats.unchanged) == (3, 0, 0)
+
+    second = [
+        ("dev-1", "Gi0/1", "up", 0.0),
+        ("dev-1", "Gi0/2", "up", None),
+        ("dev-2", "Gi0/1", "up", 3.0),
+        ("dev-2", "Gi0/2", "up", 0.0),
+    ]
+    stats = db.sync_table("interfaces", interfaces(second))
+    assert (stats.inserted, stats.updated, stats.unchanged) == (1, 1, 2)
+
+    third = [("dev-1", "Gi0/2", "up", 1.5)]
+    stats = db.sync_table("interfaces", interfaces(third))
+    assert (stats.inserted, stats.updated, stats.unchanged) == (0, 1, 0)
+    rows = db.conn.execute("SELECT * FROM interfaces ORDER BY device_id, name").fetchall()
+    assert rows == [
+        ("dev-1", "Gi0/1", "up", 0.0, 0.0),
+        ("dev-1", "Gi0/2", "up", 1.5, 0.0),
+        ("dev-2", "Gi0/1", "up", 3.0, 0.0),
+        ("dev-2", "Gi0/2", "up", 0.0, 0.0),
+    ]
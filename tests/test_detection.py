@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from netops_agent.detection import AnomalyDetector
+from netops_agent.synthetic_data import (
+    make_device_table,
+    make_interface_table,
+    make_telemetry_table,
+)
+from netops_agent.telemetry import TELEMETRY_SCHEMA
+
+END = datetime(2026, 1, 1, 12, 0)
+
+
+def _samples(series, start: datetime = END - timedelta(minutes=30)) -> pa.Table:
+    """One row per ``(interface, status, packet_loss, error_rate)``, a minute apart per series."""
+    rows = []
+    for interface, points in series.items():
+        for minute, (status, loss, errors) in enumerate(points):
+            rows.append(
+                {
+                    "ts": start + timedelta(minutes=minute),
+                    "device_id": "dev-1",
+                    "interface": interface,
+                    "status": status,
+                    "packet_loss": loss,
+                    "error_rate": errors,
+                }
+            )
+    return pa.Table.from_pylist(rows).cast(TELEMETRY_SCHEMA)
+
+
+def _flags(samples: pa.Table):
+    batch = AnomalyDetector().scan(samples)
+    kinds = ["flapping", "down", "lossy", "erroring"]
+    return {
+        name: (kinds[kind], ["low", "medium", "high"][severity]) if kind >= 0 else None
+        for name, kind, severity in zip(batch.interface, batch.kind, batch.severity)
+    }
+
+
+def test_thresholds_are_inclusive():
+    samples = _samples(
+        {
+            "loss-at": [("up", 1.0, 0.0), ("up", 8.0, 0.0)],
+            "loss-below": [("up", 1.0, 0.0), ("up", 7.99, 0.0)],
+            "loss-double": [("up", 1.0, 0.0), ("up", 16.0, 0.0)],
+            "errors-at": [("up", 0.0, 0.1), ("up", 0.0, 1.5)],
+            "errors-below": [("up", 0.0, 0.1), ("up", 0.0, 1.49)],
+            "down": [("up", 0.0, 0.0), ("down", 0.0, 0.0)],
+            "recovered": [("down", 0.0, 0.0), ("up", 0.0, 0.0)],
+        }
+    )
+    assert _flags(samples) == {
+        "loss-at": ("lossy", "medium"),
+        "loss-below": None,
+        "loss-double": ("lossy", "high"),
+        "errors-at": ("erroring", "medium"),
+        "errors-below": None,
+        "down": ("down", "high"),
+        "recovered": None,
+    }
+
+
+def test_rolling_zscore_needs_a_baseline():
+    steady = [("up", 1.0 + 0.1 * (minute % 2), 0.0) for minute in range(10)]
+    samples = _samples(
+        {
+            "spike": [*steady, ("up", 4.0, 0.0)],
+            "short": [*steady[:4], ("up", 4.0, 0.0)],
+        }
+    )
+    assert _flags(samples) == {"spike": ("lossy", "low"), "short": None}
+
+
+def test_flapping_takes_precedence_over_down():
+    flapping = [("up" if minute % 2 else "down", 0.0, 0.0) for minute in range(5)]
+    samples = _samples({"flap": flapping, "two-flaps": flapping[:3]})
+    assert _flags(samples) == {"flap": ("flapping", "medium"), "two-flaps": ("down", "high")}
+
+
+def test_empty_batch_raises_no_incidents():
+    detector = AnomalyDetector()
+    batch = detector.scan(TELEMETRY_SCHEMA.empty_table())
+    assert batch.samples == 0 and detector.incident_table(batch).num_rows == 0
+
+
+def test_generated_telemetry_flags_only_a_few_interfaces():
+    interfaces = make_interface_table(3, make_device_table(3, 400))
+    samples = make_telemetry_table(3, interfaces, END, minutes=30)
+    recent = samples.filter(pc.greater(samples.column("ts"), END - timedelta(minutes=15)))
+    batch = AnomalyDetector().scan(recent)
+    assert len(batch.kind) == interfaces.num_rows
+    assert 0.01 < len(batch.flagged) / len(batch.kind) < 0.10
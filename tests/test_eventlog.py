@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import logging
+
+from netops_agent.eventlog import JsonLinesFileHandler, LogPipeline
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_file_handler_counts_bytes_not_characters(tmp_path):
+    path = tmp_path / "events.log"
+    handler = JsonLinesFileHandler(path, max_bytes=0, backups=1)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for message in ("ascii", "packet loss 5 % on Gi0/1 – Zürich", "日本語"):
+        handler.emit(_record(message))
+    handler.sync()
+    assert handler.size == path.stat().st_size
+    handler.close()
+
+
+def test_file_handler_rotates_on_byte_size(tmp_path):
+    path = tmp_path / "events.log"
+    handler = JsonLinesFileHandler(path, max_bytes=64, backups=2)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for _ in range(10):
+        handler.emit(_record("é" * 10))
+    handler.sync()
+    assert path.stat().st_size <= 64
+    assert (tmp_path / "events.log.1").exists()
+    handler.close()
+
+
+def test_pipeline_leaves_global_logging_flags_alone(tmp_path):
+    before = (logging.logThreads, logging.logProcesses, logging.logMultiprocessing)
+    pipeline = LogPipeline(logging.getLogger("test-eventlog"), tmp_path / "events.log")
+    try:
+        assert (logging.logThreads, logging.logProcesses, logging.logMultiprocessing) == before
+    finally:
+        pipeline.stop()
+
+
+def test_appended_lines_go_through_size_accounting(tmp_path):
+    worker_log = tmp_path / "worker.log"
+    worker_log.write_text("".join(f'{{"message": "line {n}"}}\n' for n in range(50)))
+    path = tmp_path / "events.log"
+    pipeline = LogPipeline(logging.getLogger("test-append"), path, max_bytes=400)
+    try:
+        pipeline.append(worker_log)
+        pipeline.flush()
+        file_handler = pipeline.handlers[0]
+        assert file_handler.size == path.stat().st_size <= 400
+        assert (tmp_path / "events.log.1").exists()
+    finally:
+        pipeline.stop()
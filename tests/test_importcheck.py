@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from netops_agent.db import NetOpsDatabase
+from netops_agent.importcheck import HEAVY_MODULES, LIGHT_COMMANDS, imported_packages
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, cwd=ROOT, check=False
+    )
+
+
+def test_imported_packages_keeps_the_largest_cumulative_time():
+    log = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     numpy._core",
+            "import time:       300 |       4000 |   numpy",
+            "import time:        50 |         50 | json",
+            "unrelated line",
+        ]
+    )
+    assert imported_packages(log) == {"numpy": 4000, "json": 50}
+
+
+@pytest.mark.parametrize("label, argv", LIGHT_COMMANDS)
+def test_light_commands_do_not_import_heavy_packages(tmp_path, label, argv):
+    db_path = str(tmp_path / "check.duckdb")
+    db = NetOpsDatabase(db_path)
+    db.init_schema()
+    db.conn.close()
+    traced = _python(
+        "-X",
+        "importtime",
+        "-m",
+        "netops_agent.cli",
+        *(arg.replace("{db}", db_path) for arg in argv),
+    )
+    assert traced.returncode == 0, traced.stderr[-2000:]
+    packages = imported_packages(traced.stderr)
+    assert "netops_agent" in packages
+    assert [name for name in HEAVY_MODULES if name in packages] == []
+
+
+def test_workflows_import_pyarrow_compute_only_on_use():
+    probe = _python(
+        "-c", "import sys, netops_agent.workflows; print('pyarrow.compute' in sys.modules)"
+    )
+    assert probe.stdout.strip() == "False", probe.stderr
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pyarrow as pa
+import pytest
+
+from netops_agent.inventory import InventoryStore
+from netops_agent.models import Device, Interface
+from netops_agent.synthetic_data import make_device_table, make_interface_table
+
+
+def _tables():
+    devices = pa.table(
+        {
+            "device_id": ["dev-1", "dev-2"],
+            "hostname": ["edge-1", "edge-2"],
+            "site": ["ams", "fra"],
+            "os_version": ["15.2", "16.1"],
+        }
+    )
+    interfaces = pa.table(
+        {
+            "device_id": ["dev-2", "dev-1", "dev-1"],
+            "name": ["Gi0/1", "Gi0/1", "Gi0/2"],
+            "status": ["up", "down", "up"],
+            "packet_loss": [0.5, 9.0, 0.0],
+            "error_rate": [0.1, 1.2, 0.0],
+        }
+    )
+    return devices, interfaces
+
+
+def test_groups_interfaces_by_device_and_builds_models_on_demand():
+    store = InventoryStore.from_arrow(*_tables())
+    assert store.device("dev-1") == Device(
+        device_id="dev-1", hostname="edge-1", site="ams", os_version="15.2"
+    )
+    assert [interface.name for interface in store.interfaces_of("dev-1")] == ["Gi0/1", "Gi0/2"]
+    row = store.interface_row("dev-1", "Gi0/1")
+    assert store.interface(row) == Interface(
+        device_id="dev-1", name="Gi0/1", status="down", packet_loss=9.0, error_rate=1.2
+    )
+    assert store.interface_row("dev-9", "Gi0/1") is None
+
+
+def test_round_trips_the_fleet_generator_tables():
+    devices = make_device_table(3, 20)
+    interfaces = make_interface_table(3, devices, 2)
+    store = InventoryStore.from_arrow(devices, interfaces)
+    again = InventoryStore.from_arrow(store.devices_table(), store.interfaces_table())
+    assert again.num_interfaces == store.num_interfaces == 40
+    assert again.interfaces_table().to_pylist() == store.interfaces_table().to_pylist()
+
+
+@pytest.mark.parametrize(
+    "mutate, message",
+    [
+        (lambda d, i: (d.drop_columns(["site"]), i), "devices table is missing columns: site"),
+        (
+            lambda d, i: (d, i.set_column(3, "packet_loss", pa.array(["a", "b", "c"]))),
+            "interfaces.packet_loss must be numeric",
+        ),
+        (
+            lambda d, i: (d.set_column(1, "hostname", pa.array(["edge-1", None])), i),
+            "devices.hostname has 1 null values",
+        ),
+        (
+            lambda d, i: (d.set_column(0, "device_id", pa.array(["dev-1", "dev-1"])), i),
+            "device_id values must be unique",
+        ),
+        (
+            lambda d, i: (d, i.set_column(0, "device_id", pa.array(["dev-9", "dev-1", "dev-1"]))),
+            "unknown device_id",
+        ),
+    ],
+)
+def test_rejects_invalid_tables(mutate, message):
+    with pytest.raises(ValueError, match=message):
+        InventoryStore.from_arrow(*mutate(*_tables()))
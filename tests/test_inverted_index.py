@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import math
+from collections import Counter
+
+import pytest
+
+from netops_agent.inverted_index import InvertedIndex, tokenize
+
+DOCS = [
+    "interface down link flap interface",
+    "packet loss on uplink interface",
+    "cpu high process restart",
+    "interface errors crc down",
+]
+CATEGORIES = ["interfaces", "connectivity", "system", "interfaces"]
+OS_VERSIONS = [[], ["ios-xe-17"], [], ["nx-os-9"]]
+
+
+@pytest.fixture
+def index() -> InvertedIndex:
+    built = InvertedIndex()
+    built.build([tokenize(doc) for doc in DOCS], CATEGORIES, OS_VERSIONS)
+    return built
+
+
+def _bm25(query: str, doc_id: int, k1: float = 1.2, b: float = 0.75) -> float:
+    documents = [tokenize(doc) for doc in DOCS]
+    average = sum(map(len, documents)) / len(documents)
+    counts = Counter(documents[doc_id])
+    score = 0.0
+    for term in set(tokenize(query)):
+        df = sum(term in doc for doc in documents)
+        if not counts[term]:
+            continue
+        idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+        norm = k1 * (1 - b + b * len(documents[doc_id]) / average)
+        score += idf * counts[term] * (k1 + 1) / (counts[term] + norm)
+    return score
+
+
+def test_scores_match_reference_bm25(index):
+    hits = index.search("interface down", top_k=4)
+    assert [doc_id for doc_id, _ in hits] == [0, 3, 1]
+    for doc_id, score in hits:
+        assert score == pytest.approx(_bm25("interface down", doc_id), rel=1e-6)
+
+
+def test_category_partition_limits_candidates(index):
+    assert [doc_id for doc_id, _ in index.search("interface", 5, category="interfaces")] == [0, 3]
+    assert index.search("interface", 5, category="unknown") == []
+
+
+def test_os_version_filter_keeps_unrestricted_documents(index):
+    hits = index.search("interface", 5, os_version="nx-os-9")
+    assert sorted(doc_id for doc_id, _ in hits) == [0, 3]
+    assert [doc_id for doc_id, _ in index.search("uplink", 5, os_version="nx-os-9")] == []
+
+
+def test_query_without_known_terms_returns_nothing(index):
+    assert index.search("bgp neighbor", 3) == []
+
+
+def test_many_os_versions_never_share_a_filter():
+    versions = [f"os-{number}" for number in range(80)]
+    built = InvertedIndex()
+    built.build(
+        [["interface", "down"]] * len(versions),
+        ["interfaces"] * len(versions),
+        [[v] for v in versions],
+    )
+    for doc_id, version in enumerate(versions):
+        assert [hit for hit, _ in built.search("interface", 100, os_version=version)] == [doc_id]
+    assert built.search("interface", 100, os_version="os-unknown") == []
+
+
+def test_category_named_like_a_wildcard_is_its_own_partition():
+    built = InvertedIndex()
+    built.build([["interface"], ["interface"]], ["*", "interfaces"], [[], []])
+    assert [doc_id for doc_id, _ in built.search("interface", 5, category="*")] == [0]
+    assert [doc_id for doc_id, _ in built.search("interface", 5)] == [0, 1]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from netops_agent.metrics import Histogram, MetricsRecorder
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.01, 0.05, 0.1, 0.5, 2.0):
+        histogram.observe(seconds)
+    assert histogram.counts == [2, 2, 1, 1]
+    assert histogram.cumulative() == [("0.01", 2), ("0.1", 4), ("1.0", 5), ("+Inf", 6)]
+    assert histogram.count == 6
+
+
+def test_prometheus_exposition_format():
+    metrics = MetricsRecorder(enabled=True, run_id="run-1")
+    metrics.observe("retrieval", 0.002)
+    metrics.observe("tool", 0.3, incident_id="inc-1", tool="ping")
+    metrics.observe("tool", 7.0, incident_id="inc-1", tool="ping")
+    lines = metrics.to_prometheus().splitlines()
+    assert lines[:2] == [
+        "# HELP netops_stage_duration_seconds Time spent per pipeline stage.",
+        "# TYPE netops_stage_duration_seconds histogram",
+    ]
+    name = "netops_stage_duration_seconds"
+    assert f'{name}_bucket{{stage="retrieval",le="0.001"}} 0' in lines
+    assert f'{name}_bucket{{stage="retrieval",le="0.005"}} 1' in lines
+    assert f'{name}_bucket{{stage="tool",tool="ping",le="0.5"}} 1' in lines
+    assert f'{name}_bucket{{stage="tool",tool="ping",le="5.0"}} 1' in lines
+    assert f'{name}_bucket{{stage="tool",tool="ping",le="+Inf"}} 2' in lines
+    assert f'{name}_sum{{stage="tool",tool="ping"}} 7.300000' in lines
+    assert lines[-1] == f'{name}_count{{stage="tool",tool="ping"}} 2'
+    # Each series lists its buckets in ascending order, ending with +Inf, then sum and count.
+    retrieval = [line for line in lines if 'stage="retrieval"' in line]
+    assert len(retrieval) == 11 + 2 and retrieval[10].endswith('le="+Inf"} 1')
+
+
+def test_disabled_recorder_records_nothing():
+    metrics = MetricsRecorder()
+    with metrics.span("retrieval"):
+        pass
+    assert metrics.histograms == {}
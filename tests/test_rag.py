@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from netops_agent.inverted_index import runbook_text
+from netops_agent.rag import RunbookIndex
+
+RUNBOOKS = Path(__file__).resolve().parents[1] / "data" / "runbooks.yaml"
+QUERIES = [
+    "Interface down detected",
+    "High packet loss on uplink, CRC errors!",
+    "BGP neighbor flapping",
+    "the and of",
+    "",
+]
+
+
+def _built(tmp_path: Path) -> RunbookIndex:
+    index = RunbookIndex(str(tmp_path / "index.duckdb"), cache_size=0)
+    index.load_runbooks(RUNBOOKS)
+    index.build()
+    return index
+
+
+def test_transform_matches_fitted_vectorizer(tmp_path):
+    index = _built(tmp_path)
+    vectorizer = TfidfVectorizer(stop_words="english")
+    vectorizer.fit([runbook_text(rb) for rb in index.runbooks])
+    expected = vectorizer.transform(QUERIES).toarray()
+    vocabulary = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    assert sorted(index.vocabulary, key=index.vocabulary.get) == vocabulary
+    np.testing.assert_allclose(index.transform(QUERIES).toarray(), expected, atol=1e-7)
+
+
+def test_restore_ranks_like_the_built_index(tmp_path):
+    index = _built(tmp_path)
+    index.persist()
+    restored = RunbookIndex(index.db_path, cache_size=0)
+    assert restored.restore(index.source_hash)
+    ranked = [
+        [(rb.runbook_id, score) for rb, score in row] for row in index.query_batch(QUERIES, 3)
+    ]
+    again = [
+        [(rb.runbook_id, score) for rb, score in row] for row in restored.query_batch(QUERIES, 3)
+    ]
+    assert [[rb for rb, _ in row] for row in again] == [[rb for rb, _ in row] for row in ranked]
+    np.testing.assert_allclose(
+        [score for row in again for _, score in row],
+        [score for row in ranked for _, score in row],
+        rtol=1e-6,
+    )
+
+
+def test_restore_rejects_another_source_and_leaves_the_index_untouched(tmp_path):
+    index = _built(tmp_path)
+    index.persist()
+    other = RunbookIndex(index.db_path)
+    assert not other.restore("0" * 64)
+    assert other.runbooks == [] and other.embeddings is None
+    assert not RunbookIndex(str(tmp_path / "empty.duckdb")).restore(index.source_hash)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from netops_agent.rag import RunbookIndex
+from netops_agent.retrieval_cache import RetrievalCache, normalize
+
+RUNBOOKS = Path(__file__).resolve().parents[1] / "data" / "runbooks.yaml"
+
+
+def test_normalize_ignores_case_order_and_punctuation():
+    assert normalize("Interface DOWN detected!") == normalize("detected: interface down")
+
+
+def test_evicts_least_recently_used():
+    cache = RetrievalCache(max_entries=2)
+    cache.put("a", [])
+    cache.put("b", [])
+    assert cache.get("a") == []  # "a" is now the most recently used
+    cache.put("c", [])
+    assert cache.get("b") is None
+    assert cache.get("a") == [] and cache.get("c") == []
+    assert cache.stats.evictions == 1
+    assert (cache.stats.hits, cache.stats.misses) == (3, 1)
+
+
+def test_returns_copies_of_the_ranked_list():
+    cache = RetrievalCache()
+    ranked = [("runbook", 0.5)]
+    cache.put("key", ranked)
+    ranked.clear()
+    hit = cache.get("key")
+    hit.append(("other", 0.1))
+    assert cache.get("key") == [("runbook", 0.5)]
+
+
+def test_clear_counts_an_invalidation_only_when_entries_were_dropped():
+    cache = RetrievalCache()
+    cache.clear()
+    cache.put("key", [])
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats.invalidations == 1
+
+
+def test_zero_size_disables_the_cache():
+    cache = RetrievalCache(max_entries=0)
+    cache.put("key", [])
+    assert not cache.enabled and len(cache) == 0
+
+
+def test_index_serves_identical_rankings_and_invalidates_on_reload():
+    index = RunbookIndex(cache_size=16)
+    index.load_runbooks(RUNBOOKS)
+    index.build()
+    fresh = index.query("Interface down detected", top_k=3)
+    cached = index.query("interface detected DOWN", top_k=3)
+    assert [(rb.runbook_id, score) for rb, score in cached] == [
+        (rb.runbook_id, score) for rb, score in fresh
+    ]
+    assert index.cache.stats.hits == 1
+    index.load_runbooks(RUNBOOKS)
+    assert len(index.cache) == 0
+    assert index.cache.stats.invalidations == 1
+
+
+def test_batch_looks_up_each_distinct_text_once():
+    index = RunbookIndex(cache_size=16)
+    index.load_runbooks(RUNBOOKS)
+    index.build()
+    texts = ["Interface down detected", "interface DOWN detected", "High CPU", "high cpu"]
+    first = index.query_batch(texts * 3)
+    assert (index.cache.stats.hits, index.cache.stats.misses, len(index.cache)) == (10, 2, 2)
+    fresh = RunbookIndex(cache_size=0)
+    fresh.load_runbooks(RUNBOOKS)
+    fresh.build()
+    assert first == fresh.query_batch(texts * 3)
+    index.query_batch(texts)
+    assert (index.cache.stats.hits, index.cache.stats.misses) == (14, 2)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import pytest
+
+from netops_agent.models import Incident
+from netops_agent.scheduling import PriorityScheduler, SchedulerPolicy
+
+
+def _incident(number: int, severity: str) -> Incident:
+    return Incident(
+        incident_id=f"inc-{number:04d}",
+        device_id=f"dev-{number:04d}",
+        interface="Gi0/1",
+        summary="Interface down detected",
+        category="interface",
+        severity=severity,
+        gateway="10.0.0.1",
+    )
+
+
+def _ids(incidents, wave):
+    return [incidents[index].incident_id for index in wave]
+
+
+def test_orders_by_severity_then_admission_time():
+    incidents = [
+        _incident(0, "low"),
+        _incident(1, "high"),
+        _incident(2, "medium"),
+        _incident(3, "high"),
+        _incident(4, "unknown"),
+    ]
+    scheduler = PriorityScheduler()
+    plan = scheduler.plan(incidents, now=0.0, arrivals=[0.0, 5.0, 1.0, 2.0, 0.0])
+    assert plan.shed == []
+    assert _ids(incidents, plan.waves[0]) == [
+        "inc-0003",
+        "inc-0001",
+        "inc-0002",
+        "inc-0000",
+        "inc-0004",
+    ]
+
+
+def test_same_admission_time_keeps_input_order():
+    incidents = [_incident(n, "medium") for n in range(5)]
+    plan = PriorityScheduler().plan(incidents, now=0.0)
+    assert plan.waves == [[0, 1, 2, 3, 4]]
+
+
+def test_defer_caps_every_wave_including_high_severity():
+    incidents = [_incident(n, "high") for n in range(4)] + [_incident(4, "low")]
+    scheduler = PriorityScheduler(SchedulerPolicy(max_pending=2, overload="defer"))
+    plan = scheduler.plan(incidents, now=0.0)
+    assert plan.waves == [[0, 1], [2, 3], [4]]
+    assert plan.shed == []
+    assert scheduler.stats["high"].deferred == 2
+    assert scheduler.stats["low"].deferred == 1
+
+
+def test_shed_drops_only_sheddable_overflow_and_defers_the_rest():
+    incidents = [_incident(0, "low"), *(_incident(n, "high") for n in range(1, 4))]
+    scheduler = PriorityScheduler(SchedulerPolicy(max_pending=2, overload="shed"))
+    plan = scheduler.plan(incidents, now=0.0)
+    assert plan.waves == [[1, 2], [3]]
+    assert plan.shed == [0]
+    assert scheduler.stats["low"].shed == 1
+    assert scheduler.stats["high"].deferred == 1
+    # A shed incident never starts, so it records no wait.
+    assert scheduler.started(incidents[0], now=1.0) is None
+
+
+def test_no_cap_runs_everything_in_one_wave():
+    incidents = [_incident(n, "low") for n in range(3)]
+    plan = PriorityScheduler(SchedulerPolicy(overload="shed")).plan(incidents, now=0.0)
+    assert plan.waves == [[0, 1, 2]]
+    assert plan.shed == []
+    assert PriorityScheduler().plan([], now=0.0).waves == []
+
+
+def test_started_measures_wait_and_deadline_misses():
+    incidents = [_incident(0, "high"), _incident(1, "high")]
+    scheduler = PriorityScheduler(SchedulerPolicy(deadlines={"high": 1.0}))
+    scheduler.plan(incidents, now=10.0)
+    assert scheduler.started(incidents[0], now=10.5) == pytest.approx(0.5)
+    assert scheduler.started(incidents[1], now=12.0) == pytest.approx(2.0)
+    stats = scheduler.stats["high"]
+    assert (stats.scheduled, stats.started, stats.deadline_misses) == (2, 2, 1)
+    p50, _, p99 = stats.percentiles()
+    assert p50 == pytest.approx(1.25)
+    assert p99 <= 2.0
+
+
+def test_rejects_unknown_overload_mode():
+    with pytest.raises(ValueError):
+        PriorityScheduler(SchedulerPolicy(overload="drop"))
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from netops_agent.server import AgentServer, AgentService
+from netops_agent.workflows import NetOpsWorkflow, RunContext
+
+INCIDENT = {
+    "incident_id": "INC-1",
+    "device_id": "dev-1",
+    "interface": "Gi0/1",
+    "summary": "Interface down detected",
+    "category": "interface",
+    "severity": "high",
+    "gateway": "10.0.0.1",
+}
+
+
+@pytest.fixture
+def service(workspace):
+    workflow = NetOpsWorkflow(
+        RunContext(
+            seed=0,
+            db_path=str(workspace / "outputs" / "netops.duckdb"),
+            log_path=str(workspace / "outputs" / "netops.log"),
+        )
+    )
+    service = AgentService(workflow)
+    service.start()
+    yield service
+    if workflow.log_pipeline.running:
+        service.close()
+
+
+@pytest.fixture
+def server(service):
+    server = AgentServer(service, port=0)
+    thread = threading.Thread(target=server.server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def _call(server: AgentServer, path: str, body: object = None):
+    data = None if body is None else json.dumps(body).encode()
+    request = urllib.request.Request(server.address + path, data=data)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_health_incidents_and_events(server):
+    status, health = _call(server, "/health")
+    assert status == 200 and health["runbooks"] > 0
+
+    status, result = _call(server, "/incidents", INCIDENT)
+    assert status == 200 and result["incident_id"] == "INC-1"
+    status, results = _call(server, "/incidents", [{**INCIDENT, "incident_id": "INC-2"}])
+    assert status == 200 and [r["incident_id"] for r in results] == ["INC-2"]
+    assert _call(server, "/incidents", {"incident_id": "x"})[0] == 422
+    assert server.service.workflow.db.count("incidents") == 2
+
+    status, events = _call(server, "/events?limit=2")
+    assert status == 200 and len(events) == 2
+    assert _call(server, "/events?limit=0") == (200, [])
+    status, events = _call(server, "/events?incident_id=INC-2")
+    assert events and {event["incident_id"] for event in events} == {"INC-2"}
+    assert _call(server, "/events?limit=-1")[0] == 400
+    assert _call(server, "/events?limit=ten")[0] == 400
+    assert _call(server, "/nowhere")[0] == 404
+
+
+def test_reload_picks_up_new_runbooks(server, workspace):
+    runbooks = workspace / "data" / "runbooks.yaml"
+    runbooks.write_text(runbooks.read_text() + "\n")
+    status, body = _call(server, "/reload", {})
+    assert status == 200 and body["runbooks"] > 0
+    assert server.service.reloads == 1
+
+
+@pytest.mark.parametrize("content", ["runbooks: []\n", "runbooks: [{id: RB-X}]\n", "runbooks: ["])
+def test_failed_reload_keeps_serving_the_old_index(server, workspace, content):
+    index = server.service.workflow.index
+    (workspace / "data" / "runbooks.yaml").write_text(content)
+    status, body = _call(server, "/reload", {})
+    assert status == 422 and body["error"]
+    assert server.service.workflow.index is index
+    assert _call(server, "/incidents", INCIDENT)[0] == 200
+    assert _call(server, "/health")[1]["reload_errors"] == 1
+
+
+def test_sighup_with_invalid_runbooks_keeps_the_daemon_up(service, workspace):
+    (workspace / "data" / "runbooks.yaml").write_text("runbooks: [{id: RB-X}]\n")
+    server = AgentServer(service, port=0)
+    runbooks = len(service.workflow.index.runbooks)
+    replies = []
+
+    def client() -> None:
+        while signal.getsignal(signal.SIGHUP) != server.request_reload:
+            time.sleep(0.01)
+        try:
+            os.kill(os.getpid(), signal.SIGHUP)
+            while service.reload_errors == 0:
+                time.sleep(0.05)
+            replies.append(_call(server, "/health"))
+        finally:
+            server.request_stop()
+
+    signals = (signal.SIGHUP, signal.SIGTERM, signal.SIGINT)
+    handlers = {sig: signal.getsignal(sig) for sig in signals}
+    thread = threading.Thread(target=client)
+    thread.start()
+    try:
+        server.serve_forever()
+    finally:
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
+    thread.join()
+    [(status, health)] = replies
+    assert status == 200 and health["runbooks"] == runbooks
+    assert health["reload_errors"] == 1
+
+
+def test_refuses_to_replace_a_file_that_is_not_a_socket(service, tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        AgentServer(service, socket_path=str(path))
+    assert path.read_text() == "keep me"
+
+
+def test_replaces_a_stale_socket(service, tmp_path):
+    path = tmp_path / "agent.sock"
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(str(path))
+    stale.close()
+    server = AgentServer(service, socket_path=str(path))
+    try:
+        assert server.address == f"unix:{path}"
+    finally:
+        server.server.server_close()
+
+
+def test_later_request_copies_only_a_successful_primary(workspace):
+    workflow = NetOpsWorkflow(
+        RunContext(
+            seed=2,
+            db_path=str(workspace / "outputs" / "netops.duckdb"),
+            log_path=str(workspace / "outputs" / "netops.log"),
+        )
+    )
+    incidents = [incident.model_dump() for incident in workflow.prepare_data()]
+    service = AgentService(workflow)
+    service.start()
+    first = service.resolve(incidents)
+    again = service.resolve(
+        [{**item, "incident_id": item["incident_id"] + "-b"} for item in incidents]
+    )
+    service.close()
+    assert {result["escalated"] for result in first} == {True, False}
+    for earlier, later in zip(first, again):
+        copied = later["notes"].startswith(f"Correlated with {earlier['incident_id']}.")
+        assert copied is not earlier["escalated"]
+        assert (later["actions"] == []) is copied
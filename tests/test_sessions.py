@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+
+from netops_agent.sessions import DeviceSessionPool
+
+
+async def _serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    # Answers everything except keepalives, which hang until the client goes away.
+    while line := await reader.readline():
+        if line.strip() != b"keepalive":
+            writer.write(b"OK " + line)
+            await writer.drain()
+    writer.close()
+
+
+async def _with_server(scenario) -> None:
+    server = await asyncio.start_server(_serve, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        await scenario(port)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_reuses_idle_sessions():
+    async def scenario(port: int) -> None:
+        pool = DeviceSessionPool("127.0.0.1", port)
+        for _ in range(3):
+            result = await pool.execute("dev-1", "show version")
+            assert result.output == "OK show version"
+        await pool.close()
+        assert (pool.stats.connects, pool.stats.reuses, pool.stats.commands) == (1, 2, 3)
+
+    asyncio.run(_with_server(scenario))
+
+
+def test_close_during_keepalive_closes_the_pinged_session():
+    async def scenario(port: int) -> None:
+        pool = DeviceSessionPool("127.0.0.1", port, keepalive_interval=0.01)
+        await pool.execute("dev-1", "show version")
+        session = pool._idle["dev-1"][0]
+        await asyncio.sleep(0.1)
+        # The keepalive took the session out of the idle deque and is awaiting a reply.
+        assert not pool._idle["dev-1"]
+        await pool.close()
+        assert session.writer.is_closing()
+
+    asyncio.run(_with_server(scenario))
+
+
+def test_keepalive_ping_counts_against_the_device_limit():
+    async def scenario(port: int) -> None:
+        pool = DeviceSessionPool("127.0.0.1", port, keepalive_interval=0.01, keepalive_timeout=0.3)
+        await pool.execute("dev-1", "show version")
+        await asyncio.sleep(0.1)
+        assert not pool._idle["dev-1"]
+        # The only slot is held by the unanswered ping, so execute waits for it
+        # rather than opening a second session to the device.
+        task = asyncio.create_task(pool.execute("dev-1", "show clock"))
+        await asyncio.sleep(0.1)
+        assert not task.done()
+        assert pool.stats.connects == 1
+        result = await task
+        assert result.output == "OK show clock"
+        await pool.close()
+        assert (pool.stats.connects, pool.stats.evictions) == (2, 1)
+
+    asyncio.run(_with_server(scenario))
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from netops_agent.workflows import NetOpsWorkflow, RunContext
+
+
+def _run(workspace, workers: int):
+    name = f"workers-{workers}"
+    workflow = NetOpsWorkflow(
+        RunContext(
+            seed=7,
+            db_path=str(workspace / name / "netops.duckdb"),
+            log_path=str(workspace / name / "netops.log"),
+            devices=12,
+            incidents=8,
+            workers=workers,
+        )
+    )
+    workflow.run()
+    workflow.log_pipeline.stop()
+    db = workflow.db.conn
+    tickets = db.execute(
+        "SELECT incident_id, runbook_id, notes, validation_passed, validation_reason, escalated "
+        "FROM tickets ORDER BY incident_id"
+    ).fetchall()
+    interfaces = db.execute("SELECT * FROM interfaces ORDER BY device_id, name").fetchall()
+    return tickets, interfaces
+
+
+def test_sharded_run_matches_a_single_process(workspace):
+    single_tickets, single_interfaces = _run(workspace, 1)
+    sharded_tickets, sharded_interfaces = _run(workspace, 2)
+    assert len(single_tickets) == 8
+    assert sharded_tickets == single_tickets
+    assert sharded_interfaces == single_interfaces
+    shards = sorted(path.name for path in (workspace / "workers-2" / "shards").glob("*.duckdb"))
+    assert shards == ["runbook-index.duckdb", "shard-0.duckdb", "shard-1.duckdb"]
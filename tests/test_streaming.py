@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+
+from netops_agent.streaming import StreamPipeline
+from netops_agent.workflows import NetOpsWorkflow, RunContext
+
+
+def _line(number: int, device: str) -> str:
+    return json.dumps(
+        {
+            "incident_id": f"INC-{number}",
+            "device_id": device,
+            "interface": "Gi0/1",
+            "summary": "Interface down detected",
+            "category": "interface",
+            "severity": "high",
+            "gateway": "10.0.0.1",
+        }
+    )
+
+
+def test_streamed_incidents_are_stored_for_their_tickets(workspace):
+    workflow = NetOpsWorkflow(
+        RunContext(
+            seed=0,
+            db_path=str(workspace / "outputs" / "netops.duckdb"),
+            log_path=str(workspace / "outputs" / "netops.log"),
+        )
+    )
+    workflow.db.init_schema()
+    workflow.build_index()
+    lines = [_line(1, "dev-1"), _line(2, "dev-1"), "not json", _line(3, "dev-2"), _line(1, "dev-1")]
+    stats = StreamPipeline(workflow, batch_size=2).run(lines)
+    assert (stats.processed, stats.rejected) == (4, 1)
+
+    joined = workflow.db.conn.execute(
+        "SELECT count(*), count(n.incident_id) FROM tickets AS t "
+        "LEFT JOIN incidents AS n USING (incident_id)"
+    ).fetchone()
+    assert joined == (4, 4)
+    assert workflow.db.count("incidents") == 3
+    _, rows = workflow.db.ticket_summary("category")
+    assert [row[:2] for row in rows] == [("interface", 4)]
+    workflow.log_pipeline.stop()
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import pytest
+
+from netops_agent.synthetic_data import make_device_table, make_incident_table, make_interface_table
+
+
+def test_incident_table_uses_distinct_interfaces():
+    interfaces = make_interface_table(7, make_device_table(7, 2), 3)
+    incidents = make_incident_table(7, interfaces, 6)
+    pairs = set(
+        zip(incidents.column("device_id").to_pylist(), incidents.column("interface").to_pylist())
+    )
+    assert incidents.num_rows == len(pairs) == 6
+
+
+def test_incident_table_rejects_more_incidents_than_interfaces():
+    interfaces = make_interface_table(7, make_device_table(7, 1), 3)
+    with pytest.raises(ValueError, match="10 incidents on 3 interfaces"):
+        make_incident_table(7, interfaces, 10)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pytest
+
+from netops_agent.db import NetOpsDatabase
+from netops_agent.telemetry import TELEMETRY_SCHEMA, TelemetryStore
+
+END = datetime(2026, 1, 1, 12, 0)
+
+
+def _samples(loss: float, start: datetime, count: int = 3) -> pa.Table:
+    rows = [
+        {
+            "ts": start + timedelta(minutes=minute),
+            "device_id": "dev-1",
+            "interface": "Gi0/1",
+            "status": "up",
+            "packet_loss": loss,
+            "error_rate": 0.0,
+        }
+        for minute in range(count)
+    ]
+    return pa.Table.from_pylist(rows).cast(TELEMETRY_SCHEMA)
+
+
+def test_empty_store(tmp_path):
+    store = TelemetryStore(tmp_path / "telemetry")
+    assert store.read_window(15, now=END).num_rows == 0
+    db = NetOpsDatabase(str(tmp_path / "netops.duckdb"))
+    assert store.window_aggregates(db, 15, now=END).num_rows == 0
+    assert not store.register(db)
+    assert store.append(TELEMETRY_SCHEMA.empty_table()) == 0
+
+
+def test_window_spans_missing_hours(tmp_path):
+    store = TelemetryStore(tmp_path / "telemetry")
+    early = _samples(2.0, END - timedelta(hours=2, minutes=30))
+    late = _samples(4.0, END - timedelta(minutes=10))
+    assert store.append(early) + store.append(late) == 2
+    assert [path.name for path in store.partitions()] == ["hour=2026010109", "hour=2026010111"]
+    assert store.read_window(180, now=END).num_rows == 6
+    assert store.read_window(60, now=END).num_rows == 3
+    db = NetOpsDatabase(str(tmp_path / "netops.duckdb"))
+    [row] = store.window_aggregates(db, 180, now=END).to_pylist()
+    assert row["samples"] == 6 and row["avg_packet_loss"] == pytest.approx(3.0)
+    assert row["last_status"] == "up"
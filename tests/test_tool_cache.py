@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+
+from netops_agent import tool_cache
+from netops_agent.tool_cache import ToolCache
+from netops_agent.tools import ToolResult
+
+
+def _runner(calls: list):
+    def run() -> ToolResult:
+        calls.append(1)
+        return ToolResult(command="show interface Gi0/1", output=f"call {len(calls)}")
+
+    return run
+
+
+def test_hits_within_ttl_and_refetches_after_expiry(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(tool_cache.time, "monotonic", lambda: clock[0])
+    cache, calls = ToolCache(ttl=5.0), []
+    key = ("dev-0001", "show interface Gi0/1")
+    assert cache.get_or_run(key, _runner(calls)).output == "call 1"
+    assert cache.get_or_run(key, _runner(calls)).output == "call 1"
+    clock[0] += 6.0
+    assert cache.get_or_run(key, _runner(calls)).output == "call 2"
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.saved) == (1, 2, 1)
+
+
+def test_invalidate_device_only_drops_that_device():
+    cache, calls = ToolCache(), []
+    for device_id in ("dev-0001", "dev-0002"):
+        cache.get_or_run((device_id, "show ip route"), _runner(calls))
+    assert cache.invalidate_device("dev-0001") == 1
+    assert cache.get(("dev-0001", "show ip route")) is None
+    assert cache.get(("dev-0002", "show ip route")) is not None
+    assert cache.stats.invalidations == 1
+
+
+def test_evicts_oldest_entry_when_full():
+    cache, calls = ToolCache(max_entries=2), []
+    for command in ("a", "b", "c"):
+        cache.get_or_run(("dev-0001", command), _runner(calls))
+    assert len(cache) == 2
+    assert cache.get(("dev-0001", "a")) is None
+
+
+def test_async_path_shares_entries_with_sync_path():
+    cache, calls = ToolCache(), []
+    key = ("dev-0001", "show interface Gi0/1")
+    cache.get_or_run(key, _runner(calls))
+
+    async def run() -> ToolResult:
+        raise AssertionError("cached result expected")
+
+    assert asyncio.run(cache.get_or_run_async(key, run)).output == "call 1"
+    assert cache.stats.hits == 1
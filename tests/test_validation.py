@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import itertools
+
+import pyarrow as pa
+import pytest
+
+from netops_agent.db import NetOpsDatabase
+from netops_agent.models import Incident, Runbook
+from netops_agent.validation import (
+    BoolOp,
+    Compare,
+    Not,
+    RunbookValidator,
+    ValidationSyntaxError,
+    compile_check,
+    parse,
+)
+
+
+def test_parses_precedence_parentheses_and_flipped_literals():
+    expression = "interface_status == 'up' or packet_loss < 5 and not error_rate >= 1"
+    assert parse(expression) == BoolOp(
+        "or",
+        (
+            Compare("interface_status", "==", "up"),
+            BoolOp(
+                "and",
+                (Compare("packet_loss", "<", 5.0), Not(Compare("error_rate", ">=", 1.0))),
+            ),
+        ),
+    )
+    assert parse("(5 > packet_loss)") == Compare("packet_loss", "<", 5.0)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "__import__('os').system('rm -rf /')",
+        "packet_loss < 5; DROP TABLE interfaces",
+        "interface_status == 'up'' OR 1=1 --",
+        "packet_loss < 5 or 1",
+        "interface_status == up",
+        "packet_loss == 'high'",
+        "interface_status == 3",
+        "and < 3",
+        "packet_loss <",
+        "(packet_loss < 5",
+        "packet_loss < 5)",
+        "i.status == 'up'",
+    ],
+)
+def test_rejects_malformed_and_injected_expressions(expression):
+    with pytest.raises(ValidationSyntaxError):
+        compile_check(expression)
+
+
+def test_literals_are_bound_as_parameters_not_spliced_into_sql():
+    check = compile_check("""interface_status == "x' OR '1'='1" """)
+    assert check.params == ("x' OR '1'='1",)
+    assert "'1'" not in check.sql and "?" in check.sql
+
+
+@pytest.fixture
+def validator(tmp_path):
+    db = NetOpsDatabase(str(tmp_path / "validation.duckdb"))
+    db.init_schema()
+    db.load_arrow(
+        "interfaces",
+        pa.table(
+            {
+                "device_id": ["dev-1", "dev-2"],
+                "name": ["Gi0/1", "Gi0/1"],
+                "status": ["up", "down"],
+                "packet_loss": [1.0, 12.5],
+                "error_rate": [0.0, 0.4],
+            }
+        ),
+    )
+    yield RunbookValidator(db)
+    db.conn.close()
+
+
+def _incident(device_id: str, interface: str = "Gi0/1") -> Incident:
+    return Incident(
+        incident_id=f"inc-{device_id}",
+        device_id=device_id,
+        interface=interface,
+        summary="check",
+        category="interfaces",
+        severity="low",
+        gateway="10.0.0.1",
+    )
+
+
+_RUNBOOK_IDS = itertools.count()
+
+
+def _runbook(*validation: str) -> Runbook:
+    # Fresh ids: the validator caches compiled checks per runbook id.
+    return Runbook(
+        id=f"rb-{next(_RUNBOOK_IDS)}",
+        title="t",
+        category="interfaces",
+        steps=[],
+        commands=[],
+        validation=list(validation),
+    )
+
+
+@pytest.mark.parametrize(
+    "expression, observed, expected",
+    [
+        ("interface_status == 'up'", {}, (True, "Passed interface_status == 'up'")),
+        ("packet_loss < 5 or cpu_utilization < 70", {}, (True, None)),
+        ("packet_loss < 5 and cpu_utilization < 70", {}, (False, "not observed")),
+        ("not cpu_utilization >= 70", {}, (False, "not observed")),
+        ("packet_loss < 5 and cpu_utilization < 70", {"cpu_utilization": 45.0}, (True, None)),
+        ("cpu_utilization < 70", {"cpu_utilization": 73.0}, (False, "cpu_utilization=73.0")),
+        ("unknown_field > 1", {}, (False, "not observed")),
+    ],
+)
+def test_three_valued_outcomes(validator, expression, observed, expected):
+    [(passed, reason)] = validator.evaluate(
+        [_incident("dev-1")], [_runbook(expression)], [observed]
+    )
+    assert passed is expected[0]
+    assert expected[1] is None or expected[1] in reason
+
+
+def test_failed_check_reports_observed_values_and_first_failure(validator):
+    runbook = _runbook("interface_status == 'up'", "packet_loss < 5")
+    outcomes = validator.evaluate([_incident("dev-1"), _incident("dev-2")], [runbook, runbook])
+    assert outcomes[0] == (True, "Passed interface_status == 'up'; packet_loss < 5")
+    assert outcomes[1] == (
+        False,
+        "interface_status == 'up' failed (interface_status=down)",
+    )
+
+
+def test_missing_interface_row_is_not_observed(validator):
+    [(passed, reason)] = validator.evaluate(
+        [_incident("dev-1", "Gi9/9")], [_runbook("interface_status == 'up'")]
+    )
+    assert not passed and reason == "interface_status == 'up' not observed"